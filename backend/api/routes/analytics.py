@@ -12,6 +12,7 @@ import logging
 from utils.auth import get_current_user, require_permission, require_role
 from database.connection import get_db
 from database.schema import User, WellnessEntry, TeamAnalytics, RiskAssessment
+from database.serializers import serialize_many
 from utils.analytics import WellnessAnalytics
 
 logger = logging.getLogger(__name__)
@@ -66,7 +67,7 @@ async def get_organizational_health(
         ).all()
         
         # Convert to dict format for analytics engine
-        entries_data = [entry.to_dict() for entry in entries]
+        entries_data = serialize_many(entries)
         
         # Generate organizational analytics
         org_analytics = analytics_engine.generate_user_analytics(entries_data, timeframe)
@@ -168,7 +169,7 @@ async def get_team_analytics(
         ).all()
         
         # Convert to dict format
-        entries_data = [entry.to_dict() for entry in team_entries]
+        entries_data = serialize_many(team_entries)
         
         # Generate team analytics
         team_analytics = analytics_engine.generate_user_analytics(entries_data, timeframe)
@@ -176,7 +177,7 @@ async def get_team_analytics(
         # Individual member analytics
         member_analytics = {}
         for member in team_members:
-            member_entries = [entry.to_dict() for entry in team_entries if entry.user_id == member.id]
+            member_entries = serialize_many(entry for entry in team_entries if entry.user_id == member.id)
             if member_entries:
                 member_analytics[member.id] = {
                     "user": {
@@ -240,7 +241,7 @@ async def get_risk_assessment(
         ).all()
         
         # Convert to dict format
-        entries_data = [entry.to_dict() for entry in entries]
+        entries_data = serialize_many(entries)
         
         # Generate risk assessment
         risk_analytics = analytics_engine.generate_user_analytics(entries_data, timeframe)
@@ -423,11 +424,11 @@ async def compare_analytics(
         
         # Generate analytics for each group
         group1_analytics = analytics_engine.generate_user_analytics(
-            [entry.to_dict() for entry in group1_entries], timeframe
+            serialize_many(group1_entries), timeframe
         )
         
         group2_analytics = analytics_engine.generate_user_analytics(
-            [entry.to_dict() for entry in group2_entries], timeframe
+            serialize_many(group2_entries), timeframe
         )
         
         # Calculate comparison metrics
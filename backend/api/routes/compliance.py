@@ -12,6 +12,7 @@ import logging
 from utils.auth import get_current_user, require_permission, require_role
 from database.connection import get_db
 from database.schema import User, ComplianceRecord
+from database.serializers import serialize_many
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +85,7 @@ async def get_audit_trail(
             success=True,
             message="Audit trail retrieved successfully",
             data={
-                "records": [record.to_dict() for record in records],
+                "records": serialize_many(records),
                 "total_count": total_count,
                 "limit": limit,
                 "offset": offset
@@ -162,7 +163,7 @@ async def get_privacy_consent_status(
             "has_consent": latest_consent is not None and latest_consent.action == "consent_given",
             "last_updated": latest_consent.created_at.isoformat() if latest_consent else None,
             "consent_version": latest_consent.details.get("version") if latest_consent else None,
-            "recent_activity": [record.to_dict() for record in privacy_records]
+            "recent_activity": serialize_many(privacy_records)
         }
         
         return ComplianceResponse(
@@ -245,7 +246,7 @@ async def get_data_rights(
             "data_retention_days": retention_days,
             "data_anonymization": settings.ANONYMIZE_DATA,
             "compliance_framework": settings.COMPLIANCE_FRAMEWORK,
-            "recent_data_access": [record.to_dict() for record in data_access_records],
+            "recent_data_access": serialize_many(data_access_records),
             "rights": [
                 "Right to access personal data",
                 "Right to rectification",
@@ -399,7 +400,7 @@ async def get_compliance_status(
                 "privacy_consents": privacy_consents,
                 "data_access_records": data_access_records
             },
-            "recent_events": [record.to_dict() for record in recent_events],
+            "recent_events": serialize_many(recent_events),
             "compliance_checks": {
                 "data_retention": "compliant",
                 "privacy_consent": "compliant" if privacy_consents > 0 else "non_compliant",
@@ -461,7 +462,7 @@ async def export_compliance_data(
                 "format": format,
                 "record_count": len(records),
                 "export_url": f"/exports/compliance_{start_date}_{end_date}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{format}",
-                "records": [record.to_dict() for record in records]
+                "records": serialize_many(records)
             }
         )
         
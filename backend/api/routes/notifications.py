@@ -4,14 +4,16 @@ Notifications API Routes - User notifications and alerts management
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 from datetime import datetime
 import logging
 
 from utils.auth import get_current_user, require_permission
 from database.connection import get_db
-from database.schema import User, Notification
+from database.schema import User, Notification, NotificationType
+from database.repository import notification_repo
+from database.serializers import serialize_many
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +22,13 @@ router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
 # Pydantic models
 class NotificationCreateRequest(BaseModel):
+    # Unknown types are rejected with a 422; the field holds the value string
+    model_config = ConfigDict(use_enum_values=True)
+    
     user_id: str
     title: str
     message: str
-    notification_type: str = "info"  # info, warning, success, error
+    notification_type: NotificationType = NotificationType.INFO.value
     action_url: Optional[str] = None
 
 class NotificationUpdateRequest(BaseModel):
@@ -54,6 +59,7 @@ async def get_notifications(
         if is_read is not None:
             query = query.filter(Notification.is_read == is_read)
         
+        # An unknown type matches nothing
         if notification_type:
             query = query.filter(Notification.notification_type == notification_type)
         
@@ -67,7 +73,7 @@ async def get_notifications(
             success=True,
             message="Notifications retrieved successfully",
             data={
-                "notifications": [notification.to_dict() for notification in notifications],
+                "notifications": serialize_many(notifications),
                 "total_count": total_count,
                 "unread_count": db.query(Notification).filter(
                     Notification.user_id == current_user.id,
@@ -350,7 +356,7 @@ async def create_bulk_notifications(
     user_ids: List[str],
     title: str,
     message: str,
-    notification_type: str = "info",
+    notification_type: NotificationType = NotificationType.INFO,
     action_url: Optional[str] = None,
     current_user: User = Depends(require_permission("manage_users")),
     db: Session = Depends(get_db)
@@ -367,25 +373,24 @@ async def create_bulk_notifications(
                 detail="One or more target users not found"
             )
         
-        notifications = []
-        for user_id in user_ids:
-            notification = Notification(
-                user_id=user_id,
-                title=title,
-                message=message,
-                notification_type=notification_type,
-                action_url=action_url,
-                is_read=False
-            )
-            notifications.append(notification)
-        
-        db.add_all(notifications)
+        # One multi-row INSERT rather than a flush of one object per user
+        notification_ids = notification_repo.bulk_create([
+            {
+                "user_id": user_id,
+                "title": title,
+                "message": message,
+                "notification_type": notification_type.value,
+                "action_url": action_url,
+                "is_read": False
+            }
+            for user_id in user_ids
+        ], db=db)
         db.commit()
         
         return NotificationResponse(
             success=True,
-            message=f"Created {len(notifications)} notifications successfully",
-            data={"created_count": len(notifications)}
+            message=f"Created {len(notification_ids)} notifications successfully",
+            data={"created_count": len(notification_ids)}
         )
         
     except HTTPException:
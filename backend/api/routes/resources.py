@@ -4,13 +4,14 @@ Resources API Routes - Wellness resources and content management
 
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 import logging
 
 from utils.auth import get_current_user, require_permission
 from database.connection import get_db
-from database.schema import User, Resource, ResourceInteraction
+from database.schema import User, Resource, ResourceInteraction, ResourceCategory, DifficultyLevel
+from database.serializers import serialize_many
 
 logger = logging.getLogger(__name__)
 
@@ -18,21 +19,26 @@ router = APIRouter(prefix="/api/resources", tags=["resources"])
 
 
 # Pydantic models
+# Enum fields reject unknown values with a 422 and hold the value string
 class ResourceCreateRequest(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     title: str
     description: str
-    category: str
-    difficulty_level: str
+    category: ResourceCategory
+    difficulty_level: DifficultyLevel
     duration_minutes: Optional[int] = None
     content_url: Optional[str] = None
     tags: List[str] = []
     author: Optional[str] = None
 
 class ResourceUpdateRequest(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+    
     title: Optional[str] = None
     description: Optional[str] = None
-    category: Optional[str] = None
-    difficulty_level: Optional[str] = None
+    category: Optional[ResourceCategory] = None
+    difficulty_level: Optional[DifficultyLevel] = None
     duration_minutes: Optional[int] = None
     content_url: Optional[str] = None
     tags: Optional[List[str]] = None
@@ -66,7 +72,7 @@ async def get_resources(
     try:
         query = db.query(Resource).filter(Resource.is_active == True)
         
-        # Apply filters
+        # Apply filters; an unknown category or difficulty matches nothing
         if category:
             query = query.filter(Resource.category == category)
         
@@ -90,7 +96,7 @@ async def get_resources(
             success=True,
             message="Resources retrieved successfully",
             data={
-                "resources": [resource.to_dict() for resource in resources],
+                "resources": serialize_many(resources),
                 "total_count": total_count,
                 "limit": limit,
                 "offset": offset
@@ -358,7 +364,7 @@ async def get_resource_interactions(
             success=True,
             message="Resource interactions retrieved successfully",
             data={
-                "interactions": [interaction.to_dict() for interaction in interactions],
+                "interactions": serialize_many(interactions),
                 "count": len(interactions)
             }
         )
@@ -390,7 +396,7 @@ async def get_user_interactions(
             success=True,
             message="User interactions retrieved successfully",
             data={
-                "interactions": [interaction.to_dict() for interaction in interactions],
+                "interactions": serialize_many(interactions),
                 "count": len(interactions)
             }
         )
@@ -474,7 +480,7 @@ async def get_recommended_resources(
             success=True,
             message="Recommendations retrieved successfully",
             data={
-                "recommendations": [resource.to_dict() for resource in recommendations],
+                "recommendations": serialize_many(recommendations),
                 "count": len(recommendations)
             }
         )
@@ -11,6 +11,7 @@ import logging
 from utils.auth import get_current_user, require_permission, require_role
 from database.connection import get_db
 from database.schema import User
+from database.serializers import serialize_many
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +95,7 @@ async def get_users(
             success=True,
             message="Users retrieved successfully",
             data={
-                "users": [user.to_dict() for user in users],
+                "users": serialize_many(users),
                 "total_count": total_count,
                 "limit": limit,
                 "offset": offset
@@ -379,7 +380,7 @@ async def get_team_members(
             success=True,
             message="Team members retrieved successfully",
             data={
-                "team_members": [member.to_dict() for member in unique_members],
+                "team_members": serialize_many(unique_members),
                 "count": len(unique_members)
             }
         )
@@ -24,6 +24,15 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite:///./wellness_app.db"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a pooled connection; size to worker concurrency
+    DB_USE_NULL_POOL: bool = False  # serverless deploys: pool_size=1 or NullPool + an external proxy (e.g. RDS Proxy)
+    DB_ASYNC_ENABLED: bool = False  # async engine/sessions for event-loop handlers (asyncpg / aiosqlite)
+    DB_RAISE_ON_LAZY_LOAD: bool = False  # dev/test: repository queries raise on any relationship not eager-loaded
+    DB_QUERY_CACHE_SIZE: int = 1200  # compiled SQL statements kept per engine (SQLAlchemy default 500)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # asyncpg server-side prepared statements per connection
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -157,6 +166,7 @@ class TestingSettings(Settings):
     """Testing environment settings"""
     DEBUG: bool = True
     DATABASE_URL: str = "sqlite:///./test_wellness_app.db"
+    DB_RAISE_ON_LAZY_LOAD: bool = True
     ENABLE_MONITORING: bool = False
     ENABLE_AI_CHAT: bool = False
 
@@ -2,11 +2,13 @@
 Database Connection - SQLAlchemy database configuration and session management
 """
 
+import asyncio
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
+from sqlalchemy.pool import StaticPool, NullPool
+from contextlib import contextmanager, asynccontextmanager
 import logging
 
 from config.settings import settings
@@ -16,22 +18,100 @@ logger = logging.getLogger(__name__)
 # Database URL configuration
 DATABASE_URL = settings.DATABASE_URL
 
+
+def _pool_options(database_url: str) -> dict:
+    """
+    Connection pool options for the configured database
+    """
+    if "sqlite" in database_url:
+        # SQLite shares a single connection across threads
+        return {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False}
+        }
+    if settings.DB_USE_NULL_POOL:
+        # Serverless deploys: no in-process pool, rely on an external proxy
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT
+    }
+
+
+def _executemany_options(database_url: str) -> dict:
+    """
+    Batch executemany() for psycopg2: multi-row VALUES for INSERTs and
+    execute_batch for UPDATE/DELETE, instead of one statement per row
+    """
+    if make_url(database_url).get_driver_name() != "psycopg2":
+        return {}
+    return {
+        "executemany_mode": "values_plus_batch",
+        "insertmanyvalues_page_size": 1000,
+        "executemany_batch_page_size": 500
+    }
+
+
 # Engine configuration
 engine = create_engine(
     DATABASE_URL,
-    poolclass=StaticPool,
     pool_pre_ping=True,
-    pool_recycle=300,
     echo=settings.DEBUG,  # Enable SQL logging in debug mode
-    connect_args={
-        "check_same_thread": False
-    } if "sqlite" in DATABASE_URL else {}
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    **_pool_options(DATABASE_URL),
+    **_executemany_options(DATABASE_URL)
 )
 
+# Third-party dialects must opt in to the compiled statement cache; without
+# it every statement is recompiled on each execution
+if not getattr(engine.dialect, "supports_statement_cache", False):
+    logger.warning(f"Dialect {engine.dialect.name} does not support statement caching")
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# Async drivers for the sync URLs used elsewhere
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite"
+}
+
+
+def _async_database_url(database_url: str) -> str:
+    """
+    Map the configured URL onto its async driver
+    """
+    url = make_url(database_url)
+    async_url = url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+    if async_url.get_driver_name() == "asyncpg":
+        # asyncpg prepares statements server-side; keep more of them per
+        # connection so repeated queries skip parse/plan
+        async_url = async_url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+    return async_url.render_as_string(hide_password=False)
+
+
+# Async engine for handlers running on the event loop, behind a flag while
+# repositories migrate; None when DB_ASYNC_ENABLED is off
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    
+    async_engine = create_async_engine(
+        _async_database_url(DATABASE_URL),
+        pool_pre_ping=True,
+        echo=settings.DEBUG,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        **_pool_options(DATABASE_URL)
+    )
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
 def get_db() -> Session:
     """
     Get database session
@@ -64,17 +144,49 @@ def get_db_context():
         db.close()
 
 
+@asynccontextmanager
+async def get_async_db_context():
+    """
+    Async context manager for database sessions (requires DB_ASYNC_ENABLED)
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled; set DB_ASYNC_ENABLED=true")
+    db = AsyncSessionLocal()
+    try:
+        yield db
+        await db.commit()
+    except Exception as e:
+        logger.error(f"Async database context error: {e}")
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+
 def init_db():
     """
     Initialize database tables and seed initial data
     """
-    from database.schema import Base, User, SystemSettings, Resource, ResourceCategory, DifficultyLevel
+    from database.schema import Base, User, SystemSettings, Resource, ResourceCategory, DifficultyLevel, ensure_monthly_partitions
     
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # Warm the pool so the first real query doesn't pay connection setup
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        
+        # Create all tables in one transaction (transactional DDL on PostgreSQL)
+        with engine.begin() as conn:
+            fresh_install = not inspect(conn).has_table(User.__tablename__)
+            Base.metadata.create_all(bind=conn)
+            ensure_monthly_partitions(conn)
         logger.info("Database tables created successfully")
         
+        if fresh_install:
+            # The models already describe the schema every migration leads
+            # to, so a database built from them starts with none pending
+            from database.migrations import migration_manager
+            migration_manager.stamp_migrations()
+        
         # Seed initial data
         seed_initial_data()
         
@@ -185,7 +297,7 @@ def check_db_connection():
     """
     try:
         with get_db_context() as db:
-            db.execute("SELECT 1")
+            db.execute(text("SELECT 1"))
         logger.info("Database connection successful")
         return True
     except Exception as e:
@@ -193,6 +305,33 @@ def check_db_connection():
         return False
 
 
+# Partitions are created months ahead at startup; this keeps them ahead
+# for an application that runs longer than that without a restart
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def maintain_partitions():
+    """
+    Create the upcoming monthly partitions of the partitioned tables
+    """
+    from database.schema import ensure_monthly_partitions
+    
+    try:
+        with engine.begin() as conn:
+            ensure_monthly_partitions(conn)
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}")
+
+
+async def run_partition_maintenance(interval_seconds: float = PARTITION_MAINTENANCE_INTERVAL_SECONDS):
+    """
+    Run maintain_partitions on a schedule until cancelled
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await asyncio.to_thread(maintain_partitions)
+
+
 def get_db_stats():
     """
     Get database statistics
@@ -3,25 +3,143 @@ Database Migration Utility - Handle schema changes and versioning
 """
 
 import os
+import re
 import json
+import time
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set, Tuple
 from sqlalchemy import text, inspect
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 import logging
 
 from database.connection import get_db_context, engine
-from database.schema import Base
+from database.schema import Base, ensure_monthly_partitions
 
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_TABLE = "schema_migrations"
+
+# Resolved from this file so the working directory doesn't matter
+_DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Migrations table statements, built once so SQLAlchemy's compiled cache is
+# hit on every call; values are always bound, never interpolated
+_CREATE_MIGRATIONS_TABLE = text(f"""
+    CREATE TABLE {MIGRATIONS_TABLE} (
+        id SERIAL PRIMARY KEY,
+        version VARCHAR(255) UNIQUE NOT NULL,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        checksum VARCHAR(64),
+        execution_time_ms INTEGER
+    )
+""")
+# Plain string: run with exec_driver_sql on read-only paths
+_SELECT_VERSIONS = f"SELECT version FROM {MIGRATIONS_TABLE} ORDER BY version"
+_INSERT_MIGRATION = text(f"""
+    INSERT INTO {MIGRATIONS_TABLE} 
+    (version, name, checksum, execution_time_ms) 
+    VALUES (:version, :name, :checksum, :execution_time)
+""")
+_DELETE_MIGRATION = text(f"DELETE FROM {MIGRATIONS_TABLE} WHERE version = :version")
+_COUNT_MIGRATIONS = f"SELECT COUNT(*) FROM {MIGRATIONS_TABLE}"
+
+# What the statement splitter steps over whole: comments, quoted strings and
+# identifiers, $tag$ bodies (DO blocks), plus the ';' separator itself
+_SQL_TOKENS = re.compile(r"--[^\n]*|/\*.*?\*/|'[^']*'|\"[^\"]*\"|(\$\w*\$).*?\1|;", re.DOTALL)
+# Statements PostgreSQL refuses to run inside a transaction block
+_NON_TRANSACTIONAL = re.compile(
+    r"(?:CREATE\s+(?:UNIQUE\s+)?INDEX|DROP\s+INDEX|REINDEX\b.*?)\s+CONCURRENTLY\b"
+    r"|ALTER\s+TABLE\b.*\bDETACH\s+PARTITION\b.*\bCONCURRENTLY\b",
+    re.IGNORECASE | re.DOTALL
+)
+# ALTER TABLE ... ADD/DROP COLUMN without IF [NOT] EXISTS (SQLite has neither)
+_ALTER_COLUMN = re.compile(r"ALTER\s+TABLE\s+(\w+)\s+(ADD|DROP)\s+COLUMN\s+(?!IF\b)(\w+)", re.IGNORECASE)
+
+# Reflected schema shared by the migration and validation helpers; cleared
+# whenever this module runs DDL (see invalidate_schema_snapshot)
+_schema_snapshot: Optional[Dict[str, Any]] = None
+
+
+def _refresh_schema_snapshot() -> Dict[str, Any]:
+    """Reflect table names, columns and indexes in a single inspector pass"""
+    global _schema_snapshot
+    inspector = inspect(engine)
+    _schema_snapshot = {
+        'table_names': inspector.get_table_names(),
+        'columns': {table: columns for (_, table), columns in inspector.get_multi_columns().items()},
+        'indexes': {table: indexes for (_, table), indexes in inspector.get_multi_indexes().items()}
+    }
+    return _schema_snapshot
+
+
+def get_schema_snapshot() -> Dict[str, Any]:
+    """Get the cached schema reflection, reflecting on first use"""
+    if _schema_snapshot is None:
+        return _refresh_schema_snapshot()
+    return _schema_snapshot
+
+
+def invalidate_schema_snapshot():
+    """Drop the cached schema reflection; call after any DDL"""
+    global _schema_snapshot
+    _schema_snapshot = None
+
+
+@lru_cache(maxsize=4096)
+def _parse_filename(filename: str) -> Tuple[str, Optional[str]]:
+    """Split a migration filename into (version, name); name is None without a '_' separator"""
+    base = filename[:-4] if filename.endswith('.sql') else filename
+    version, sep, rest = base.partition('_')
+    return version, rest.replace('_', ' ') if sep else None
+
+
+def _migration_dialect(content: str) -> Optional[str]:
+    """Dialect named by a leading "-- dialect: <name>" line, if any"""
+    first_line = content.lstrip().split('\n', 1)[0]
+    prefix = '-- dialect:'
+    if first_line.lower().startswith(prefix):
+        return first_line[len(prefix):].strip().lower()
+    return None
+
+
+def _split_statements(content: str) -> List[str]:
+    """Split migration SQL into its statements, with comments removed"""
+    statements, parts, pos = [], [], 0
+    for match in _SQL_TOKENS.finditer(content):
+        parts.append(content[pos:match.start()])
+        pos = match.end()
+        token = match.group()
+        if token == ';':
+            statements.append(''.join(parts).strip())
+            parts = []
+        else:
+            parts.append(' ' if token.startswith(('--', '/*')) else token)
+    parts.append(content[pos:])
+    statements.append(''.join(parts).strip())
+    return [statement for statement in statements if statement]
+
 
 class MigrationManager:
     """Database migration manager"""
     
     def __init__(self):
-        self.migrations_table = "schema_migrations"
-        self.migrations_dir = "backend/database/migrations"
+        self.migrations_dir = os.path.join(_DATABASE_DIR, "migrations")
+        self.migrations_bundle = os.path.join(_DATABASE_DIR, "migrations.sqlite")
+        # Applied versions, loaded on first use and kept in sync by
+        # apply/rollback so repeated status checks don't re-query
+        self._applied_cache: Optional[Set[str]] = None
+        # Parsed migration files keyed by filename, with the (size, mtime)
+        # they were parsed at
+        self._parse_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        # Number of migrations applied by the last run_migrations call
+        self.last_run_applied_count = 0
         self.ensure_migrations_table()
     
     def ensure_migrations_table(self):
@@ -29,140 +147,347 @@ class MigrationManager:
         try:
             with get_db_context() as db:
                 # Check if migrations table exists
-                inspector = inspect(engine)
-                if self.migrations_table not in inspector.get_table_names():
+                if MIGRATIONS_TABLE not in get_schema_snapshot()['table_names']:
                     # Create migrations table
-                    create_migrations_table = text(f"""
-                        CREATE TABLE {self.migrations_table} (
-                            id SERIAL PRIMARY KEY,
-                            version VARCHAR(255) UNIQUE NOT NULL,
-                            name VARCHAR(255) NOT NULL,
-                            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            checksum VARCHAR(64),
-                            execution_time_ms INTEGER
-                        )
-                    """)
-                    db.execute(create_migrations_table)
+                    db.execute(_CREATE_MIGRATIONS_TABLE)
                     db.commit()
-                    logger.info(f"Created migrations table: {self.migrations_table}")
+                    invalidate_schema_snapshot()
+                    logger.info("Created migrations table: %s", MIGRATIONS_TABLE)
         except Exception as e:
-            logger.error(f"Error ensuring migrations table: {e}")
+            logger.error("Error ensuring migrations table: %s", e)
             raise
     
     def get_applied_migrations(self) -> List[str]:
         """Get list of applied migration versions"""
+        return sorted(self.get_applied_versions())
+    
+    def get_applied_versions(self) -> Set[str]:
+        """Get the set of applied migration versions"""
+        if self._applied_cache is not None:
+            return self._applied_cache
         try:
-            with get_db_context() as db:
-                result = db.execute(text(f"SELECT version FROM {self.migrations_table} ORDER BY version"))
-                return [row[0] for row in result.fetchall()]
+            # Read-only, so skip the Session and go straight to the driver.
+            # Rows are streamed in batches rather than fetched all at once
+            with engine.connect() as conn:
+                result = conn.execution_options(stream_results=True, yield_per=1000).exec_driver_sql(
+                    _SELECT_VERSIONS
+                )
+                self._applied_cache = {row[0] for row in result}
+                return self._applied_cache
         except Exception as e:
-            logger.error(f"Error getting applied migrations: {e}")
-            return []
+            logger.error("Error getting applied migrations: %s", e)
+            return set()
     
     def get_pending_migrations(self) -> List[Dict[str, Any]]:
         """Get list of pending migrations"""
-        applied_versions = set(self.get_applied_migrations())
+        applied_versions = self.get_applied_versions()
         pending_migrations = []
         
+        # Packed releases read every migration from one file; the .sql
+        # directory is the fallback used in development
+        if self._use_bundle():
+            return self._get_pending_from_bundle(applied_versions)
+        
         if not os.path.exists(self.migrations_dir):
             return pending_migrations
         
-        for filename in sorted(os.listdir(self.migrations_dir)):
-            if filename.endswith('.sql'):
-                version = filename.split('_')[0]
-                if version not in applied_versions:
-                    migration_info = self.parse_migration_file(filename)
-                    if migration_info:
-                        pending_migrations.append(migration_info)
+        # Filter on the filename alone so applied migrations are never read
+        with os.scandir(self.migrations_dir) as entries:
+            pending_files = [
+                entry.name for entry in entries
+                if entry.name.endswith('.sql')
+                and _parse_filename(entry.name)[0] not in applied_versions
+                and entry.is_file()
+            ]
+        
+        for filename in sorted(pending_files):
+            migration_info = self.parse_migration_file(filename)
+            if migration_info:
+                pending_migrations.append(migration_info)
         
         return pending_migrations
     
+    def _has_pending_fast(self) -> bool:
+        """Cheaply check for pending migrations by comparing counts, without reading any migration"""
+        try:
+            if self._use_bundle():
+                with closing(sqlite3.connect(self.migrations_bundle)) as conn:
+                    available_count = conn.execute("SELECT COUNT(*) FROM migrations").fetchone()[0]
+            elif os.path.exists(self.migrations_dir):
+                with os.scandir(self.migrations_dir) as entries:
+                    available_count = sum(1 for e in entries if e.name.endswith('.sql') and e.is_file())
+            else:
+                available_count = 0
+            
+            if self._applied_cache is not None:
+                applied_count = len(self._applied_cache)
+            else:
+                with engine.connect() as conn:
+                    applied_count = conn.exec_driver_sql(_COUNT_MIGRATIONS).scalar()
+            
+            return available_count != applied_count
+        except Exception as e:
+            # Fall back to the full check
+            logger.warning("Quick pending-migration check failed: %s", e)
+            return True
+    
+    def _use_bundle(self) -> bool:
+        """Whether to read migrations from the bundle instead of the .sql directory
+        
+        Next to the .sql files, a bundle missing any of them or older than
+        one is rebuilt first, or ignored if it can't be written.
+        """
+        if not os.path.exists(self.migrations_bundle):
+            return False
+        if not os.path.isdir(self.migrations_dir):
+            return True
+        try:
+            bundle_mtime = os.path.getmtime(self.migrations_bundle)
+            with os.scandir(self.migrations_dir) as entries:
+                sql_files = {
+                    e.name: e.stat().st_mtime for e in entries if e.name.endswith('.sql') and e.is_file()
+                }
+            stale = any(mtime > bundle_mtime for mtime in sql_files.values())
+            if not stale:
+                with closing(sqlite3.connect(self.migrations_bundle)) as conn:
+                    bundled = {row[0] for row in conn.execute("SELECT filename FROM migrations")}
+                stale = not bundled.issuperset(sql_files)
+        except Exception as e:
+            logger.warning("Could not check migrations bundle %s: %s", self.migrations_bundle, e)
+            return False
+        if stale:
+            logger.info("Migrations bundle %s is out of date, rebuilding", self.migrations_bundle)
+            return self.bundle_migrations() is not None
+        return True
+    
+    def _get_pending_from_bundle(self, applied_versions: Set[str]) -> List[Dict[str, Any]]:
+        """Read pending migrations from the SQLite migrations bundle in one query"""
+        try:
+            with closing(sqlite3.connect(self.migrations_bundle)) as conn:
+                rows = conn.execute(
+                    "SELECT version, name, filename, content, checksum FROM migrations ORDER BY filename"
+                ).fetchall()
+        except Exception as e:
+            logger.error("Error reading migrations bundle %s: %s", self.migrations_bundle, e)
+            return []
+        
+        return [
+            {
+                'version': version,
+                'name': name,
+                'filename': filename,
+                'filepath': self.migrations_bundle,
+                'content': content,
+                'checksum': checksum
+            }
+            for version, name, filename, content, checksum in rows
+            if version not in applied_versions
+        ]
+    
+    def bundle_migrations(self, bundle_path: Optional[str] = None) -> Optional[str]:
+        """Pack the .sql migration files into a single SQLite file for release builds"""
+        bundle_path = bundle_path or self.migrations_bundle
+        try:
+            with os.scandir(self.migrations_dir) as entries:
+                filenames = sorted(e.name for e in entries if e.name.endswith('.sql') and e.is_file())
+            migrations = [m for m in map(self.parse_migration_file, filenames) if m]
+            
+            with closing(sqlite3.connect(bundle_path)) as conn, conn:
+                conn.execute("DROP TABLE IF EXISTS migrations")
+                conn.execute("""
+                    CREATE TABLE migrations (
+                        version TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        filename TEXT NOT NULL,
+                        content TEXT NOT NULL,
+                        checksum TEXT NOT NULL
+                    )
+                """)
+                conn.executemany(
+                    "INSERT INTO migrations (version, name, filename, content, checksum) VALUES (?, ?, ?, ?, ?)",
+                    [(m['version'], m['name'], m['filename'], m['content'], m['checksum']) for m in migrations]
+                )
+            
+            logger.info("Bundled %s migrations into %s", len(migrations), bundle_path)
+            return bundle_path
+        except Exception as e:
+            logger.error("Error bundling migrations: %s", e)
+            return None
+    
     def parse_migration_file(self, filename: str) -> Optional[Dict[str, Any]]:
         """Parse migration file and extract metadata"""
         try:
             filepath = os.path.join(self.migrations_dir, filename)
-            with open(filepath, 'r') as f:
-                content = f.read()
+            
+            # Unchanged files (same size and mtime) are served from the cache
+            stat = os.stat(filepath)
+            stat_key = (stat.st_size, stat.st_mtime_ns)
+            cached = self._parse_cache.get(filename)
+            if cached and cached[0] == stat_key:
+                return cached[1]
+            
+            # Hash while reading so the content is only walked once
+            checksum = hashlib.sha256()
+            chunks = []
+            with open(filepath, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    checksum.update(chunk)
+                    chunks.append(chunk)
+            content = b''.join(chunks).decode('utf-8')
             
             # Extract version and name from filename
-            parts = filename.replace('.sql', '').split('_', 1)
-            if len(parts) >= 2:
-                version = parts[0]
-                name = parts[1].replace('_', ' ')
-                
-                return {
+            version, name = _parse_filename(filename)
+            if name is not None:
+                migration_info = {
                     'version': version,
                     'name': name,
                     'filename': filename,
                     'filepath': filepath,
-                    'content': content
+                    'content': content,
+                    'checksum': checksum.hexdigest()
                 }
+                self._parse_cache[filename] = (stat_key, migration_info)
+                return migration_info
         except Exception as e:
-            logger.error(f"Error parsing migration file {filename}: {e}")
+            logger.error("Error parsing migration file %s: %s", filename, e)
         
         return None
     
+    def _migration_statements(self, migration: Dict[str, Any]) -> List[str]:
+        """The statements to run for a migration on this database"""
+        # A "-- dialect: <name>" first line limits a migration to one backend
+        # (e.g. INCLUDE/GIN/BRIN indexes); elsewhere it is recorded as applied
+        # without running, since the models already describe the portable form
+        dialect = _migration_dialect(migration['content'])
+        if dialect and dialect != engine.dialect.name:
+            logger.info("Skipping %s-only migration %s", dialect, migration['version'])
+            return []
+        return _split_statements(migration['content'])
+    
+    def _column_change_applied(self, db: Session, statement: str) -> bool:
+        """Whether an ADD/DROP COLUMN statement's change is already in place
+        
+        create_all builds tables with their current columns, so on a fresh
+        database these statements are skipped rather than failing.
+        """
+        match = _ALTER_COLUMN.match(statement)
+        if not match:
+            return False
+        table, action, column = match.groups()
+        columns = {c['name'] for c in inspect(db.connection()).get_columns(table)}
+        return (column in columns) == (action.upper() == 'ADD')
+    
+    def _migration_record(self, migration: Dict[str, Any], execution_time: int) -> Dict[str, Any]:
+        """Build the migrations table row for an applied migration"""
+        return {
+            'version': migration['version'],
+            'name': migration['name'],
+            'checksum': migration['checksum'],
+            'execution_time': execution_time
+        }
+    
+    def _record_applied(self, db: Session, records: List[Dict[str, Any]]):
+        """Record applied migrations with a single executemany and commit them"""
+        if records:
+            db.execute(_INSERT_MIGRATION, records)
+        db.commit()
+        invalidate_schema_snapshot()
+        
+        if self._applied_cache is not None:
+            self._applied_cache.update(record['version'] for record in records)
+        self.last_run_applied_count += len(records)
+    
+    def stamp_migrations(self) -> int:
+        """Record every pending migration as applied without running it"""
+        pending_migrations = self.get_pending_migrations()
+        with get_db_context() as db:
+            self._record_applied(db, [self._migration_record(m, 0) for m in pending_migrations])
+        logger.info("Marked %s migrations as applied", len(pending_migrations))
+        return len(pending_migrations)
+    
     def apply_migration(self, migration: Dict[str, Any]) -> bool:
         """Apply a single migration"""
+        return self._apply_batch([migration])
+    
+    def _apply_batch(self, migrations: List[Dict[str, Any]]) -> bool:
+        """Apply migrations in order on one session, committing their records together
+        
+        Each migration runs in its own savepoint: a failing one is rolled back
+        alone, the ones before it are committed and the rest are left pending.
+        """
+        current_version = None
         try:
-            start_time = datetime.now()
-            
             with get_db_context() as db:
-                # Execute migration SQL
-                db.execute(text(migration['content']))
-                db.commit()
+                records = []
+                for migration in migrations:
+                    current_version = migration['version']
+                    statements = self._migration_statements(migration)
+                    start_ns = time.perf_counter_ns()
+                    
+                    if any(_NON_TRANSACTIONAL.match(statement) for statement in statements):
+                        # Commit the batch first: the autocommit connection can't
+                        # see its uncommitted tables and would wait on its locks
+                        self._record_applied(db, records)
+                        records = []
+                        try:
+                            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                                for statement in statements:
+                                    conn.execute(text(statement))
+                        except Exception as e:
+                            logger.error("Error applying migration %s: %s", current_version, e)
+                            return False
+                        execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+                        self._record_applied(db, [self._migration_record(migration, execution_time)])
+                    else:
+                        try:
+                            with db.begin_nested():
+                                for statement in statements:
+                                    if not self._column_change_applied(db, statement):
+                                        db.execute(text(statement))
+                        except Exception as e:
+                            logger.error("Error applying migration %s: %s", current_version, e)
+                            self._record_applied(db, records)
+                            return False
+                        execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+                        records.append(self._migration_record(migration, execution_time))
+                    logger.info("Applied migration: %s - %s", migration['version'], migration['name'])
                 
-                # Record migration
-                execution_time = (datetime.now() - start_time).total_seconds() * 1000
-                checksum = self.calculate_checksum(migration['content'])
-                
-                insert_migration = text(f"""
-                    INSERT INTO {self.migrations_table} 
-                    (version, name, checksum, execution_time_ms) 
-                    VALUES (:version, :name, :checksum, :execution_time)
-                """)
-                
-                db.execute(insert_migration, {
-                    'version': migration['version'],
-                    'name': migration['name'],
-                    'checksum': checksum,
-                    'execution_time': int(execution_time)
-                })
-                db.commit()
-                
-                logger.info(f"Applied migration: {migration['version']} - {migration['name']}")
+                self._record_applied(db, records)
                 return True
                 
         except Exception as e:
-            logger.error(f"Error applying migration {migration['version']}: {e}")
+            logger.error("Error applying migration %s: %s", current_version, e)
             return False
     
-    def calculate_checksum(self, content: str) -> str:
-        """Calculate checksum for migration content"""
-        import hashlib
-        return hashlib.sha256(content.encode()).hexdigest()
-    
     def run_migrations(self) -> bool:
         """Run all pending migrations"""
+        self.last_run_applied_count = 0
         try:
+            # Common boot path: nothing to do, decided without reading any file
+            if not self._has_pending_fast():
+                logger.info("Migrations are up to date")
+                return True
+            
             pending_migrations = self.get_pending_migrations()
             
             if not pending_migrations:
                 logger.info("No pending migrations to apply")
                 return True
             
-            logger.info(f"Found {len(pending_migrations)} pending migrations")
+            logger.info("Found %s pending migrations", len(pending_migrations))
             
-            for migration in pending_migrations:
-                if not self.apply_migration(migration):
-                    logger.error(f"Failed to apply migration: {migration['version']}")
-                    return False
+            if not self._apply_batch(pending_migrations):
+                logger.error(
+                    "Failed to apply pending migrations (%s of %s applied)",
+                    self.last_run_applied_count, len(pending_migrations)
+                )
+                return False
             
             logger.info("All migrations applied successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Error running migrations: {e}")
+            logger.error("Error running migrations: %s", e)
             return False
     
     def rollback_migration(self, version: str) -> bool:
@@ -171,16 +496,19 @@ class MigrationManager:
             # This is a simplified rollback - in production you'd want more sophisticated rollback logic
             with get_db_context() as db:
                 # Remove migration record
-                db.execute(text(f"DELETE FROM {self.migrations_table} WHERE version = :version"), {
+                db.execute(_DELETE_MIGRATION, {
                     'version': version
                 })
                 db.commit()
+                invalidate_schema_snapshot()
                 
-                logger.info(f"Rolled back migration: {version}")
+                if self._applied_cache is not None:
+                    self._applied_cache.discard(version)
+                logger.info("Rolled back migration: %s", version)
                 return True
                 
         except Exception as e:
-            logger.error(f"Error rolling back migration {version}: {e}")
+            logger.error("Error rolling back migration %s: %s", version, e)
             return False
     
     def get_migration_status(self) -> Dict[str, Any]:
@@ -197,7 +525,7 @@ class MigrationManager:
                 'is_up_to_date': len(pending_migrations) == 0
             }
         except Exception as e:
-            logger.error(f"Error getting migration status: {e}")
+            logger.error("Error getting migration status: %s", e)
             return {}
 
 
@@ -205,23 +533,25 @@ class SchemaValidator:
     """Database schema validator"""
     
     def __init__(self):
-        self.expected_tables = [
+        # Tuple for deterministic ordering, frozenset for membership checks
+        self.expected_tables = (
             'users', 'wellness_entries', 'conversations', 'resources',
             'resource_interactions', 'analytics_events', 'risk_assessments',
             'notifications', 'team_analytics', 'compliance_records',
             'wellness_goals', 'interventions', 'teams', 'team_members',
             'wellness_programs', 'program_participants', 'analytics_reports',
-            'system_settings', 'schema_migrations'
-        ]
+            'system_settings', MIGRATIONS_TABLE
+        )
+        self._expected_set = frozenset(self.expected_tables)
     
-    def validate_schema(self) -> Dict[str, Any]:
+    def validate_schema(self, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Validate current database schema"""
         try:
-            inspector = inspect(engine)
-            existing_tables = inspector.get_table_names()
+            existing_tables = (snapshot or get_schema_snapshot())['table_names']
             
-            missing_tables = set(self.expected_tables) - set(existing_tables)
-            extra_tables = set(existing_tables) - set(self.expected_tables)
+            existing = frozenset(existing_tables)
+            missing_tables = self._expected_set - existing
+            extra_tables = existing - self._expected_set
             
             validation_result = {
                 'is_valid': len(missing_tables) == 0,
@@ -235,27 +565,30 @@ class SchemaValidator:
             if validation_result['is_valid']:
                 logger.info("Database schema validation passed")
             else:
-                logger.warning(f"Database schema validation failed: {validation_result}")
+                logger.warning("Database schema validation failed: %s", validation_result)
             
             return validation_result
             
         except Exception as e:
-            logger.error(f"Error validating schema: {e}")
+            logger.error("Error validating schema: %s", e)
             return {
                 'is_valid': False,
                 'error': str(e),
                 'validation_timestamp': datetime.now().isoformat()
             }
     
-    def get_table_info(self) -> Dict[str, Any]:
+    def get_table_info(self, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Get detailed information about database tables"""
         try:
-            inspector = inspect(engine)
+            snapshot = snapshot or get_schema_snapshot()
+            table_names = snapshot['table_names']
+            with engine.connect() as conn:
+                row_counts = count_table_rows(conn, table_names)
             table_info = {}
             
-            for table_name in inspector.get_table_names():
+            for table_name in table_names:
                 columns = []
-                for column in inspector.get_columns(table_name):
+                for column in snapshot['columns'].get(table_name, []):
                     columns.append({
                         'name': column['name'],
                         'type': str(column['type']),
@@ -265,7 +598,7 @@ class SchemaValidator:
                     })
                 
                 indexes = []
-                for index in inspector.get_indexes(table_name):
+                for index in snapshot['indexes'].get(table_name, []):
                     indexes.append({
                         'name': index['name'],
                         'columns': index['column_names'],
@@ -275,72 +608,71 @@ class SchemaValidator:
                 table_info[table_name] = {
                     'columns': columns,
                     'indexes': indexes,
-                    'row_count': self.get_table_row_count(table_name)
+                    'row_count': row_counts.get(table_name, 0)
                 }
             
             return table_info
             
         except Exception as e:
-            logger.error(f"Error getting table info: {e}")
+            logger.error("Error getting table info: %s", e)
             return {}
-    
-    def get_table_row_count(self, table_name: str) -> int:
-        """Get row count for a specific table"""
-        try:
-            with get_db_context() as db:
-                result = db.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                return result.scalar()
-        except Exception as e:
-            logger.error(f"Error getting row count for {table_name}: {e}")
-            return 0
 
 
 class DatabaseMaintenance:
     """Database maintenance utilities"""
     
     @staticmethod
-    def vacuum_database():
+    def _autocommit_connection() -> Connection:
+        """Open a connection outside any transaction block; VACUUM refuses to run inside one"""
+        return engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    
+    @staticmethod
+    def vacuum_database(conn: Optional[Connection] = None):
         """Vacuum database to reclaim storage and update statistics"""
         try:
-            with get_db_context() as db:
-                db.execute(text("VACUUM"))
-                db.commit()
-                logger.info("Database vacuum completed")
-                return True
+            if conn is None:
+                with DatabaseMaintenance._autocommit_connection() as conn:
+                    return DatabaseMaintenance.vacuum_database(conn)
+            conn.exec_driver_sql("VACUUM")
+            logger.info("Database vacuum completed")
+            return True
         except Exception as e:
-            logger.error(f"Error vacuuming database: {e}")
+            logger.error("Error vacuuming database: %s", e)
             return False
     
     @staticmethod
-    def analyze_tables():
+    def analyze_tables(conn: Optional[Connection] = None):
         """Analyze tables to update statistics"""
         try:
-            with get_db_context() as db:
-                db.execute(text("ANALYZE"))
-                db.commit()
-                logger.info("Database analyze completed")
-                return True
+            if conn is None:
+                with DatabaseMaintenance._autocommit_connection() as conn:
+                    return DatabaseMaintenance.analyze_tables(conn)
+            conn.exec_driver_sql("ANALYZE")
+            logger.info("Database analyze completed")
+            return True
         except Exception as e:
-            logger.error(f"Error analyzing database: {e}")
+            logger.error("Error analyzing database: %s", e)
             return False
     
     @staticmethod
     def optimize_database():
         """Run database optimization tasks"""
         try:
-            # Vacuum database
-            if not DatabaseMaintenance.vacuum_database():
-                return False
-            
-            # Analyze tables
-            if not DatabaseMaintenance.analyze_tables():
-                return False
+            # Both statements share one autocommit connection
+            with DatabaseMaintenance._autocommit_connection() as conn:
+                # Vacuum database
+                if not DatabaseMaintenance.vacuum_database(conn):
+                    return False
+                
+                # Analyze tables
+                if not DatabaseMaintenance.analyze_tables(conn):
+                    return False
             
             logger.info("Database optimization completed")
             return True
             
         except Exception as e:
-            logger.error(f"Error optimizing database: {e}")
+            logger.error("Error optimizing database: %s", e)
             return False
 
 
@@ -355,61 +687,157 @@ def run_database_setup():
     try:
         logger.info("Starting database setup...")
         
+        # Tables may have been created outside this module (e.g. create_all)
+        invalidate_schema_snapshot()
+        
         # Run migrations
         if not migration_manager.run_migrations():
             logger.error("Database migrations failed")
             return False
         
+        # Partitions for tables the migrations have just partitioned
+        with engine.begin() as conn:
+            ensure_monthly_partitions(conn)
+        
         # Validate schema
         validation_result = schema_validator.validate_schema()
         if not validation_result['is_valid']:
             logger.error("Database schema validation failed")
             return False
         
-        # Optimize database
-        if not database_maintenance.optimize_database():
-            logger.warning("Database optimization failed")
+        # Optimize database, only when the schema actually changed; VACUUM
+        # over a large database is too slow to repeat on every boot
+        if migration_manager.last_run_applied_count > 0:
+            if not database_maintenance.optimize_database():
+                logger.warning("Database optimization failed")
+        else:
+            logger.info("No migrations applied, skipping database optimization")
         
         logger.info("Database setup completed successfully")
         return True
         
     except Exception as e:
-        logger.error(f"Database setup failed: {e}")
+        logger.error("Database setup failed: %s", e)
         return False
 
 
+class LazyInfoDict(dict):
+    """Dict whose values for some keys are computed on first access"""
+    
+    def __init__(self, *args, loaders: Optional[Dict[str, Any]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loaders = dict(loaders or {})
+    
+    def __missing__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+        value = self[key] = self._loaders.pop(key)()
+        return value
+    
+    def _load_all(self):
+        for key in list(self._loaders):
+            self[key]
+    
+    def __contains__(self, key):
+        return super().__contains__(key) or key in self._loaders
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    def __iter__(self):
+        self._load_all()
+        return super().__iter__()
+    
+    def __len__(self):
+        return super().__len__() + len(self._loaders)
+    
+    def keys(self):
+        self._load_all()
+        return super().keys()
+    
+    def values(self):
+        self._load_all()
+        return super().values()
+    
+    def items(self):
+        self._load_all()
+        return super().items()
+    
+    def __repr__(self):
+        self._load_all()
+        return super().__repr__()
+
+
 def get_database_info() -> Dict[str, Any]:
-    """Get comprehensive database information"""
+    """Get comprehensive database information
+    
+    ``table_info`` (columns, indexes and row counts for every table) is only
+    built when the key is first read.
+    """
     try:
-        return {
-            'migration_status': migration_manager.get_migration_status(),
-            'schema_validation': schema_validator.validate_schema(),
-            'table_info': schema_validator.get_table_info(),
-            'database_stats': get_database_stats()
-        }
+        # One inspector pass feeds both validation and table details
+        snapshot = get_schema_snapshot()
+        return LazyInfoDict(
+            {
+                'migration_status': migration_manager.get_migration_status(),
+                'schema_validation': schema_validator.validate_schema(snapshot),
+                'database_stats': get_database_stats()
+            },
+            loaders={'table_info': lambda: schema_validator.get_table_info(snapshot)}
+        )
     except Exception as e:
-        logger.error(f"Error getting database info: {e}")
+        logger.error("Error getting database info: %s", e)
         return {'error': str(e)}
 
 
+def _count_rows(table_name: str) -> Tuple[str, int]:
+    """Get the row count for one table on its own pooled connection"""
+    try:
+        with engine.connect() as conn:
+            return table_name, conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table_name}").scalar()
+    except Exception as e:
+        logger.error("Error getting row count for %s: %s", table_name, e)
+        return table_name, 0
+
+
+def count_table_rows(conn: Connection, table_names: List[str]) -> Dict[str, int]:
+    """Get exact row counts for several tables with a single UNION ALL query"""
+    if not table_names:
+        return {}
+    try:
+        count_query = " UNION ALL ".join(
+            f"SELECT '{table_name}', COUNT(*) FROM {table_name}" for table_name in table_names
+        )
+        return {table_name: count for table_name, count in conn.exec_driver_sql(count_query)}
+    except Exception as e:
+        logger.warning("Combined row count failed, counting tables individually: %s", e)
+        conn.rollback()
+    
+    # SQLite shares one connection, so only fan out on pooled databases
+    if engine.dialect.name == "sqlite":
+        return dict(map(_count_rows, table_names))
+    with ThreadPoolExecutor(max_workers=min(8, len(table_names))) as executor:
+        return dict(executor.map(_count_rows, table_names))
+
+
 def get_database_stats() -> Dict[str, Any]:
     """Get database statistics"""
     try:
-        with get_db_context() as db:
+        # Read-only; a bare connection avoids Session setup
+        with engine.connect() as conn:
             # Get basic stats
             stats = {}
             
-            # Table counts
+            # Table counts in one round-trip; missing tables count as 0
+            row_counts = count_table_rows(
+                conn, [t for t in get_schema_snapshot()['table_names'] if t in schema_validator._expected_set]
+            )
             for table_name in schema_validator.expected_tables:
-                try:
-                    result = db.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                    stats[f"{table_name}_count"] = result.scalar()
-                except:
-                    stats[f"{table_name}_count"] = 0
+                stats[f"{table_name}_count"] = row_counts.get(table_name, 0)
             
             # Database size (for PostgreSQL)
             try:
-                result = db.execute(text("SELECT pg_size_pretty(pg_database_size(current_database()))"))
+                result = conn.exec_driver_sql("SELECT pg_size_pretty(pg_database_size(current_database()))")
                 stats['database_size'] = result.scalar()
             except:
                 stats['database_size'] = 'Unknown'
@@ -417,5 +845,5 @@ def get_database_stats() -> Dict[str, Any]:
             return stats
             
     except Exception as e:
-        logger.error(f"Error getting database stats: {e}")
+        logger.error("Error getting database stats: %s", e)
         return {}
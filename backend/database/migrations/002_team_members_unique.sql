@@ -0,0 +1,3 @@
+-- One membership row per (team, user); also lets bulk inserts use
+-- ON CONFLICT (team_id, user_id) DO NOTHING
+CREATE UNIQUE INDEX IF NOT EXISTS uq_team_members_team_user ON team_members(team_id, user_id);
@@ -0,0 +1,2 @@
+-- Keyset pagination of a user's wellness timeline (newest first)
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_user_created_id ON wellness_entries(user_id, created_at DESC, id DESC);
@@ -0,0 +1,16 @@
+-- Composite and partial indexes matching the repository's filter/order
+-- patterns. Plain CREATE INDEX (not CONCURRENTLY) so the file also runs
+-- on SQLite; build these CONCURRENTLY by hand on large PostgreSQL tables.
+
+-- get_entries_by_type: user_id + entry_type, newest first
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_user_type_created ON wellness_entries(user_id, entry_type, created_at DESC);
+
+-- get_high_risk_users: ix_risk_assessments_active_level_score is built by
+-- 023/024 once status holds its SMALLINT code, as WHERE status = 1; a text
+-- predicate here would not survive that conversion
+
+-- get_popular_resources: active resources by rating
+CREATE INDEX IF NOT EXISTS ix_resources_active_rating ON resources(rating DESC) WHERE is_active = TRUE;
+
+-- get_user_notifications: a user's (unread) notifications, newest first
+CREATE INDEX IF NOT EXISTS ix_notifications_user_read_created ON notifications(user_id, is_read, created_at DESC);
@@ -0,0 +1,17 @@
+-- Composite (user_id, ...) indexes for per-user, time-windowed lookups.
+-- Each one leads with user_id, so the single-column user_id indexes it
+-- covers are dropped to save the extra write per insert.
+
+CREATE INDEX IF NOT EXISTS ix_conversations_user_session_created ON conversations(user_id, session_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_analytics_events_user_type_created ON analytics_events(user_id, event_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_resource_interactions_user_created ON resource_interactions(user_id, created_at);
+
+-- Covered by ix_wellness_entries_user_created_id / the indexes above
+-- (idx_* from 001, ix_* from create_all)
+DROP INDEX IF EXISTS idx_wellness_entries_user_id;
+DROP INDEX IF EXISTS ix_wellness_entries_user_id;
+DROP INDEX IF EXISTS idx_conversations_user_id;
+DROP INDEX IF EXISTS ix_conversations_user_id;
+DROP INDEX IF EXISTS idx_resource_interactions_user_id;
+DROP INDEX IF EXISTS ix_resource_interactions_user_id;
+DROP INDEX IF EXISTS ix_analytics_events_user_id;
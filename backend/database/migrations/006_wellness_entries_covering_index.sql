@@ -0,0 +1,7 @@
+-- dialect: postgresql
+-- Rebuild the timeline index as a covering index so per-user timeline
+-- reads of the common score columns are index-only scans.
+DROP INDEX IF EXISTS ix_wellness_entries_user_created_id;
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_user_created_id
+    ON wellness_entries(user_id, created_at DESC, id DESC)
+    INCLUDE (entry_type, value, mood_score, stress_score);
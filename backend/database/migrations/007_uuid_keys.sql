@@ -0,0 +1,37 @@
+-- dialect: postgresql
+-- Convert VARCHAR(36) primary/foreign keys to native uuid (16 bytes).
+-- Foreign keys are dropped, the key columns converted, and the same
+-- constraints re-created from their saved definitions.
+DO $$
+DECLARE
+    fk record;
+    col record;
+BEGIN
+    CREATE TEMP TABLE _uuid_fks ON COMMIT DROP AS
+        SELECT conrelid::regclass::text AS table_name, conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE contype = 'f' AND connamespace = 'public'::regnamespace;
+
+    FOR fk IN SELECT * FROM _uuid_fks LOOP
+        EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.table_name, fk.conname);
+    END LOOP;
+
+    FOR col IN
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+          AND data_type = 'character varying'
+          AND character_maximum_length = 36
+          AND column_name IN (
+              'id', 'user_id', 'manager_id', 'resource_id', 'assessed_by', 'team_id',
+              'assigned_by', 'assigned_to', 'program_id', 'created_by', 'generated_by', 'updated_by'
+          )
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE uuid USING %I::uuid',
+                       col.table_name, col.column_name, col.column_name);
+    END LOOP;
+
+    FOR fk IN SELECT * FROM _uuid_fks LOOP
+        EXECUTE format('ALTER TABLE %s ADD CONSTRAINT %I %s', fk.table_name, fk.conname, fk.definition);
+    END LOOP;
+END $$;
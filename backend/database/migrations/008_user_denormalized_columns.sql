@@ -0,0 +1,23 @@
+-- Denormalized per-user values read on every profile/dashboard request.
+-- Kept current by flush events and the repositories; this backfills them.
+-- The runner skips each ADD COLUMN when the column already exists.
+ALTER TABLE users ADD COLUMN last_wellness_score FLOAT;
+ALTER TABLE users ADD COLUMN last_wellness_at TIMESTAMP;
+ALTER TABLE users ADD COLUMN risk_level_cached VARCHAR(20);
+
+UPDATE users SET
+    last_wellness_score = (
+        SELECT we.value FROM wellness_entries we
+        WHERE we.user_id = users.id
+        ORDER BY we.created_at DESC, we.id DESC
+        LIMIT 1
+    ),
+    last_wellness_at = (
+        SELECT MAX(we.created_at) FROM wellness_entries we WHERE we.user_id = users.id
+    ),
+    risk_level_cached = (
+        SELECT ra.risk_level FROM risk_assessments ra
+        WHERE ra.user_id = users.id AND CAST(ra.status AS VARCHAR(20)) IN ('active', '1')
+        ORDER BY ra.created_at DESC
+        LIMIT 1
+    );
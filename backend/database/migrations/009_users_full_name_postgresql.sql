@@ -0,0 +1,2 @@
+-- dialect: postgresql
+ALTER TABLE users ADD COLUMN IF NOT EXISTS full_name VARCHAR(201) GENERATED ALWAYS AS (first_name || ' ' || last_name) STORED;
@@ -0,0 +1,4 @@
+-- dialect: sqlite
+-- SQLite can only add VIRTUAL generated columns to an existing table;
+-- the value read is the same as the STORED column create_all builds.
+ALTER TABLE users ADD COLUMN full_name VARCHAR(201) GENERATED ALWAYS AS (first_name || ' ' || last_name) VIRTUAL;
@@ -0,0 +1,14 @@
+-- dialect: postgresql
+-- Generate primary keys in the database (PostgreSQL 13+; pgcrypto before).
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND column_name = 'id' AND data_type = 'uuid'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN id SET DEFAULT gen_random_uuid()', col.table_name);
+    END LOOP;
+END $$;
@@ -0,0 +1,23 @@
+-- dialect: postgresql
+-- Store JSON documents as binary JSONB (parsed once on write, indexable)
+DO $$
+DECLARE
+    col record;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name, column_default
+        FROM information_schema.columns
+        WHERE table_schema = 'public' AND data_type = 'json'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I DROP DEFAULT', col.table_name, col.column_name);
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE jsonb USING %I::jsonb',
+                       col.table_name, col.column_name, col.column_name);
+        IF col.column_default IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT (%s)::jsonb',
+                           col.table_name, col.column_name, col.column_default);
+        END IF;
+    END LOOP;
+END $$;
+
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_tags_gin ON wellness_entries USING gin (tags);
+CREATE INDEX IF NOT EXISTS ix_analytics_events_event_data_gin ON analytics_events USING gin (event_data);
@@ -0,0 +1,58 @@
+-- dialect: postgresql
+-- Range-partition the append-only tables by month of created_at (PG 12+).
+-- Each table is rebuilt as a partitioned table keyed on (id, created_at),
+-- with monthly partitions from its oldest row through three months ahead
+-- plus a DEFAULT partition, and its rows copied across. Later months are
+-- added by ensure_monthly_partitions at startup. Tables that are already
+-- partitioned (built that way by create_all) are left as they are.
+DO $$
+DECLARE
+    tbl text;
+    month date;
+BEGIN
+    FOREACH tbl IN ARRAY ARRAY['wellness_entries', 'conversations', 'analytics_events'] LOOP
+        CONTINUE WHEN EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = tbl::regclass);
+
+        EXECUTE format('UPDATE %I SET created_at = now() WHERE created_at IS NULL', tbl);
+        EXECUTE format(
+            'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS, PRIMARY KEY (id, created_at)) '
+            'PARTITION BY RANGE (created_at)',
+            tbl || '_partitioned', tbl
+        );
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', tbl || '_default', tbl || '_partitioned');
+
+        EXECUTE format('SELECT date_trunc(''month'', coalesce(min(created_at), now()))::date FROM %I', tbl)
+            INTO month;
+        WHILE month <= date_trunc('month', now() + interval '3 months')::date LOOP
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                tbl || '_' || to_char(month, 'YYYY_MM'), tbl || '_partitioned',
+                month, (month + interval '1 month')::date
+            );
+            month := (month + interval '1 month')::date;
+        END LOOP;
+
+        EXECUTE format('INSERT INTO %I SELECT * FROM %I', tbl || '_partitioned', tbl);
+        EXECUTE format('DROP TABLE %I', tbl);
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl || '_partitioned', tbl);
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', tbl || '_partitioned_pkey', tbl || '_pkey');
+        EXECUTE format(
+            'ALTER TABLE %I ADD FOREIGN KEY (user_id) REFERENCES users (id)%s',
+            tbl, CASE WHEN tbl = 'analytics_events' THEN '' ELSE ' ON DELETE CASCADE' END
+        );
+    END LOOP;
+END $$;
+
+-- Indexes on the parent are created on every partition
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_user_created_id ON wellness_entries (user_id, created_at DESC, id DESC)
+    INCLUDE (entry_type, value, mood_score, stress_score);
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_user_type_created ON wellness_entries (user_id, entry_type, created_at DESC);
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_tags_gin ON wellness_entries USING gin (tags);
+CREATE INDEX IF NOT EXISTS ix_wellness_entries_created_at ON wellness_entries (created_at);
+
+CREATE INDEX IF NOT EXISTS ix_conversations_user_session_created ON conversations (user_id, session_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_conversations_session_id ON conversations (session_id);
+
+CREATE INDEX IF NOT EXISTS ix_analytics_events_user_type_created ON analytics_events (user_id, event_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_analytics_events_event_data_gin ON analytics_events USING gin (event_data);
+CREATE INDEX IF NOT EXISTS ix_analytics_events_event_type ON analytics_events (event_type);
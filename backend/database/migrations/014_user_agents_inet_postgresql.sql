@@ -0,0 +1,47 @@
+-- dialect: postgresql
+-- ip_address as native inet; user agent strings moved to a user_agents
+-- dimension keyed by the first 64 bits of their md5, referenced by id.
+CREATE TABLE IF NOT EXISTS user_agents (
+    id BIGSERIAL PRIMARY KEY,
+    ua_hash BIGINT NOT NULL UNIQUE,
+    user_agent TEXT NOT NULL
+);
+
+ALTER TABLE analytics_events ADD COLUMN IF NOT EXISTS user_agent_id BIGINT REFERENCES user_agents (id);
+ALTER TABLE compliance_records ADD COLUMN IF NOT EXISTS user_agent_id BIGINT REFERENCES user_agents (id);
+
+-- The backfill only runs while the user_agent text columns still exist
+-- (create_all builds the tables with user_agent_id instead)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'analytics_events' AND column_name = 'user_agent' AND table_schema = current_schema()
+    ) THEN
+        INSERT INTO user_agents (ua_hash, user_agent)
+        SELECT DISTINCT ON (ua_hash) ua_hash, user_agent
+        FROM (
+            SELECT ('x' || substr(md5(user_agent), 1, 16))::bit(64)::bigint AS ua_hash, user_agent
+            FROM (
+                SELECT user_agent FROM analytics_events WHERE user_agent IS NOT NULL AND user_agent <> ''
+                UNION
+                SELECT user_agent FROM compliance_records WHERE user_agent IS NOT NULL AND user_agent <> ''
+            ) AS agents
+        ) AS hashed
+        ON CONFLICT (ua_hash) DO NOTHING;
+
+        UPDATE analytics_events e SET user_agent_id = ua.id
+        FROM user_agents ua
+        WHERE ua.ua_hash = ('x' || substr(md5(e.user_agent), 1, 16))::bit(64)::bigint;
+        UPDATE compliance_records r SET user_agent_id = ua.id
+        FROM user_agents ua
+        WHERE ua.ua_hash = ('x' || substr(md5(r.user_agent), 1, 16))::bit(64)::bigint;
+    END IF;
+END $$;
+
+ALTER TABLE analytics_events DROP COLUMN IF EXISTS user_agent;
+ALTER TABLE compliance_records DROP COLUMN IF EXISTS user_agent;
+
+-- ::text first so the cast also works on columns that are already inet
+ALTER TABLE analytics_events ALTER COLUMN ip_address TYPE inet USING NULLIF(ip_address::text, '')::inet;
+ALTER TABLE compliance_records ALTER COLUMN ip_address TYPE inet USING NULLIF(ip_address::text, '')::inet;
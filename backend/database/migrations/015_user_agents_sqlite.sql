@@ -0,0 +1,16 @@
+-- dialect: sqlite
+-- user_agents dimension (see 014); SQLite keeps ip_address as text. No
+-- md5() here to backfill with, so existing user agent strings are dropped.
+-- The runner skips each ADD/DROP COLUMN already in place (create_all
+-- builds these tables with user_agent_id and without user_agent).
+CREATE TABLE IF NOT EXISTS user_agents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ua_hash BIGINT NOT NULL UNIQUE,
+    user_agent TEXT NOT NULL
+);
+
+ALTER TABLE analytics_events ADD COLUMN user_agent_id BIGINT REFERENCES user_agents (id);
+ALTER TABLE compliance_records ADD COLUMN user_agent_id BIGINT REFERENCES user_agents (id);
+
+ALTER TABLE analytics_events DROP COLUMN user_agent;
+ALTER TABLE compliance_records DROP COLUMN user_agent;
@@ -0,0 +1,85 @@
+-- dialect: postgresql
+-- Enum columns as SMALLINT codes (1-based position in the Python enum, see
+-- CodedEnum). Values were stored as lowercase strings (VARCHAR) or as enum
+-- member names (ENUM types from create_all); lower() maps both.
+-- Values that are already numeric codes are kept as they are.
+ALTER TABLE users ALTER COLUMN role DROP DEFAULT;
+ALTER TABLE users ALTER COLUMN role TYPE smallint USING CASE
+        WHEN role::text ~ '^[0-9]+$' THEN role::text::smallint
+        ELSE CASE lower(role::text)
+            WHEN 'employee' THEN 1
+            WHEN 'manager' THEN 2
+            WHEN 'hr' THEN 3
+            WHEN 'admin' THEN 4
+            WHEN 'executive' THEN 5
+        END
+    END;
+ALTER TABLE users ALTER COLUMN risk_level_cached TYPE smallint USING CASE
+        WHEN risk_level_cached::text ~ '^[0-9]+$' THEN risk_level_cached::text::smallint
+        ELSE CASE lower(risk_level_cached::text)
+            WHEN 'low' THEN 1
+            WHEN 'medium' THEN 2
+            WHEN 'high' THEN 3
+            WHEN 'critical' THEN 4
+        END
+    END;
+ALTER TABLE wellness_entries ALTER COLUMN entry_type TYPE smallint USING CASE
+        WHEN entry_type::text ~ '^[0-9]+$' THEN entry_type::text::smallint
+        ELSE CASE lower(entry_type::text)
+            WHEN 'mood' THEN 1
+            WHEN 'stress' THEN 2
+            WHEN 'energy' THEN 3
+            WHEN 'sleep_quality' THEN 4
+            WHEN 'work_life_balance' THEN 5
+            WHEN 'comprehensive' THEN 6
+            WHEN 'quick_check' THEN 7
+        END
+    END;
+ALTER TABLE resources ALTER COLUMN category TYPE smallint USING CASE
+        WHEN category::text ~ '^[0-9]+$' THEN category::text::smallint
+        ELSE CASE lower(category::text)
+            WHEN 'mental_health' THEN 1
+            WHEN 'physical_health' THEN 2
+            WHEN 'stress_management' THEN 3
+            WHEN 'work_life_balance' THEN 4
+            WHEN 'mindfulness' THEN 5
+            WHEN 'exercise' THEN 6
+            WHEN 'nutrition' THEN 7
+            WHEN 'sleep' THEN 8
+            WHEN 'relationships' THEN 9
+            WHEN 'career_development' THEN 10
+            WHEN 'financial_wellness' THEN 11
+            WHEN 'social_wellness' THEN 12
+        END
+    END;
+ALTER TABLE resources ALTER COLUMN difficulty_level TYPE smallint USING CASE
+        WHEN difficulty_level::text ~ '^[0-9]+$' THEN difficulty_level::text::smallint
+        ELSE CASE lower(difficulty_level::text)
+            WHEN 'beginner' THEN 1
+            WHEN 'intermediate' THEN 2
+            WHEN 'advanced' THEN 3
+        END
+    END;
+ALTER TABLE risk_assessments ALTER COLUMN risk_level TYPE smallint USING CASE
+        WHEN risk_level::text ~ '^[0-9]+$' THEN risk_level::text::smallint
+        ELSE CASE lower(risk_level::text)
+            WHEN 'low' THEN 1
+            WHEN 'medium' THEN 2
+            WHEN 'high' THEN 3
+            WHEN 'critical' THEN 4
+        END
+    END;
+ALTER TABLE notifications ALTER COLUMN notification_type TYPE smallint USING CASE
+        WHEN notification_type::text ~ '^[0-9]+$' THEN notification_type::text::smallint
+        ELSE CASE lower(notification_type::text)
+            WHEN 'info' THEN 1
+            WHEN 'warning' THEN 2
+            WHEN 'success' THEN 3
+            WHEN 'error' THEN 4
+            WHEN 'alert' THEN 5
+        END
+    END;
+ALTER TABLE users ALTER COLUMN role SET DEFAULT 1;
+
+DROP TYPE IF EXISTS userrole;
+DROP TYPE IF EXISTS wellnessentrytype;
@@ -0,0 +1,65 @@
+-- dialect: sqlite
+-- Enum columns as SMALLINT codes (see 016). SQLite keeps the declared
+-- column types; only the stored values change.
+-- Values that are already numeric codes are kept as they are.
+UPDATE users SET role = CASE lower(role)
+        WHEN 'employee' THEN 1
+        WHEN 'manager' THEN 2
+        WHEN 'hr' THEN 3
+        WHEN 'admin' THEN 4
+        WHEN 'executive' THEN 5
+    END
+WHERE role NOT GLOB '[0-9]*';
+UPDATE users SET risk_level_cached = CASE lower(risk_level_cached)
+        WHEN 'low' THEN 1
+        WHEN 'medium' THEN 2
+        WHEN 'high' THEN 3
+        WHEN 'critical' THEN 4
+    END
+WHERE risk_level_cached NOT GLOB '[0-9]*';
+UPDATE wellness_entries SET entry_type = CASE lower(entry_type)
+        WHEN 'mood' THEN 1
+        WHEN 'stress' THEN 2
+        WHEN 'energy' THEN 3
+        WHEN 'sleep_quality' THEN 4
+        WHEN 'work_life_balance' THEN 5
+        WHEN 'comprehensive' THEN 6
+        WHEN 'quick_check' THEN 7
+    END
+WHERE entry_type NOT GLOB '[0-9]*';
+UPDATE resources SET category = CASE lower(category)
+        WHEN 'mental_health' THEN 1
+        WHEN 'physical_health' THEN 2
+        WHEN 'stress_management' THEN 3
+        WHEN 'work_life_balance' THEN 4
+        WHEN 'mindfulness' THEN 5
+        WHEN 'exercise' THEN 6
+        WHEN 'nutrition' THEN 7
+        WHEN 'sleep' THEN 8
+        WHEN 'relationships' THEN 9
+        WHEN 'career_development' THEN 10
+        WHEN 'financial_wellness' THEN 11
+        WHEN 'social_wellness' THEN 12
+    END
+WHERE category NOT GLOB '[0-9]*';
+UPDATE resources SET difficulty_level = CASE lower(difficulty_level)
+        WHEN 'beginner' THEN 1
+        WHEN 'intermediate' THEN 2
+        WHEN 'advanced' THEN 3
+    END
+WHERE difficulty_level NOT GLOB '[0-9]*';
+UPDATE risk_assessments SET risk_level = CASE lower(risk_level)
+        WHEN 'low' THEN 1
+        WHEN 'medium' THEN 2
+        WHEN 'high' THEN 3
+        WHEN 'critical' THEN 4
+    END
+WHERE risk_level NOT GLOB '[0-9]*';
+UPDATE notifications SET notification_type = CASE lower(notification_type)
+        WHEN 'info' THEN 1
+        WHEN 'warning' THEN 2
+        WHEN 'success' THEN 3
+        WHEN 'error' THEN 4
+        WHEN 'alert' THEN 5
+    END
+WHERE notification_type NOT GLOB '[0-9]*';
@@ -0,0 +1,19 @@
+-- Partial indexes on the selective side of two-valued filter columns
+-- (unread notifications, open interventions, active users). The full
+-- boolean indexes they replace are dropped: they cost a write per insert
+-- and were too unselective for the planner to use.
+
+CREATE INDEX IF NOT EXISTS ix_users_active_department ON users(department) WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS ix_notifications_user_created ON notifications(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS ix_notifications_unread ON notifications(user_id, created_at DESC) WHERE is_read = FALSE;
+CREATE INDEX IF NOT EXISTS ix_interventions_active ON interventions(user_id) WHERE status IN ('scheduled', 'active');
+
+-- idx_* from 001, ix_* from create_all
+DROP INDEX IF EXISTS idx_users_is_active;
+DROP INDEX IF EXISTS ix_users_is_active;
+DROP INDEX IF EXISTS idx_resources_is_active;
+DROP INDEX IF EXISTS idx_notifications_is_read;
+DROP INDEX IF EXISTS ix_notifications_user_read_created;
+-- Covered by ix_notifications_user_created
+DROP INDEX IF EXISTS idx_notifications_user_id;
+DROP INDEX IF EXISTS ix_notifications_user_id;
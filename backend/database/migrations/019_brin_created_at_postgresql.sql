@@ -0,0 +1,7 @@
+-- dialect: postgresql
+-- BRIN indexes on created_at for the append-only tables. Rows are written
+-- in time order, so per-range min/max summaries prune time-window scans
+-- with an index of a few pages instead of a full btree.
+CREATE INDEX IF NOT EXISTS ix_conversations_created_brin ON conversations USING brin (created_at) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS ix_analytics_events_created_brin ON analytics_events USING brin (created_at) WITH (pages_per_range = 32);
+CREATE INDEX IF NOT EXISTS ix_compliance_records_created_brin ON compliance_records USING brin (created_at) WITH (pages_per_range = 32);
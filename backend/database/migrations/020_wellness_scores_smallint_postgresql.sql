@@ -0,0 +1,13 @@
+-- dialect: postgresql
+-- 1-10 sub-scores of wellness_entries as SMALLINT tenths (see TenthsScore):
+-- 2 bytes per score instead of 8. value stays double precision since
+-- it is averaged straight into teams.wellness_score in SQL.
+ALTER TABLE wellness_entries ALTER COLUMN mood_score TYPE smallint USING round(mood_score * 10);
+ALTER TABLE wellness_entries ALTER COLUMN stress_score TYPE smallint USING round(stress_score * 10);
+ALTER TABLE wellness_entries ALTER COLUMN energy_score TYPE smallint USING round(energy_score * 10);
+ALTER TABLE wellness_entries ALTER COLUMN sleep_quality TYPE smallint USING round(sleep_quality * 10);
+ALTER TABLE wellness_entries ALTER COLUMN work_life_balance TYPE smallint USING round(work_life_balance * 10);
+ALTER TABLE wellness_entries ALTER COLUMN social_support TYPE smallint USING round(social_support * 10);
+ALTER TABLE wellness_entries ALTER COLUMN physical_activity TYPE smallint USING round(physical_activity * 10);
+ALTER TABLE wellness_entries ALTER COLUMN nutrition_quality TYPE smallint USING round(nutrition_quality * 10);
+ALTER TABLE wellness_entries ALTER COLUMN productivity_level TYPE smallint USING round(productivity_level * 10);
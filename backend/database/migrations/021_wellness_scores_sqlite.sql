@@ -0,0 +1,13 @@
+-- dialect: sqlite
+-- wellness_entries sub-scores as integer tenths (see 020). SQLite keeps
+-- the declared column types; only the stored values change.
+UPDATE wellness_entries SET
+    mood_score = CAST(round(mood_score * 10) AS INTEGER),
+    stress_score = CAST(round(stress_score * 10) AS INTEGER),
+    energy_score = CAST(round(energy_score * 10) AS INTEGER),
+    sleep_quality = CAST(round(sleep_quality * 10) AS INTEGER),
+    work_life_balance = CAST(round(work_life_balance * 10) AS INTEGER),
+    social_support = CAST(round(social_support * 10) AS INTEGER),
+    physical_activity = CAST(round(physical_activity * 10) AS INTEGER),
+    nutrition_quality = CAST(round(nutrition_quality * 10) AS INTEGER),
+    productivity_level = CAST(round(productivity_level * 10) AS INTEGER);
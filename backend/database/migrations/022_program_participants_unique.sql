@@ -0,0 +1,4 @@
+-- One live enrollment per (program, user); dropped enrollments stay as
+-- history. Also lets enrollment use ON CONFLICT ... WHERE status <> 'dropped'.
+-- Fails if live duplicates already exist: mark the extras 'dropped' first.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_program_participants_active ON program_participants(program_id, user_id) WHERE status <> 'dropped';
@@ -0,0 +1,41 @@
+-- dialect: postgresql
+-- Remaining low-cardinality text columns as SMALLINT codes (see 016 and
+-- CodedEnum). The partial index on active assessments compares status to
+-- a text literal, so it is rebuilt against the code.
+-- Values that are already numeric codes are kept as they are.
+DROP INDEX IF EXISTS ix_risk_assessments_active_level_score;
+ALTER TABLE risk_assessments ALTER COLUMN status DROP DEFAULT;
+ALTER TABLE conversations ALTER COLUMN sender TYPE smallint USING CASE
+        WHEN sender::text ~ '^[0-9]+$' THEN sender::text::smallint
+        ELSE CASE lower(sender::text)
+            WHEN 'user' THEN 1
+            WHEN 'ai' THEN 2
+        END
+    END;
+ALTER TABLE conversations ALTER COLUMN sentiment TYPE smallint USING CASE
+        WHEN sentiment::text ~ '^[0-9]+$' THEN sentiment::text::smallint
+        ELSE CASE lower(sentiment::text)
+            WHEN 'positive' THEN 1
+            WHEN 'negative' THEN 2
+            WHEN 'neutral' THEN 3
+        END
+    END;
+ALTER TABLE conversations ALTER COLUMN risk_level TYPE smallint USING CASE
+        WHEN risk_level::text ~ '^[0-9]+$' THEN risk_level::text::smallint
+        ELSE CASE lower(risk_level::text)
+            WHEN 'low' THEN 1
+            WHEN 'medium' THEN 2
+            WHEN 'high' THEN 3
+            WHEN 'critical' THEN 4
+        END
+    END;
+ALTER TABLE risk_assessments ALTER COLUMN status TYPE smallint USING CASE
+        WHEN status::text ~ '^[0-9]+$' THEN status::text::smallint
+        ELSE CASE lower(status::text)
+            WHEN 'active' THEN 1
+            WHEN 'resolved' THEN 2
+            WHEN 'escalated' THEN 3
+        END
+    END;
+ALTER TABLE risk_assessments ALTER COLUMN status SET DEFAULT 1;
+CREATE INDEX IF NOT EXISTS ix_risk_assessments_active_level_score ON risk_assessments(status, risk_level, risk_score DESC) WHERE status = 1;
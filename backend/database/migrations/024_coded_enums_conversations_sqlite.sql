@@ -0,0 +1,30 @@
+-- dialect: sqlite
+-- conversations/risk_assessments codes (see 023). SQLite keeps the declared
+-- column types; only the stored values change.
+-- Values that are already numeric codes are kept as they are.
+DROP INDEX IF EXISTS ix_risk_assessments_active_level_score;
+UPDATE conversations SET sender = CASE lower(sender)
+        WHEN 'user' THEN 1
+        WHEN 'ai' THEN 2
+    END
+WHERE sender NOT GLOB '[0-9]*';
+UPDATE conversations SET sentiment = CASE lower(sentiment)
+        WHEN 'positive' THEN 1
+        WHEN 'negative' THEN 2
+        WHEN 'neutral' THEN 3
+    END
+WHERE sentiment NOT GLOB '[0-9]*';
+UPDATE conversations SET risk_level = CASE lower(risk_level)
+        WHEN 'low' THEN 1
+        WHEN 'medium' THEN 2
+        WHEN 'high' THEN 3
+        WHEN 'critical' THEN 4
+    END
+WHERE risk_level NOT GLOB '[0-9]*';
+UPDATE risk_assessments SET status = CASE lower(status)
+        WHEN 'active' THEN 1
+        WHEN 'resolved' THEN 2
+        WHEN 'escalated' THEN 3
+    END
+WHERE status NOT GLOB '[0-9]*';
+CREATE INDEX IF NOT EXISTS ix_risk_assessments_active_level_score ON risk_assessments(status, risk_level, risk_score DESC) WHERE status = 1;
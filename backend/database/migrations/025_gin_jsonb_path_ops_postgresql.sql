@@ -0,0 +1,8 @@
+-- dialect: postgresql
+-- analytics_events.event_data is only filtered by containment (@>), so its
+-- GIN index moves to the smaller jsonb_path_ops opclass; resources.tags
+-- gets the same for catalog tag filters. wellness_entries.tags keeps the
+-- default opclass, which also serves key existence (?).
+DROP INDEX IF EXISTS ix_analytics_events_event_data_gin;
+CREATE INDEX IF NOT EXISTS ix_analytics_events_event_data_gin ON analytics_events USING gin (event_data jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS ix_resources_tags_gin ON resources USING gin (tags jsonb_path_ops);
@@ -0,0 +1,10 @@
+-- (user_id, created_at DESC) for "latest N for a user" reads that had no
+-- matching composite: conversations across sessions and risk assessments.
+-- Ordered-limit scans read the index in order instead of sorting.
+
+CREATE INDEX IF NOT EXISTS ix_conversations_user_created ON conversations(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS ix_risk_assessments_user_created ON risk_assessments(user_id, created_at DESC);
+
+-- Covered by ix_risk_assessments_user_created (idx_* from 001, ix_* from create_all)
+DROP INDEX IF EXISTS idx_risk_assessments_user_id;
+DROP INDEX IF EXISTS ix_risk_assessments_user_id;
@@ -0,0 +1,32 @@
+-- dialect: postgresql
+-- Timestamp defaults move to the database (server_default=now()), so
+-- INSERTs no longer list these columns and RETURNING reads them back.
+-- Tables from 001 already have these defaults; this sets them on tables
+-- created by create_all. SQLite cannot alter column defaults: recreate
+-- create_all-built SQLite databases, or keep them on 001's schema.
+ALTER TABLE resources ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE resources ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE users ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE users ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE analytics_reports ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE compliance_records ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE interventions ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE interventions ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE notifications ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE resource_interactions ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE risk_assessments ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE risk_assessments ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE system_settings ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE system_settings ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE team_analytics ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE teams ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE teams ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE wellness_entries ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE wellness_goals ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE wellness_goals ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE wellness_programs ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE wellness_programs ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE program_participants ALTER COLUMN enrollment_date SET DEFAULT now();
+ALTER TABLE program_participants ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE program_participants ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE team_members ALTER COLUMN joined_at SET DEFAULT now();
@@ -0,0 +1,40 @@
+-- dialect: postgresql
+-- Range-partition compliance_records (the audit trail) by month of
+-- created_at, as 013 did for the other append-only tables: rebuilt keyed
+-- on (id, created_at) with monthly partitions from the oldest row through
+-- three months ahead plus a DEFAULT partition. Expired months can then be
+-- detached and dropped instead of deleted row by row. A table that is
+-- already partitioned (built that way by create_all) is left as it is.
+DO $$
+DECLARE
+    month date;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'compliance_records'::regclass) THEN
+        RETURN;
+    END IF;
+
+    UPDATE compliance_records SET created_at = now() WHERE created_at IS NULL;
+    CREATE TABLE compliance_records_partitioned (
+        LIKE compliance_records INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at);
+    CREATE TABLE compliance_records_default PARTITION OF compliance_records_partitioned DEFAULT;
+
+    SELECT date_trunc('month', coalesce(min(created_at), now()))::date FROM compliance_records INTO month;
+    WHILE month <= date_trunc('month', now() + interval '3 months')::date LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF compliance_records_partitioned FOR VALUES FROM (%L) TO (%L)',
+            'compliance_records_' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+
+    INSERT INTO compliance_records_partitioned SELECT * FROM compliance_records;
+    DROP TABLE compliance_records;
+    ALTER TABLE compliance_records_partitioned RENAME TO compliance_records;
+    ALTER INDEX compliance_records_partitioned_pkey RENAME TO compliance_records_pkey;
+    ALTER TABLE compliance_records ADD FOREIGN KEY (user_id) REFERENCES users (id);
+    ALTER TABLE compliance_records ADD FOREIGN KEY (user_agent_id) REFERENCES user_agents (id);
+END $$;
+
+CREATE INDEX IF NOT EXISTS ix_compliance_records_created_brin ON compliance_records USING brin (created_at) WITH (pages_per_range = 32);
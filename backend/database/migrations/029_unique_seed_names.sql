@@ -0,0 +1,47 @@
+-- Unique team and program names and resource titles, so seeding can
+-- INSERT ... ON CONFLICT DO NOTHING instead of adding the same rows again.
+-- Earlier re-runs of the seed left duplicates behind: each name keeps its
+-- lowest id, references to the other copies are moved onto it (dropping
+-- memberships/enrollments it already has), and the copies are deleted.
+
+DELETE FROM team_members
+WHERE EXISTS (
+    SELECT 1 FROM team_members m
+    JOIN teams k ON k.id = m.team_id
+    JOIN teams d ON d.name = k.name AND k.id < d.id
+    WHERE d.id = team_members.team_id AND m.user_id = team_members.user_id
+);
+UPDATE team_members SET team_id = (
+    SELECT k.id FROM teams k JOIN teams d ON d.name = k.name
+    WHERE d.id = team_members.team_id
+      AND NOT EXISTS (SELECT 1 FROM teams e WHERE e.name = k.name AND e.id < k.id)
+)
+WHERE team_id IN (SELECT d.id FROM teams d WHERE EXISTS (SELECT 1 FROM teams k WHERE k.name = d.name AND k.id < d.id));
+DELETE FROM teams WHERE EXISTS (SELECT 1 FROM teams k WHERE k.name = teams.name AND k.id < teams.id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_teams_name ON teams(name);
+
+DELETE FROM program_participants
+WHERE status <> 'dropped' AND EXISTS (
+    SELECT 1 FROM program_participants m
+    JOIN wellness_programs k ON k.id = m.program_id
+    JOIN wellness_programs d ON d.name = k.name AND k.id < d.id
+    WHERE d.id = program_participants.program_id
+      AND m.user_id = program_participants.user_id AND m.status <> 'dropped'
+);
+UPDATE program_participants SET program_id = (
+    SELECT k.id FROM wellness_programs k JOIN wellness_programs d ON d.name = k.name
+    WHERE d.id = program_participants.program_id
+      AND NOT EXISTS (SELECT 1 FROM wellness_programs e WHERE e.name = k.name AND e.id < k.id)
+)
+WHERE program_id IN (SELECT d.id FROM wellness_programs d WHERE EXISTS (SELECT 1 FROM wellness_programs k WHERE k.name = d.name AND k.id < d.id));
+DELETE FROM wellness_programs WHERE EXISTS (SELECT 1 FROM wellness_programs k WHERE k.name = wellness_programs.name AND k.id < wellness_programs.id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_wellness_programs_name ON wellness_programs(name);
+
+UPDATE resource_interactions SET resource_id = (
+    SELECT k.id FROM resources k JOIN resources d ON d.title = k.title
+    WHERE d.id = resource_interactions.resource_id
+      AND NOT EXISTS (SELECT 1 FROM resources e WHERE e.title = k.title AND e.id < k.id)
+)
+WHERE resource_id IN (SELECT d.id FROM resources d WHERE EXISTS (SELECT 1 FROM resources k WHERE k.title = d.title AND k.id < d.id));
+DELETE FROM resources WHERE EXISTS (SELECT 1 FROM resources k WHERE k.title = resources.title AND k.id < resources.id);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_resources_title ON resources(title);
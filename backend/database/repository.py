@@ -2,116 +2,460 @@
 Database Repository Layer - Clean data access patterns for the wellness application
 """
 
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy.orm import Session, Query
-from sqlalchemy import and_, or_, desc, asc, func
+from typing import List, Optional, Dict, Any, Union, Tuple, Iterator
+from sqlalchemy.orm import Session, sessionmaker, selectinload, joinedload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import MANYTOONE
+from sqlalchemy import and_, or_, desc, asc, func, case, exists, event, select, insert, update, bindparam, lambda_stmt, text
+from sqlalchemy.exc import OperationalError, DisconnectionError
 from datetime import datetime, date, timedelta
+from contextlib import contextmanager
+from functools import wraps
+import asyncio
+import copy
+import hashlib
+import inspect
+import json
 import logging
+import threading
+import time
+
+from cachetools import TTLCache
 
 from database.schema import (
     User, WellnessEntry, Conversation, Resource, ResourceInteraction,
     AnalyticsEvent, RiskAssessment, Notification, TeamAnalytics,
     ComplianceRecord, WellnessGoal, Intervention, Team, TeamMember,
-    WellnessProgram, ProgramParticipant, AnalyticsReport, SystemSettings
+    WellnessProgram, ProgramParticipant, AnalyticsReport, SystemSettings, UserAgent,
+    refresh_user_wellness_snapshot, refresh_user_risk_level
 )
-from database.connection import get_db_context
+from database.serializers import WellnessTrendPointOut, serialize, serialize_many, serialize_rows
+from config.settings import settings
+from database.connection import engine, get_async_db_context
 
 logger = logging.getLogger(__name__)
 
+# Shared session factory for repositories. Objects stay readable after commit
+# since repository methods hand them back after their session closes.
+RepositorySession = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+@contextmanager
+def session_scope(db: Optional[Session] = None):
+    """Yield the caller's session if given, otherwise a short-lived one
+    
+    A caller-provided session is left for its owner to commit, so several
+    repository calls can share one connection checkout and one transaction.
+    A short-lived session is committed on exit and rolled back on error.
+    """
+    if db is not None:
+        yield db
+        return
+    session = RepositorySession()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        # Logged once, with context, by db_operation
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+# Errors worth retrying: the connection dropped or the server gave up on
+# the statement. Either can also happen after a write has committed.
+TRANSIENT_ERRORS = (OperationalError, DisconnectionError)
+
+
+def db_operation(default: Any = None, retry_on: Tuple[type, ...] = (),
+                 attempts: int = 3, backoff: float = 0.1, reraise: bool = False):
+    """Error handling shared by repository methods
+    
+    Transient errors (retry_on) are retried up to attempts times with
+    exponential backoff, but only when the method owns its session; inside a
+    caller's session the transaction is already lost, so the error is
+    handled like any other. Retrying is opt-in: only reads and idempotent
+    upserts pass retry_on=TRANSIENT_ERRORS, since re-running a plain INSERT
+    whose commit did reach the server would duplicate its rows. Other errors are logged with the operation name
+    and a copy of default is returned, or re-raised with reraise=True.
+    Generators are retried only until their first row is yielded.
+    """
+    def decorator(func):
+        parameters = list(inspect.signature(func).parameters)
+        db_index = parameters.index('db') if 'db' in parameters else None
+        
+        def owns_session(args, kwargs) -> bool:
+            if db_index is None:
+                return True
+            if 'db' in kwargs:
+                return kwargs['db'] is None
+            return len(args) <= db_index or args[db_index] is None
+        
+        def handle(args, kwargs, error: Exception, attempt: int) -> Optional[float]:
+            """Delay before the next attempt, or None once the error is final"""
+            operation = f"{type(args[0]).__name__}.{func.__name__}"
+            if isinstance(error, retry_on) and attempt < attempts and owns_session(args, kwargs):
+                logger.warning(
+                    f"Retrying {operation} after transient error (attempt {attempt}/{attempts}): {error}",
+                    extra={"operation": operation, "attempt": attempt}
+                )
+                return backoff * 2 ** (attempt - 1)
+            logger.error(f"Error in {operation}: {error}", extra={"operation": operation, "attempt": attempt})
+            return None
+        
+        if inspect.isasyncgenfunction(func):
+            raise TypeError("db_operation does not support async generators")
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(1, attempts + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        delay = handle(args, kwargs, e, attempt)
+                        if delay is None:
+                            if reraise:
+                                raise
+                            return copy.copy(default)
+                    await asyncio.sleep(delay)
+            return async_wrapper
+        
+        if inspect.isgeneratorfunction(func):
+            @wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                for attempt in range(1, attempts + 1):
+                    started = False
+                    try:
+                        for item in func(*args, **kwargs):
+                            started = True
+                            yield item
+                        return
+                    except Exception as e:
+                        # Rows already handed out can't be taken back, so
+                        # an error mid-stream is final
+                        delay = handle(args, kwargs, e, attempts if started else attempt)
+                        if delay is None:
+                            if reraise:
+                                raise
+                            return
+                    time.sleep(delay)
+            return generator_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    delay = handle(args, kwargs, e, attempt)
+                    if delay is None:
+                        if reraise:
+                            raise
+                        return copy.copy(default)
+                time.sleep(delay)
+        return wrapper
+    return decorator
+
+
+# Hot lookups built once as lambda statements, so SQLAlchemy can reuse the
+# compiled SQL without rebuilding the statement on every call
+_USER_BY_EMAIL = lambda_stmt(lambda: select(User).where(User.email == bindparam('email')))
+_TEAMS_BY_MANAGER = lambda_stmt(
+    lambda: select(Team).where(Team.manager_id == bindparam('manager_id'), Team.is_active == True)
+)
+_CONVERSATIONS_BY_USER = lambda_stmt(
+    lambda: select(Conversation).where(
+        Conversation.user_id == bindparam('user_id')
+    ).order_by(desc(Conversation.created_at)).limit(bindparam('limit'))
+)
+_CONVERSATIONS_BY_USER_SESSION = lambda_stmt(
+    lambda: select(Conversation).where(
+        Conversation.user_id == bindparam('user_id'),
+        Conversation.session_id == bindparam('session_id')
+    ).order_by(desc(Conversation.created_at)).limit(bindparam('limit'))
+)
+_CONVERSATIONS_BY_SESSION = lambda_stmt(
+    lambda: select(Conversation).where(
+        Conversation.session_id == bindparam('session_id')
+    ).order_by(desc(Conversation.created_at)).limit(bindparam('limit'))
+)
+
+# The search pattern is a bound parameter, so every search shares one
+# compiled statement instead of filling the cache with one per query string
+_SEARCH_RESOURCES = lambda_stmt(
+    lambda: select(Resource).where(
+        Resource.is_active == True,
+        or_(
+            Resource.title.ilike(bindparam('pattern')),
+            Resource.description.ilike(bindparam('pattern'))
+        )
+    )
+)
+
+
+def _loader_options(model_class, load_related: Optional[List[str]]) -> list:
+    """Eager-load options for the named relationships of model_class
+    
+    Returned objects outlive their session, so relationships a caller
+    needs must be loaded up front: many-to-one links are joined into the
+    main query, collections are fetched with one SELECT ... IN per
+    relationship. With DB_RAISE_ON_LAZY_LOAD every other relationship
+    raises when touched, so N+1 patterns fail loudly in dev and tests.
+    """
+    options = []
+    for name in load_related or ():
+        attribute = getattr(model_class, name)
+        if attribute.property.direction is MANYTOONE:
+            options.append(joinedload(attribute))
+        else:
+            options.append(selectinload(attribute))
+    if settings.DB_RAISE_ON_LAZY_LOAD:
+        options.append(raiseload("*"))
+    return options
+
+
+# Redis read-through cache for the resource catalog
+RESOURCE_CACHE_PREFIX = "res:"
+RESOURCE_CACHE_TTL = 300  # seconds
+_redis_client = None
+
+
+def _get_redis():
+    """Shared Redis client, created on first use; None when Redis is unavailable"""
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis
+            # Short timeouts so a missing Redis degrades to plain DB reads
+            _redis_client = redis.Redis.from_url(
+                settings.REDIS_URL, db=settings.REDIS_DB, socket_connect_timeout=1, socket_timeout=1
+            )
+        except Exception as e:
+            logger.warning(f"Redis unavailable, resource cache disabled: {e}")
+            return None
+    return _redis_client
+
+
+def _insert_for(session: Session, model_class):
+    """INSERT for the bound dialect; PostgreSQL and SQLite support ON CONFLICT"""
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(model_class)
+    return dialect_insert(model_class)
+
+
+def user_agent_hash(user_agent: str) -> int:
+    """First 64 bits of md5(user_agent) as a signed BIGINT
+    
+    The same value PostgreSQL computes with
+    ('x' || substr(md5(user_agent), 1, 16))::bit(64)::bigint.
+    """
+    return int.from_bytes(hashlib.md5(user_agent.encode()).digest()[:8], "big", signed=True)
+
+
+def get_user_agent_id(session: Session, user_agent: Optional[str]) -> Optional[int]:
+    """user_agents id for a user agent string, inserting the string the first time it is seen"""
+    if not user_agent:
+        return None
+    ua_hash = user_agent_hash(user_agent)
+    lookup = select(UserAgent.id).where(UserAgent.ua_hash == ua_hash)
+    ua_id = session.scalar(lookup)
+    if ua_id is None:
+        stmt = _insert_for(session, UserAgent).values(ua_hash=ua_hash, user_agent=user_agent)
+        if hasattr(stmt, "on_conflict_do_nothing"):
+            # A concurrent insert of the same string wins; read its id below
+            stmt = stmt.on_conflict_do_nothing(index_elements=["ua_hash"])
+        ua_id = session.scalar(stmt.returning(UserAgent.id))
+        if ua_id is None:
+            ua_id = session.scalar(lookup)
+    return ua_id
+
+
+def _team_wellness_average(team_id, start_date: datetime):
+    """Scalar subquery averaging active members' wellness entries since start_date
+    
+    team_id may be a literal or Team.id (correlated, for multi-team updates).
+    """
+    return select(func.avg(WellnessEntry.value)).join(
+        TeamMember, TeamMember.user_id == WellnessEntry.user_id
+    ).where(
+        TeamMember.team_id == team_id,
+        TeamMember.is_active == True,
+        WellnessEntry.created_at >= start_date
+    ).scalar_subquery()
+
 
 class BaseRepository:
     """Base repository with common CRUD operations"""
     
     def __init__(self, model_class):
         self.model_class = model_class
+        # This model's INSERT statements, built once rather than on every
+        # call; executions reuse their compiled form from the engine cache
+        self._insert_returning_row = insert(model_class).returning(model_class)
+        self._insert_returning_id = insert(model_class).returning(model_class.id)
     
-    def create(self, data: Dict[str, Any]) -> Any:
-        """Create a new record"""
-        try:
-            with get_db_context() as db:
-                instance = self.model_class(**data)
-                db.add(instance)
-                db.commit()
-                db.refresh(instance)
-                return instance
-        except Exception as e:
-            logger.error(f"Error creating {self.model_class.__name__}: {e}")
-            raise
+    @db_operation(reraise=True)
+    def create(self, data: Dict[str, Any], db: Optional[Session] = None) -> Any:
+        """Create a new record
+        
+        When a session is passed in the record joins the caller's transaction;
+        committing is left to the session owner. The INSERT returns the full
+        row, so database-generated values are loaded without a refresh.
+        """
+        with session_scope(db) as session:
+            instance = session.scalars(self._insert_returning_row, [data]).one()
+            self._after_insert(session, [data])
+            return instance
     
-    def get_by_id(self, record_id: str) -> Optional[Any]:
-        """Get record by ID"""
-        try:
-            with get_db_context() as db:
-                return db.query(self.model_class).filter(
-                    self.model_class.id == record_id
-                ).first()
-        except Exception as e:
-            logger.error(f"Error getting {self.model_class.__name__} by ID: {e}")
-            return None
+    def _after_insert(self, session: Session, rows: List[Dict[str, Any]]):
+        """Hook run in the inserting transaction by create/bulk_create
+        
+        INSERT statements skip mapper events, so repositories whose models
+        maintain derived data via events override this instead.
+        """
     
-    def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Any]:
-        """Get all records with optional pagination"""
-        try:
-            with get_db_context() as db:
-                query = db.query(self.model_class)
-                if offset:
-                    query = query.offset(offset)
-                if limit:
-                    query = query.limit(limit)
-                return query.all()
-        except Exception as e:
-            logger.error(f"Error getting all {self.model_class.__name__}: {e}")
+    def _fetch(self, session: Session, columns: Optional[Tuple[str, ...]], build) -> List[Any]:
+        """Run build(select(...)) for whole objects, or for only the named columns as dicts"""
+        if not columns:
+            return list(session.scalars(build(select(self.model_class))))
+        stmt = build(select(*(getattr(self.model_class, name) for name in columns)))
+        return [dict(row) for row in session.execute(stmt).mappings()]
+    
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def _iter(self, stmt, chunk_size: int, db: Optional[Session] = None) -> Iterator[Any]:
+        """Stream ORM results in chunks of chunk_size rather than loading them all
+        
+        The session stays open until the generator is exhausted or closed.
+        """
+        with session_scope(db) as session:
+            yield from session.scalars(stmt.execution_options(yield_per=chunk_size))
+    
+    @db_operation(reraise=True)
+    def bulk_create(self, rows: List[Dict[str, Any]], ignore_conflicts_on: Optional[List[str]] = None,
+                    db: Optional[Session] = None) -> List[str]:
+        """Insert many records in one statement and return the new ids
+        
+        With ignore_conflicts_on, rows clashing with the unique constraint on
+        those columns are skipped (ON CONFLICT DO NOTHING) and left out of the
+        returned ids.
+        """
+        if not rows:
             return []
+        with session_scope(db) as session:
+            stmt = self._insert_returning_id
+            if ignore_conflicts_on:
+                stmt = _insert_for(session, self.model_class).on_conflict_do_nothing(
+                    index_elements=list(ignore_conflicts_on)
+                ).returning(self.model_class.id)
+            ids = list(session.scalars(stmt, rows))
+            self._after_insert(session, rows)
+            return ids
+    
+    @db_operation(default=False)
+    def bulk_update(self, rows: List[Dict[str, Any]], db: Optional[Session] = None) -> bool:
+        """Update many records by primary key; each row needs an 'id' plus the fields to set"""
+        if not rows:
+            return True
+        with session_scope(db) as session:
+            session.execute(update(self.model_class), rows)
+            self._after_update(session, rows)
+            return True
     
-    def update(self, record_id: str, data: Dict[str, Any]) -> Optional[Any]:
+    def _after_update(self, session: Session, rows: List[Dict[str, Any]]):
+        """Hook run in the updating transaction by bulk_update; see _after_insert"""
+    
+    def _user_ids_for(self, session: Session, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Distinct user_id of the records with the rows' ids"""
+        return list(session.scalars(
+            select(self.model_class.user_id).where(
+                self.model_class.id.in_([row['id'] for row in rows])
+            ).distinct()
+        ))
+    
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def get_by_id(self, record_id: str, db: Optional[Session] = None) -> Optional[Any]:
+        """Get record by ID"""
+        with session_scope(db) as session:
+            # Primary-key load; served from the identity map when the
+            # caller's session already holds the row
+            return session.get(self.model_class, record_id)
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None,
+                load_related: Optional[List[str]] = None, db: Optional[Session] = None) -> List[Any]:
+        """Get all records with optional pagination and eager-loaded relationships"""
+        with session_scope(db) as session:
+            stmt = select(self.model_class).options(*_loader_options(self.model_class, load_related))
+            if offset:
+                stmt = stmt.offset(offset)
+            if limit:
+                stmt = stmt.limit(limit)
+            return list(session.scalars(stmt))
+    
+    @db_operation()
+    def update(self, record_id: str, data: Dict[str, Any], db: Optional[Session] = None) -> Optional[Any]:
         """Update a record"""
-        try:
-            with get_db_context() as db:
-                instance = db.query(self.model_class).filter(
-                    self.model_class.id == record_id
-                ).first()
-                if instance:
-                    for key, value in data.items():
-                        if hasattr(instance, key):
-                            setattr(instance, key, value)
-                    instance.updated_at = datetime.utcnow()
-                    db.commit()
-                    db.refresh(instance)
-                    return instance
-                return None
-        except Exception as e:
-            logger.error(f"Error updating {self.model_class.__name__}: {e}")
+        with session_scope(db) as session:
+            instance = session.get(self.model_class, record_id)
+            if instance:
+                for key, value in data.items():
+                    if hasattr(instance, key):
+                        setattr(instance, key, value)
+                instance.updated_at = datetime.utcnow()
+                # Every changed value is already known client-side, and
+                # expire_on_commit=False keeps it loaded; no refresh needed
+                session.flush()
+                return instance
             return None
     
-    def delete(self, record_id: str) -> bool:
+    @db_operation(default=False)
+    def delete(self, record_id: str, db: Optional[Session] = None) -> bool:
         """Delete a record"""
-        try:
-            with get_db_context() as db:
-                instance = db.query(self.model_class).filter(
-                    self.model_class.id == record_id
-                ).first()
-                if instance:
-                    db.delete(instance)
-                    db.commit()
-                    return True
-                return False
-        except Exception as e:
-            logger.error(f"Error deleting {self.model_class.__name__}: {e}")
+        with session_scope(db) as session:
+            instance = session.get(self.model_class, record_id)
+            if instance:
+                session.delete(instance)
+                session.flush()
+                return True
             return False
     
-    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+    @db_operation(default=0, retry_on=TRANSIENT_ERRORS)
+    def count(self, filters: Optional[Dict[str, Any]] = None, db: Optional[Session] = None) -> int:
         """Count records with optional filters"""
-        try:
-            with get_db_context() as db:
-                query = db.query(self.model_class)
-                if filters:
-                    for key, value in filters.items():
-                        if hasattr(self.model_class, key):
-                            query = query.filter(getattr(self.model_class, key) == value)
-                return query.count()
-        except Exception as e:
-            logger.error(f"Error counting {self.model_class.__name__}: {e}")
-            return 0
+        with session_scope(db) as session:
+            conditions = [
+                getattr(self.model_class, key) == value
+                for key, value in (filters or {}).items()
+                if hasattr(self.model_class, key)
+            ]
+            # Direct SELECT COUNT(*) ... WHERE rather than Query.count(),
+            # which wraps the query in a subquery
+            return session.scalar(
+                select(func.count()).select_from(self.model_class).where(*conditions)
+            ) or 0
+    
+    # Async variants for handlers on the event loop (DB_ASYNC_ENABLED); the
+    # blocking methods above stay the default while callers migrate
+    
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    async def aget_by_id(self, record_id: str) -> Optional[Any]:
+        """Get record by ID without blocking the event loop"""
+        async with get_async_db_context() as session:
+            return await session.get(self.model_class, record_id)
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    async def aget_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Any]:
+        """Get all records with optional pagination without blocking the event loop"""
+        async with get_async_db_context() as session:
+            stmt = select(self.model_class).offset(offset).limit(limit)
+            return list((await session.scalars(stmt)).all())
 
 
 class UserRepository(BaseRepository):
@@ -120,62 +464,122 @@ class UserRepository(BaseRepository):
     def __init__(self):
         super().__init__(User)
     
-    def get_by_email(self, email: str) -> Optional[User]:
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def get_by_email(self, email: str, db: Optional[Session] = None) -> Optional[User]:
         """Get user by email"""
-        try:
-            with get_db_context() as db:
-                return db.query(User).filter(User.email == email).first()
-        except Exception as e:
-            logger.error(f"Error getting user by email: {e}")
-            return None
+        with session_scope(db) as session:
+            return session.execute(_USER_BY_EMAIL, {'email': email}).scalars().first()
+    
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    async def aget_by_email(self, email: str) -> Optional[User]:
+        """Get user by email without blocking the event loop"""
+        async with get_async_db_context() as session:
+            return (await session.execute(_USER_BY_EMAIL, {'email': email})).scalars().first()
+    
+    @db_operation(default=False, retry_on=TRANSIENT_ERRORS)
+    def email_exists(self, email: str, db: Optional[Session] = None) -> bool:
+        """Check whether a user with this email exists, without loading the row"""
+        with session_scope(db) as session:
+            return bool(session.scalar(select(exists().where(User.email == email))))
+    
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def get_login_row(self, email: str, db: Optional[Session] = None) -> Optional[Any]:
+        """Get just the columns needed to authenticate a user (id, password_hash, is_active, last_login)"""
+        with session_scope(db) as session:
+            return session.execute(
+                select(User.id, User.password_hash, User.is_active, User.last_login).where(
+                    User.email == email
+                )
+            ).first()
     
-    def get_by_department(self, department: str) -> List[User]:
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def get_dashboard(self, user_id: str, entry_limit: int = 30, db: Optional[Session] = None) -> Optional[User]:
+        """Get a user with everything the dashboard shows, in a fixed number of queries
+        
+        Collections are loaded filtered: wellness_goals holds only active
+        goals, notifications only unread ones, risk_assessments only active
+        ones, and wellness_entries the latest entry_limit entries, newest
+        first. They are not the full relationships, so the returned user
+        is for reading only.
+        """
+        with session_scope(db) as session:
+            options = [
+                selectinload(User.wellness_goals.and_(WellnessGoal.status == 'active')),
+                selectinload(User.notifications.and_(Notification.is_read == False)),
+                selectinload(User.risk_assessments.and_(RiskAssessment.status == 'active')),
+                selectinload(User.interventions)
+            ]
+            if settings.DB_RAISE_ON_LAZY_LOAD:
+                options.append(raiseload("*"))
+            user = session.scalars(select(User).options(*options).where(User.id == user_id)).first()
+            if user is None:
+                return None
+            
+            # A per-parent LIMIT can't be expressed as an eager load; with a
+            # single parent it is one more query, attached without history
+            entries = session.scalars(
+                select(WellnessEntry).where(WellnessEntry.user_id == user_id).order_by(
+                    desc(WellnessEntry.created_at), desc(WellnessEntry.id)
+                ).limit(entry_limit)
+            ).all()
+            set_committed_value(user, 'wellness_entries', list(entries))
+            return user
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_by_department(self, department: str, load_related: Optional[List[str]] = None,
+                          db: Optional[Session] = None) -> List[User]:
         """Get users by department"""
-        try:
-            with get_db_context() as db:
-                return db.query(User).filter(
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(User).options(*_loader_options(self.model_class, load_related)).where(
                     User.department == department,
                     User.is_active == True
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting users by department: {e}")
-            return []
+                )
+            ))
     
-    def get_team_members(self, manager_id: str) -> List[User]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_team_members(self, manager_id: str, load_related: Optional[List[str]] = None,
+                         db: Optional[Session] = None) -> List[User]:
         """Get team members for a manager"""
-        try:
-            with get_db_context() as db:
-                return db.query(User).filter(
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(User).options(*_loader_options(self.model_class, load_related)).where(
                     User.manager_id == manager_id,
                     User.is_active == True
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting team members: {e}")
-            return []
+                )
+            ))
     
-    def get_active_users(self) -> List[User]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_active_users(self, load_related: Optional[List[str]] = None, db: Optional[Session] = None) -> List[User]:
         """Get all active users"""
-        try:
-            with get_db_context() as db:
-                return db.query(User).filter(User.is_active == True).all()
-        except Exception as e:
-            logger.error(f"Error getting active users: {e}")
-            return []
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(User).options(*_loader_options(self.model_class, load_related)).where(
+                    User.is_active == True
+                )
+            ))
+    
+    def iter_active_users(self, chunk_size: int = 500, db: Optional[Session] = None) -> Iterator[User]:
+        """Stream all active users in chunks"""
+        return self._iter(select(User).where(User.is_active == True), chunk_size, db)
     
-    def update_last_login(self, user_id: str) -> bool:
+    def iter_by_department(self, department: str, chunk_size: int = 500,
+                           db: Optional[Session] = None) -> Iterator[User]:
+        """Stream active users in a department in chunks"""
+        return self._iter(
+            select(User).where(User.department == department, User.is_active == True), chunk_size, db
+        )
+    
+    @db_operation(default=False)
+    def update_last_login(self, user_id: str, db: Optional[Session] = None) -> bool:
         """Update user's last login time"""
-        try:
-            with get_db_context() as db:
-                user = db.query(User).filter(User.id == user_id).first()
-                if user:
-                    user.last_login = datetime.utcnow()
-                    user.last_activity = datetime.utcnow()
-                    db.commit()
-                    return True
-                return False
-        except Exception as e:
-            logger.error(f"Error updating last login: {e}")
-            return False
+        with session_scope(db) as session:
+            now = datetime.utcnow()
+            result = session.execute(
+                update(User).where(User.id == user_id).values(last_login=now, last_activity=now),
+                execution_options={'synchronize_session': False}
+            )
+            return result.rowcount > 0
 
 
 class WellnessEntryRepository(BaseRepository):
@@ -184,78 +588,132 @@ class WellnessEntryRepository(BaseRepository):
     def __init__(self):
         super().__init__(WellnessEntry)
     
-    def get_user_entries(self, user_id: str, limit: Optional[int] = None) -> List[WellnessEntry]:
-        """Get wellness entries for a user"""
-        try:
-            with get_db_context() as db:
-                query = db.query(WellnessEntry).filter(
-                    WellnessEntry.user_id == user_id
-                ).order_by(desc(WellnessEntry.created_at))
-                if limit:
-                    query = query.limit(limit)
-                return query.all()
-        except Exception as e:
-            logger.error(f"Error getting user wellness entries: {e}")
-            return []
+    def _after_insert(self, session: Session, rows: List[Dict[str, Any]]):
+        """Keep users' last_wellness_* columns current"""
+        refresh_user_wellness_snapshot(session.connection(), {row['user_id'] for row in rows})
+    
+    def _after_update(self, session: Session, rows: List[Dict[str, Any]]):
+        """Keep users' last_wellness_* columns current"""
+        refresh_user_wellness_snapshot(session.connection(), self._user_ids_for(session, rows))
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_user_entries(self, user_id: str, limit: Optional[int] = None, before: Optional[datetime] = None,
+                         before_id: Optional[str] = None, db: Optional[Session] = None) -> List[WellnessEntry]:
+        """Get wellness entries for a user, newest first
+        
+        Pages with a keyset rather than OFFSET: pass the created_at (and id)
+        of the last entry already seen as before/before_id to get the next
+        page, so deep pages cost the same as the first.
+        """
+        with session_scope(db) as session:
+            stmt = select(WellnessEntry).where(WellnessEntry.user_id == user_id)
+            if before is not None:
+                if before_id is not None:
+                    stmt = stmt.where(or_(
+                        WellnessEntry.created_at < before,
+                        and_(WellnessEntry.created_at == before, WellnessEntry.id < before_id)
+                    ))
+                else:
+                    stmt = stmt.where(WellnessEntry.created_at < before)
+            stmt = stmt.order_by(desc(WellnessEntry.created_at), desc(WellnessEntry.id))
+            if limit:
+                stmt = stmt.limit(limit)
+            return list(session.scalars(stmt))
+    
+    def iter_user_entries(self, user_id: str, chunk_size: int = 500,
+                          db: Optional[Session] = None) -> Iterator[WellnessEntry]:
+        """Stream a user's wellness entries, newest first, in chunks"""
+        return self._iter(
+            select(WellnessEntry).where(WellnessEntry.user_id == user_id).order_by(
+                desc(WellnessEntry.created_at), desc(WellnessEntry.id)
+            ),
+            chunk_size,
+            db
+        )
     
-    def get_entries_by_type(self, user_id: str, entry_type: str, days: int = 30) -> List[WellnessEntry]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_entries_by_type(self, user_id: str, entry_type: str, days: int = 30, db: Optional[Session] = None) -> List[WellnessEntry]:
         """Get wellness entries by type within a time period"""
-        try:
-            with get_db_context() as db:
-                start_date = datetime.utcnow() - timedelta(days=days)
-                return db.query(WellnessEntry).filter(
+        with session_scope(db) as session:
+            start_date = datetime.utcnow() - timedelta(days=days)
+            return list(session.scalars(
+                select(WellnessEntry).where(
                     WellnessEntry.user_id == user_id,
                     WellnessEntry.entry_type == entry_type,
                     WellnessEntry.created_at >= start_date
-                ).order_by(desc(WellnessEntry.created_at)).all()
-        except Exception as e:
-            logger.error(f"Error getting entries by type: {e}")
-            return []
+                ).order_by(desc(WellnessEntry.created_at))
+            ))
     
-    def get_department_averages(self, department: str, days: int = 30) -> Dict[str, float]:
+    @db_operation(default={}, retry_on=TRANSIENT_ERRORS)
+    def get_department_averages(self, department: str, days: int = 30, db: Optional[Session] = None) -> Dict[str, float]:
         """Get average wellness scores for a department"""
-        try:
-            with get_db_context() as db:
-                start_date = datetime.utcnow() - timedelta(days=days)
-                
-                # Get users in department
-                user_ids = [user.id for user in db.query(User).filter(
-                    User.department == department,
-                    User.is_active == True
-                ).all()]
-                
-                if not user_ids:
-                    return {}
-                
-                # Calculate averages
-                result = db.query(
+        with session_scope(db) as session:
+            start_date = datetime.utcnow() - timedelta(days=days)
+            
+            # Calculate averages, filtering on department in the join
+            result = session.execute(
+                select(
                     WellnessEntry.entry_type,
                     func.avg(WellnessEntry.value).label('average_value')
-                ).filter(
-                    WellnessEntry.user_id.in_(user_ids),
+                ).join(User, User.id == WellnessEntry.user_id).where(
+                    User.department == department,
+                    User.is_active == True,
                     WellnessEntry.created_at >= start_date
-                ).group_by(WellnessEntry.entry_type).all()
-                
-                return {row.entry_type: float(row.average_value) for row in result}
-        except Exception as e:
-            logger.error(f"Error getting department averages: {e}")
-            return {}
+                ).group_by(WellnessEntry.entry_type)
+            ).all()
+            
+            return {row.entry_type: float(row.average_value) for row in result}
     
-    def get_trend_data(self, user_id: str, entry_type: str, days: int = 30) -> List[Dict[str, Any]]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_trend_data(self, user_id: str, entry_type: str, days: int = 30, db: Optional[Session] = None) -> List[Dict[str, Any]]:
         """Get trend data for wellness entries"""
-        try:
-            with get_db_context() as db:
-                start_date = datetime.utcnow() - timedelta(days=days)
-                entries = db.query(WellnessEntry).filter(
+        with session_scope(db) as session:
+            start_date = datetime.utcnow() - timedelta(days=days)
+            # Only the plotted columns, as plain rows; no ORM objects are
+            # built just to be serialized
+            rows = session.execute(
+                select(
+                    WellnessEntry.id,
+                    WellnessEntry.entry_type,
+                    WellnessEntry.value,
+                    WellnessEntry.created_at
+                ).where(
                     WellnessEntry.user_id == user_id,
                     WellnessEntry.entry_type == entry_type,
                     WellnessEntry.created_at >= start_date
-                ).order_by(asc(WellnessEntry.created_at)).all()
-                
-                return [entry.to_dict() for entry in entries]
-        except Exception as e:
-            logger.error(f"Error getting trend data: {e}")
-            return []
+                ).order_by(asc(WellnessEntry.created_at))
+            ).all()
+            
+            # Enum values and ISO timestamps are rendered by pydantic-core
+            # for the whole list, not formatted per row in Python
+            return serialize_rows(WellnessTrendPointOut, rows)
+
+
+class ConversationRepository(BaseRepository):
+    """Chat history operations"""
+    
+    def __init__(self):
+        super().__init__(Conversation)
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_user_history(self, user_id: str, session_id: Optional[str] = None, limit: int = 50,
+                         db: Optional[Session] = None) -> List[Conversation]:
+        """Get a user's messages, newest first, optionally within one session"""
+        params = {'user_id': user_id, 'limit': limit}
+        stmt = _CONVERSATIONS_BY_USER
+        if session_id:
+            params['session_id'] = session_id
+            stmt = _CONVERSATIONS_BY_USER_SESSION
+        with session_scope(db) as session:
+            return list(session.execute(stmt, params).scalars())
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_session_history(self, session_id: str, limit: int = 10, db: Optional[Session] = None) -> List[Conversation]:
+        """Get the latest messages of a chat session, newest first"""
+        with session_scope(db) as session:
+            return list(session.execute(
+                _CONVERSATIONS_BY_SESSION, {'session_id': session_id, 'limit': limit}
+            ).scalars())
 
 
 class ResourceRepository(BaseRepository):
@@ -264,57 +722,150 @@ class ResourceRepository(BaseRepository):
     def __init__(self):
         super().__init__(Resource)
     
-    def get_by_category(self, category: str) -> List[Resource]:
-        """Get resources by category"""
+    # Catalog reads are shared by every user and change rarely, so the
+    # *_catalog methods read through Redis. They cache serialized dicts,
+    # never ORM objects, and every resource write drops the cached entries
+    # once it is committed.
+    
+    def _read_through(self, key: str, loader) -> List[Dict[str, Any]]:
+        """Serve key from Redis, or load it, store it for RESOURCE_CACHE_TTL seconds and return it"""
+        client = _get_redis()
+        if client is not None:
+            try:
+                cached = client.get(key)
+                if cached is not None:
+                    return json.loads(cached)
+            except Exception as e:
+                logger.warning(f"Resource cache read failed for {key}: {e}")
+        
+        rows = loader()
+        if client is not None and rows:
+            try:
+                client.setex(key, RESOURCE_CACHE_TTL, json.dumps(rows, default=str))
+            except Exception as e:
+                logger.warning(f"Resource cache write failed for {key}: {e}")
+        return rows
+    
+    def invalidate_catalog_cache(self):
+        """Drop every cached catalog entry"""
+        client = _get_redis()
+        if client is None:
+            return
         try:
-            with get_db_context() as db:
-                return db.query(Resource).filter(
+            keys = list(client.scan_iter(match=f"{RESOURCE_CACHE_PREFIX}*", count=500))
+            if keys:
+                client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Resource cache invalidation failed: {e}")
+    
+    def _invalidate_on_commit(self, db: Optional[Session]):
+        """Drop cached catalogs once a write is committed
+        
+        A short-lived session has already committed when the write returns.
+        In a caller's session the entries are dropped from its after_commit
+        event, so readers can't re-cache rows that aren't committed yet and
+        a rollback leaves the cache alone.
+        """
+        if db is None:
+            self.invalidate_catalog_cache()
+        elif not db.info.get('resource_catalog_dirty'):
+            db.info['resource_catalog_dirty'] = True
+            event.listen(db, 'after_commit', self._invalidate_after_commit, once=True)
+    
+    def _invalidate_after_commit(self, session: Session):
+        session.info.pop('resource_catalog_dirty', None)
+        self.invalidate_catalog_cache()
+    
+    def get_category_catalog(self, category: str) -> List[Dict[str, Any]]:
+        """Active resources in a category, as dicts, cached"""
+        return self._read_through(
+            f"{RESOURCE_CACHE_PREFIX}cat:{category}",
+            lambda: serialize_many(self.get_by_category(category))
+        )
+    
+    def get_difficulty_catalog(self, difficulty: str) -> List[Dict[str, Any]]:
+        """Active resources at a difficulty level, as dicts, cached"""
+        return self._read_through(
+            f"{RESOURCE_CACHE_PREFIX}diff:{difficulty}",
+            lambda: serialize_many(self.get_by_difficulty(difficulty))
+        )
+    
+    def get_popular_catalog(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most popular active resources, as dicts, cached"""
+        return self._read_through(
+            f"{RESOURCE_CACHE_PREFIX}popular:{limit}",
+            lambda: serialize_many(self.get_popular_resources(limit))
+        )
+    
+    def create(self, data: Dict[str, Any], db: Optional[Session] = None) -> Any:
+        """Create a resource and drop cached catalogs"""
+        instance = super().create(data, db)
+        self._invalidate_on_commit(db)
+        return instance
+    
+    def bulk_create(self, rows: List[Dict[str, Any]], ignore_conflicts_on: Optional[List[str]] = None,
+                    db: Optional[Session] = None) -> List[str]:
+        """Create resources in bulk and drop cached catalogs"""
+        ids = super().bulk_create(rows, ignore_conflicts_on, db)
+        self._invalidate_on_commit(db)
+        return ids
+    
+    def update(self, record_id: str, data: Dict[str, Any], db: Optional[Session] = None) -> Optional[Any]:
+        """Update a resource and drop cached catalogs"""
+        instance = super().update(record_id, data, db)
+        self._invalidate_on_commit(db)
+        return instance
+    
+    def bulk_update(self, rows: List[Dict[str, Any]], db: Optional[Session] = None) -> bool:
+        """Update resources in bulk and drop cached catalogs"""
+        updated = super().bulk_update(rows, db)
+        self._invalidate_on_commit(db)
+        return updated
+    
+    def delete(self, record_id: str, db: Optional[Session] = None) -> bool:
+        """Delete a resource and drop cached catalogs"""
+        deleted = super().delete(record_id, db)
+        self._invalidate_on_commit(db)
+        return deleted
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_by_category(self, category: str, db: Optional[Session] = None) -> List[Resource]:
+        """Get resources by category"""
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(Resource).where(
                     Resource.category == category,
                     Resource.is_active == True
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting resources by category: {e}")
-            return []
+                )
+            ))
     
-    def get_by_difficulty(self, difficulty: str) -> List[Resource]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_by_difficulty(self, difficulty: str, db: Optional[Session] = None) -> List[Resource]:
         """Get resources by difficulty level"""
-        try:
-            with get_db_context() as db:
-                return db.query(Resource).filter(
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(Resource).where(
                     Resource.difficulty_level == difficulty,
                     Resource.is_active == True
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting resources by difficulty: {e}")
-            return []
+                )
+            ))
     
-    def search_resources(self, query: str) -> List[Resource]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def search_resources(self, query: str, db: Optional[Session] = None) -> List[Resource]:
         """Search resources by title or description"""
-        try:
-            with get_db_context() as db:
-                return db.query(Resource).filter(
-                    and_(
-                        Resource.is_active == True,
-                        or_(
-                            Resource.title.ilike(f"%{query}%"),
-                            Resource.description.ilike(f"%{query}%")
-                        )
-                    )
-                ).all()
-        except Exception as e:
-            logger.error(f"Error searching resources: {e}")
-            return []
+        with session_scope(db) as session:
+            return session.execute(
+                _SEARCH_RESOURCES, {'pattern': f"%{query}%"}
+            ).scalars().all()
     
-    def get_popular_resources(self, limit: int = 10) -> List[Resource]:
-        """Get most popular resources by rating"""
-        try:
-            with get_db_context() as db:
-                return db.query(Resource).filter(
-                    Resource.is_active == True
-                ).order_by(desc(Resource.rating)).limit(limit).all()
-        except Exception as e:
-            logger.error(f"Error getting popular resources: {e}")
-            return []
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_popular_resources(self, limit: int = 10, columns: Optional[Tuple[str, ...]] = None,
+                              db: Optional[Session] = None) -> List[Any]:
+        """Get most popular resources by rating; with columns, plain dicts of just those fields"""
+        with session_scope(db) as session:
+            return self._fetch(session, columns, lambda stmt: stmt.where(
+                Resource.is_active == True
+            ).order_by(desc(Resource.rating)).limit(limit))
 
 
 class RiskAssessmentRepository(BaseRepository):
@@ -323,65 +874,81 @@ class RiskAssessmentRepository(BaseRepository):
     def __init__(self):
         super().__init__(RiskAssessment)
     
-    def get_user_assessments(self, user_id: str) -> List[RiskAssessment]:
+    def _after_insert(self, session: Session, rows: List[Dict[str, Any]]):
+        """Keep users' risk_level_cached column current"""
+        refresh_user_risk_level(session.connection(), {row['user_id'] for row in rows})
+    
+    def _after_update(self, session: Session, rows: List[Dict[str, Any]]):
+        """Keep users' risk_level_cached column current"""
+        refresh_user_risk_level(session.connection(), self._user_ids_for(session, rows))
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_user_assessments(self, user_id: str, db: Optional[Session] = None) -> List[RiskAssessment]:
         """Get risk assessments for a user"""
-        try:
-            with get_db_context() as db:
-                return db.query(RiskAssessment).filter(
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(RiskAssessment).where(
                     RiskAssessment.user_id == user_id
-                ).order_by(desc(RiskAssessment.created_at)).all()
-        except Exception as e:
-            logger.error(f"Error getting user risk assessments: {e}")
-            return []
+                ).order_by(desc(RiskAssessment.created_at))
+            ))
     
-    def get_high_risk_users(self) -> List[RiskAssessment]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_high_risk_users(self, db: Optional[Session] = None) -> List[RiskAssessment]:
         """Get all high-risk assessments"""
-        try:
-            with get_db_context() as db:
-                return db.query(RiskAssessment).filter(
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(RiskAssessment).where(
                     RiskAssessment.risk_level.in_(['high', 'critical']),
                     RiskAssessment.status == 'active'
-                ).order_by(desc(RiskAssessment.risk_score)).all()
-        except Exception as e:
-            logger.error(f"Error getting high risk users: {e}")
-            return []
+                ).order_by(desc(RiskAssessment.risk_score))
+            ))
+    
+    def iter_high_risk_assessments(self, chunk_size: int = 500,
+                                   db: Optional[Session] = None) -> Iterator[RiskAssessment]:
+        """Stream active high-risk assessments, highest score first, in chunks"""
+        return self._iter(
+            select(RiskAssessment).where(
+                RiskAssessment.risk_level.in_(['high', 'critical']),
+                RiskAssessment.status == 'active'
+            ).order_by(desc(RiskAssessment.risk_score)),
+            chunk_size,
+            db
+        )
     
-    def get_department_risk_summary(self, department: str) -> Dict[str, Any]:
+    @db_operation(default={}, retry_on=TRANSIENT_ERRORS)
+    def get_department_risk_summary(self, department: str, db: Optional[Session] = None) -> Dict[str, Any]:
         """Get risk summary for a department"""
-        try:
-            with get_db_context() as db:
-                # Get users in department
-                user_ids = [user.id for user in db.query(User).filter(
+        with session_scope(db) as session:
+            # Summarize active assessments for active users in the
+            # department in one aggregate row
+            summary = session.execute(
+                select(
+                    func.count(RiskAssessment.id).label('total'),
+                    func.sum(
+                        case((RiskAssessment.risk_level.in_(['high', 'critical']), 1), else_=0)
+                    ).label('high'),
+                    func.avg(RiskAssessment.risk_score).label('average')
+                ).join(
+                    User, User.id == RiskAssessment.user_id
+                ).where(
                     User.department == department,
-                    User.is_active == True
-                ).all()]
-                
-                if not user_ids:
-                    return {}
-                
-                # Get risk assessments
-                assessments = db.query(RiskAssessment).filter(
-                    RiskAssessment.user_id.in_(user_ids),
+                    User.is_active == True,
                     RiskAssessment.status == 'active'
-                ).all()
-                
-                if not assessments:
-                    return {}
-                
-                # Calculate summary
-                total_assessments = len(assessments)
-                high_risk_count = len([a for a in assessments if a.risk_level in ['high', 'critical']])
-                avg_risk_score = sum(a.risk_score for a in assessments) / total_assessments
-                
-                return {
-                    'total_assessments': total_assessments,
-                    'high_risk_count': high_risk_count,
-                    'high_risk_percentage': (high_risk_count / total_assessments) * 100,
-                    'average_risk_score': avg_risk_score
-                }
-        except Exception as e:
-            logger.error(f"Error getting department risk summary: {e}")
-            return {}
+                )
+            ).one()
+            
+            if not summary.total:
+                return {}
+            
+            total_assessments = summary.total
+            high_risk_count = int(summary.high)
+            
+            return {
+                'total_assessments': total_assessments,
+                'high_risk_count': high_risk_count,
+                'high_risk_percentage': (high_risk_count / total_assessments) * 100,
+                'average_risk_score': float(summary.average)
+            }
 
 
 class NotificationRepository(BaseRepository):
@@ -390,47 +957,41 @@ class NotificationRepository(BaseRepository):
     def __init__(self):
         super().__init__(Notification)
     
-    def get_user_notifications(self, user_id: str, unread_only: bool = False) -> List[Notification]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_user_notifications(self, user_id: str, unread_only: bool = False, db: Optional[Session] = None) -> List[Notification]:
         """Get notifications for a user"""
-        try:
-            with get_db_context() as db:
-                query = db.query(Notification).filter(Notification.user_id == user_id)
-                if unread_only:
-                    query = query.filter(Notification.is_read == False)
-                return query.order_by(desc(Notification.created_at)).all()
-        except Exception as e:
-            logger.error(f"Error getting user notifications: {e}")
-            return []
+        with session_scope(db) as session:
+            stmt = select(Notification).where(Notification.user_id == user_id)
+            if unread_only:
+                stmt = stmt.where(Notification.is_read == False)
+            return list(session.scalars(stmt.order_by(desc(Notification.created_at))))
     
-    def mark_as_read(self, notification_id: str) -> bool:
-        """Mark notification as read"""
-        try:
-            with get_db_context() as db:
-                notification = db.query(Notification).filter(
-                    Notification.id == notification_id
-                ).first()
-                if notification:
-                    notification.is_read = True
-                    db.commit()
-                    return True
-                return False
-        except Exception as e:
-            logger.error(f"Error marking notification as read: {e}")
-            return False
+    @db_operation(default=False)
+    def mark_as_read(self, notification_id: str, db: Optional[Session] = None) -> bool:
+        """Mark notification as read; False when it doesn't exist or was already read"""
+        with session_scope(db) as session:
+            # Already-read rows are left untouched rather than rewritten
+            result = session.execute(
+                update(Notification).where(
+                    Notification.id == notification_id,
+                    Notification.is_read.is_(False)
+                ).values(is_read=True),
+                execution_options={'synchronize_session': False}
+            )
+            return result.rowcount > 0
     
-    def mark_all_as_read(self, user_id: str) -> bool:
+    @db_operation(default=False)
+    def mark_all_as_read(self, user_id: str, db: Optional[Session] = None) -> bool:
         """Mark all notifications as read for a user"""
-        try:
-            with get_db_context() as db:
-                db.query(Notification).filter(
+        with session_scope(db) as session:
+            session.execute(
+                update(Notification).where(
                     Notification.user_id == user_id,
                     Notification.is_read == False
-                ).update({'is_read': True})
-                db.commit()
-                return True
-        except Exception as e:
-            logger.error(f"Error marking all notifications as read: {e}")
-            return False
+                ).values(is_read=True)
+            )
+            session.flush()
+            return True
 
 
 class TeamRepository(BaseRepository):
@@ -439,63 +1000,115 @@ class TeamRepository(BaseRepository):
     def __init__(self):
         super().__init__(Team)
     
-    def get_teams_by_manager(self, manager_id: str) -> List[Team]:
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def add_member(self, team_id: str, user_id: str, role: str = "member",
+                   db: Optional[Session] = None) -> Optional[str]:
+        """Add a user to a team, reactivating a previous membership; returns the membership id
+        
+        One upsert on uq_team_members_team_user instead of a SELECT before
+        the INSERT.
+        """
+        with session_scope(db) as session:
+            stmt = _insert_for(session, TeamMember).values(
+                team_id=team_id, user_id=user_id, role=role, is_active=True
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['team_id', 'user_id'],
+                set_={'is_active': True, 'role': stmt.excluded.role}
+            )
+            return session.scalar(stmt.returning(TeamMember.id))
+    
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_teams_by_manager(self, manager_id: str, db: Optional[Session] = None) -> List[Team]:
         """Get teams managed by a user"""
-        try:
-            with get_db_context() as db:
-                return db.query(Team).filter(
-                    Team.manager_id == manager_id,
-                    Team.is_active == True
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting teams by manager: {e}")
-            return []
+        with session_scope(db) as session:
+            return session.execute(_TEAMS_BY_MANAGER, {'manager_id': manager_id}).scalars().all()
     
-    def get_team_members(self, team_id: str) -> List[User]:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_team_members(self, team_id: str, load_related: Optional[List[str]] = None,
+                         db: Optional[Session] = None) -> List[User]:
         """Get all members of a team"""
-        try:
-            with get_db_context() as db:
-                return db.query(User).join(TeamMember).filter(
+        with session_scope(db) as session:
+            return list(session.scalars(
+                select(User).options(*_loader_options(User, load_related)).join(
+                    TeamMember, TeamMember.user_id == User.id
+                ).where(
                     TeamMember.team_id == team_id,
                     TeamMember.is_active == True,
                     User.is_active == True
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting team members: {e}")
-            return []
+                )
+            ))
+    
+    @db_operation(default=0)
+    def refresh_team_wellness_scores(self, days: int = 30, db: Optional[Session] = None) -> int:
+        """Recompute the stored wellness_score of every active team in one UPDATE
+        
+        Meant to run on a schedule so request handlers can read
+        Team.wellness_score directly instead of aggregating member entries
+        per call. Teams without recent entries keep their previous score.
+        Returns the number of teams updated.
+        """
+        with session_scope(db) as session:
+            start_date = datetime.utcnow() - timedelta(days=days)
+            team_average = _team_wellness_average(Team.id, start_date)
+            
+            result = session.execute(
+                update(Team).where(
+                    Team.is_active == True,
+                    team_average.isnot(None)
+                ).values(
+                    wellness_score=team_average,
+                    last_assessment=datetime.utcnow()
+                ).execution_options(synchronize_session=False)
+            )
+            return result.rowcount
     
-    def update_team_wellness_score(self, team_id: str) -> bool:
+    @db_operation(default=False)
+    def update_team_wellness_score(self, team_id: str, db: Optional[Session] = None) -> bool:
         """Update team wellness score based on member data"""
-        try:
-            with get_db_context() as db:
-                # Get team members
-                member_ids = [tm.user_id for tm in db.query(TeamMember).filter(
-                    TeamMember.team_id == team_id,
-                    TeamMember.is_active == True
-                ).all()]
-                
-                if not member_ids:
-                    return False
-                
-                # Calculate average wellness score from recent entries
-                start_date = datetime.utcnow() - timedelta(days=30)
-                avg_score = db.query(func.avg(WellnessEntry.value)).filter(
-                    WellnessEntry.user_id.in_(member_ids),
-                    WellnessEntry.created_at >= start_date
-                ).scalar()
-                
-                if avg_score:
-                    team = db.query(Team).filter(Team.id == team_id).first()
-                    if team:
-                        team.wellness_score = float(avg_score)
-                        team.last_assessment = datetime.utcnow()
-                        db.commit()
-                        return True
-                
-                return False
-        except Exception as e:
-            logger.error(f"Error updating team wellness score: {e}")
-            return False
+        with session_scope(db) as session:
+            # Average recent member entries and write the team row in a
+            # single statement; teams without recent entries are left as is
+            start_date = datetime.utcnow() - timedelta(days=30)
+            team_average = _team_wellness_average(team_id, start_date)
+            result = session.execute(
+                update(Team).where(
+                    Team.id == team_id,
+                    team_average.isnot(None)
+                ).values(
+                    wellness_score=team_average,
+                    last_assessment=datetime.utcnow()
+                ).execution_options(synchronize_session=False)
+            )
+            return result.rowcount > 0
+
+
+class WellnessProgramRepository(BaseRepository):
+    """Wellness program and enrollment operations"""
+    
+    def __init__(self):
+        super().__init__(WellnessProgram)
+    
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def enroll(self, program_id: str, user_id: str, db: Optional[Session] = None) -> Optional[str]:
+        """Enroll a user in a program and return the enrollment id
+        
+        Idempotent: an existing live (not dropped) enrollment is returned
+        as is. One upsert against uq_program_participants_active replaces
+        a SELECT-then-INSERT; DO UPDATE rather than DO NOTHING so RETURNING
+        also yields the existing row.
+        """
+        with session_scope(db) as session:
+            stmt = _insert_for(session, ProgramParticipant).values(
+                program_id=program_id, user_id=user_id, status='enrolled'
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['program_id', 'user_id'],
+                # Literal predicate, so PostgreSQL can match it to the partial index
+                index_where=text("status <> 'dropped'"),
+                set_={'updated_at': func.now()}
+            )
+            return session.scalar(stmt.returning(ProgramParticipant.id))
 
 
 class AnalyticsRepository(BaseRepository):
@@ -504,55 +1117,93 @@ class AnalyticsRepository(BaseRepository):
     def __init__(self):
         super().__init__(AnalyticsReport)
     
-    def get_reports_by_type(self, report_type: str, limit: int = 10) -> List[AnalyticsReport]:
-        """Get analytics reports by type"""
-        try:
-            with get_db_context() as db:
-                return db.query(AnalyticsReport).filter(
-                    AnalyticsReport.report_type == report_type
-                ).order_by(desc(AnalyticsReport.created_at)).limit(limit).all()
-        except Exception as e:
-            logger.error(f"Error getting reports by type: {e}")
-            return []
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_reports_by_type(self, report_type: str, limit: int = 10, columns: Optional[Tuple[str, ...]] = None,
+                            db: Optional[Session] = None) -> List[Any]:
+        """Get analytics reports by type; with columns, plain dicts of just those fields"""
+        with session_scope(db) as session:
+            return self._fetch(session, columns, lambda stmt: stmt.where(
+                AnalyticsReport.report_type == report_type
+            ).order_by(desc(AnalyticsReport.created_at)).limit(limit))
     
-    def create_wellness_trend_report(self, start_date: datetime, end_date: datetime) -> Optional[AnalyticsReport]:
+    @db_operation()
+    def create_wellness_trend_report(self, start_date: datetime, end_date: datetime, db: Optional[Session] = None) -> Optional[AnalyticsReport]:
         """Create a wellness trend report"""
-        try:
-            with get_db_context() as db:
-                # Calculate metrics
-                total_entries = db.query(WellnessEntry).filter(
-                    WellnessEntry.created_at.between(start_date, end_date)
-                ).count()
-                
-                avg_wellness_score = db.query(func.avg(WellnessEntry.value)).filter(
+        with session_scope(db) as session:
+            # Calculate metrics in one aggregate query
+            total_entries, avg_wellness_score = session.execute(
+                select(func.count(WellnessEntry.id), func.avg(WellnessEntry.value)).where(
                     WellnessEntry.created_at.between(start_date, end_date)
-                ).scalar()
-                
-                # Create report
-                report_data = {
-                    "report_type": "wellness_trends",
-                    "title": f"Wellness Trends Report ({start_date.date()} - {end_date.date()})",
-                    "description": "Automated wellness trends analysis",
-                    "data_period": "daily",
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "metrics": {
-                        "total_entries": total_entries,
-                        "average_wellness_score": float(avg_wellness_score) if avg_wellness_score else 0.0,
-                        "period_days": (end_date - start_date).days
-                    },
-                    "insights": [],
-                    "recommendations": []
-                }
-                
-                report = AnalyticsReport(**report_data)
-                db.add(report)
-                db.commit()
-                db.refresh(report)
-                return report
-        except Exception as e:
-            logger.error(f"Error creating wellness trend report: {e}")
-            return None
+                )
+            ).one()
+            
+            # Create report
+            report_data = {
+                "report_type": "wellness_trends",
+                "title": f"Wellness Trends Report ({start_date.date()} - {end_date.date()})",
+                "description": "Automated wellness trends analysis",
+                "data_period": "daily",
+                "start_date": start_date,
+                "end_date": end_date,
+                "metrics": {
+                    "total_entries": total_entries,
+                    "average_wellness_score": float(avg_wellness_score) if avg_wellness_score else 0.0,
+                    "period_days": (end_date - start_date).days
+                },
+                "insights": [],
+                "recommendations": []
+            }
+            
+            # INSERT ... RETURNING populates the report (including server
+            # generated values) without a follow-up SELECT
+            return session.scalars(
+                insert(AnalyticsReport).returning(AnalyticsReport), [report_data]
+            ).one()
+
+
+class AnalyticsEventRepository(BaseRepository):
+    """Analytics event ingestion"""
+    
+    def __init__(self):
+        super().__init__(AnalyticsEvent)
+    
+    @db_operation(reraise=True)
+    def record_events(self, events: List[Dict[str, Any]], db: Optional[Session] = None) -> int:
+        """Insert a batch of events in one executemany and return how many were sent
+        
+        Events may carry the raw user_agent string; it is resolved to
+        user_agent_id once per distinct string in the batch. Each event needs
+        a client-generated id and its created_at, the table's primary key:
+        events already stored under that key are skipped, so a resent batch
+        is not recorded twice. Raises ValueError for events without them.
+        """
+        if not events:
+            return 0
+        if not all(event.get('id') and event.get('created_at') for event in events):
+            raise ValueError("record_events needs an id and created_at on every event")
+        with session_scope(db) as session:
+            agent_ids = {}
+            rows = []
+            for event in events:
+                row = dict(event)
+                user_agent = row.pop('user_agent', None)
+                if user_agent and 'user_agent_id' not in row:
+                    if user_agent not in agent_ids:
+                        agent_ids[user_agent] = get_user_agent_id(session, user_agent)
+                    row['user_agent_id'] = agent_ids[user_agent]
+                rows.append(row)
+            stmt = _insert_for(session, AnalyticsEvent)
+            if hasattr(stmt, 'on_conflict_do_nothing'):
+                stmt = stmt.on_conflict_do_nothing(index_elements=['id', 'created_at'])
+            session.execute(stmt, rows)
+            return len(rows)
+
+
+class ComplianceRecordRepository(BaseRepository):
+    """Compliance record operations"""
+    
+    def __init__(self):
+        super().__init__(ComplianceRecord)
 
 
 class SystemSettingsRepository(BaseRepository):
@@ -560,54 +1211,104 @@ class SystemSettingsRepository(BaseRepository):
     
     def __init__(self):
         super().__init__(SystemSettings)
+        # Settings are read on almost every request and rarely change, so
+        # reads outside a caller's transaction are cached briefly
+        self._setting_cache = TTLCache(maxsize=512, ttl=60)
+        self._category_cache = TTLCache(maxsize=64, ttl=60)
+        self._cache_lock = threading.Lock()
     
-    def get_setting(self, key: str) -> Optional[SystemSettings]:
-        """Get a system setting by key"""
-        try:
-            with get_db_context() as db:
-                return db.query(SystemSettings).filter(
-                    SystemSettings.setting_key == key
-                ).first()
-        except Exception as e:
-            logger.error(f"Error getting system setting: {e}")
-            return None
+    def invalidate_cache(self, key: Optional[str] = None):
+        """Drop cached settings (one key, or everything) after a write"""
+        with self._cache_lock:
+            if key is None:
+                self._setting_cache.clear()
+            else:
+                self._setting_cache.pop(key, None)
+            self._category_cache.clear()
     
-    def get_settings_by_category(self, category: str) -> List[SystemSettings]:
-        """Get system settings by category"""
-        try:
-            with get_db_context() as db:
-                return db.query(SystemSettings).filter(
-                    SystemSettings.category == category
-                ).all()
-        except Exception as e:
-            logger.error(f"Error getting settings by category: {e}")
-            return []
+    @db_operation(retry_on=TRANSIENT_ERRORS)
+    def get_setting(self, key: str, db: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+        """Get a system setting by key, as a dict
+        
+        The cache holds plain dicts and every call gets its own copy, so a
+        caller changing the result can't change what other callers read.
+        """
+        if db is None:
+            with self._cache_lock:
+                cached = self._setting_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+        with session_scope(db) as session:
+            setting = session.scalars(
+                select(SystemSettings).where(SystemSettings.setting_key == key)
+            ).first()
+            setting = serialize(setting) if setting is not None else None
+        if db is None and setting is not None:
+            with self._cache_lock:
+                self._setting_cache[key] = setting
+            return dict(setting)
+        return setting
     
-    def update_setting(self, key: str, value: str, updated_by: str = None) -> bool:
+    @db_operation(default=[], retry_on=TRANSIENT_ERRORS)
+    def get_settings_by_category(self, category: str, db: Optional[Session] = None) -> List[Dict[str, Any]]:
+        """Get system settings by category, as dicts (copies, see get_setting)"""
+        if db is None:
+            with self._cache_lock:
+                cached = self._category_cache.get(category)
+            if cached is not None:
+                return [dict(setting) for setting in cached]
+        with session_scope(db) as session:
+            category_settings = serialize_many(session.scalars(
+                select(SystemSettings).where(SystemSettings.category == category)
+            ))
+        if db is None:
+            with self._cache_lock:
+                self._category_cache[category] = tuple(category_settings)
+            return [dict(setting) for setting in category_settings]
+        return category_settings
+    
+    @db_operation(default=False)
+    def update_setting(self, key: str, value: str, updated_by: str = None, db: Optional[Session] = None) -> bool:
         """Update a system setting"""
-        try:
-            with get_db_context() as db:
-                setting = db.query(SystemSettings).filter(
+        with session_scope(db) as session:
+            updated = session.execute(
+                update(SystemSettings).where(
                     SystemSettings.setting_key == key
-                ).first()
-                if setting:
-                    setting.setting_value = value
-                    setting.updated_by = updated_by
-                    setting.updated_at = datetime.utcnow()
-                    db.commit()
-                    return True
-                return False
-        except Exception as e:
-            logger.error(f"Error updating system setting: {e}")
-            return False
+                ).values(
+                    setting_value=value,
+                    updated_by=updated_by,
+                    updated_at=datetime.utcnow()
+                ),
+                execution_options={'synchronize_session': False}
+            ).rowcount
+        self._invalidate_on_commit(db, key)
+        return updated > 0
+    
+    def _invalidate_on_commit(self, db: Optional[Session], key: str):
+        """Drop a cached setting once its write is committed (see ResourceRepository)"""
+        if db is None:
+            self.invalidate_cache(key)
+            return
+        keys = db.info.setdefault('system_settings_dirty', set())
+        if not keys:
+            event.listen(db, 'after_commit', self._invalidate_after_commit, once=True)
+        keys.add(key)
+    
+    def _invalidate_after_commit(self, session: Session):
+        for key in session.info.pop('system_settings_dirty', ()):
+            self.invalidate_cache(key)
 
 
 # Repository instances
 user_repo = UserRepository()
 wellness_entry_repo = WellnessEntryRepository()
+conversation_repo = ConversationRepository()
 resource_repo = ResourceRepository()
 risk_assessment_repo = RiskAssessmentRepository()
 notification_repo = NotificationRepository()
 team_repo = TeamRepository()
+wellness_program_repo = WellnessProgramRepository()
 analytics_repo = AnalyticsRepository()
+analytics_event_repo = AnalyticsEventRepository()
+compliance_repo = ComplianceRecordRepository()
 system_settings_repo = SystemSettingsRepository()
@@ -2,18 +2,183 @@
 Database Schema - SQLAlchemy models for the Enterprise Employee Wellness AI application
 """
 
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Text, JSON, ForeignKey, Table, Enum, Date, Time, BigInteger
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, backref
-from sqlalchemy.sql import func
+from sqlalchemy import desc, text, event, select, update, false, DDL, Computed, String, Integer, Float, DateTime, Boolean, Text, JSON, ForeignKey, Table, Date, Time, BigInteger, SmallInteger, Index, BINARY
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship
+from sqlalchemy.sql import func, operators
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.sql.expression import ClauseElement, FunctionElement
+from sqlalchemy.ext.compiler import compiles
 from datetime import datetime, date
+from typing import List, Optional
 import uuid
 import enum
+import logging
 
-Base = declarative_base()
+logger = logging.getLogger(__name__)
 
 
-# Enums for better type safety
+class _Serializable:
+    """to_dict for every model, rendered by its schema in database.serializers"""
+    
+    def to_dict(self):
+        # Imported here: serializers imports this module for its enums
+        from database.serializers import serialize
+        return serialize(self)
+
+
+class Base(_Serializable, DeclarativeBase):
+    """Declarative base for all models (typed Mapped[...] attributes)"""
+
+
+class GUID(TypeDecorator):
+    """UUID key stored as native uuid on PostgreSQL and as 16 raw bytes elsewhere
+    
+    Accepts uuid.UUID or its string form and always returns uuid.UUID, so
+    keys are 16 bytes on disk and in every index instead of 36 characters.
+    """
+    impl = BINARY(16)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(BINARY(16))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        return value if dialect.name == "postgresql" else value.bytes
+    
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+        if isinstance(value, str):
+            # Rows written before keys moved to binary storage
+            return uuid.UUID(value)
+        return uuid.UUID(bytes=bytes(value))
+
+
+# JSON documents: binary, indexable JSONB on PostgreSQL, plain JSON elsewhere
+JSONVariant = JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+# IP addresses: native inet (4 or 16 bytes, CIDR operators) on PostgreSQL
+INETVariant = String(45).with_variant(postgresql.INET(), "postgresql")
+
+# 64-bit surrogate keys; SQLite only autoincrements INTEGER PRIMARY KEY
+BigIntKey = BigInteger().with_variant(Integer, "sqlite")
+
+
+class gen_random_uuid(FunctionElement):
+    """Primary key default generated by the database, not per row in Python
+    
+    gen_random_uuid() on PostgreSQL (13+, or pgcrypto); 16 random bytes on
+    SQLite. New keys come back through INSERT ... RETURNING.
+    """
+    type = GUID()
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid)
+def _compile_gen_random_uuid(element, compiler, **kw):
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid, "sqlite")
+def _compile_gen_random_uuid_sqlite(element, compiler, **kw):
+    return "randomblob(16)"
+
+
+class CodedEnum(TypeDecorator):
+    """Enum stored as a SMALLINT code instead of a PostgreSQL ENUM or VARCHAR
+    
+    A member's code is its 1-based position in the enum, so members may be
+    appended but never reordered or removed. Binds accept the member, its
+    value or its name; loads return the member, or with as_value=True its
+    value string for columns the application reads as plain strings.
+    
+    Comparing the column to a value that isn't in the enum matches no row,
+    so filters built from user input need no validation of their own;
+    writing such a value raises ValueError.
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    class Comparator(TypeDecorator.Comparator):
+        def operate(self, op, *other, **kwargs):
+            if other and self.type._is_unknown(other[0]):
+                if op is operators.eq:
+                    return false()
+                if op is operators.ne:
+                    return self.expr.is_not(None)
+            if op in (operators.in_op, operators.not_in_op) and isinstance(other[0], (list, tuple, set)):
+                other = ([value for value in other[0] if not self.type._is_unknown(value)], *other[1:])
+            return super().operate(op, *other, **kwargs)
+    
+    comparator_factory = Comparator
+    
+    def __init__(self, enum_class, as_value=False):
+        super().__init__()
+        self.enum_class = enum_class
+        self.as_value = as_value
+        self._members = list(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members, start=1)}
+    
+    def _member(self, value):
+        """The member for a member, value or name, or None if there is none"""
+        if isinstance(value, self.enum_class):
+            return value
+        try:
+            return self.enum_class(value)
+        except ValueError:
+            return self.enum_class.__members__.get(value) if isinstance(value, str) else None
+    
+    def _is_unknown(self, value):
+        return value is not None and not hasattr(value, '__clause_element__') \
+            and not isinstance(value, ClauseElement) and self._member(value) is None
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        member = self._member(value)
+        if member is None:
+            raise ValueError(f"{value!r} is not a valid {self.enum_class.__name__}")
+        return self._codes[member]
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # int(): codes written into pre-existing text columns on SQLite read back as text
+        member = self._members[int(value) - 1]
+        return member.value if self.as_value else member
+
+
+class TenthsScore(TypeDecorator):
+    """1-10 scale score stored as a SMALLINT count of tenths (7.5 -> 75)
+    
+    Two bytes instead of an eight-byte float, exact to one decimal place.
+    Binds and loads convert, so comparisons, min/max and sum read as
+    plain scores; avg() is untyped in SQLAlchemy, so wrap it as
+    type_coerce(func.avg(col), TenthsScore()).
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(round(float(value) * 10))
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # float(): a type_coerce'd avg() comes back as Decimal on PostgreSQL
+        return float(value) / 10
+
+
+# Enums for better type safety; stored as CodedEnum codes, so only append
 class UserRole(enum.Enum):
     EMPLOYEE = "employee"
     MANAGER = "manager"
@@ -68,376 +233,391 @@ class DifficultyLevel(enum.Enum):
     ADVANCED = "advanced"
 
 
+class MessageSender(enum.Enum):
+    USER = "user"
+    AI = "ai"
+
+
+class Sentiment(enum.Enum):
+    POSITIVE = "positive"
+    NEGATIVE = "negative"
+    NEUTRAL = "neutral"
+
+
+class AssessmentStatus(enum.Enum):
+    ACTIVE = "active"
+    RESOLVED = "resolved"
+    ESCALATED = "escalated"
+
+
 class User(Base):
     """Enhanced User model for authentication and profile management"""
     __tablename__ = "users"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    email = Column(String(255), unique=True, nullable=False, index=True)
-    password_hash = Column(String(255), nullable=False)
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.EMPLOYEE)
-    department = Column(String(100), index=True)
-    position = Column(String(100))
-    manager_id = Column(String(36), ForeignKey("users.id"), nullable=True)
-    company = Column(String(255), nullable=True)
-    phone = Column(String(20), nullable=True)
-    avatar_url = Column(String(500), nullable=True)
-    timezone = Column(String(50), default="UTC")
-    language = Column(String(10), default="en")
-    hire_date = Column(Date, nullable=True)
-    is_active = Column(Boolean, default=True, index=True)
-    is_verified = Column(Boolean, default=False)
-    email_verified_at = Column(DateTime, nullable=True)
-    last_login = Column(DateTime, nullable=True)
-    last_activity = Column(DateTime, nullable=True)
-    preferences = Column(JSON, default=dict)  # User preferences and settings
-    wellness_profile = Column(JSON, default=dict)  # Wellness preferences and history
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    # Relationships
-    wellness_entries = relationship("WellnessEntry", back_populates="user", cascade="all, delete-orphan")
-    conversations = relationship("Conversation", back_populates="user", cascade="all, delete-orphan")
-    resource_interactions = relationship("ResourceInteraction", back_populates="user", cascade="all, delete-orphan")
-    notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
-    risk_assessments = relationship("RiskAssessment", back_populates="user", cascade="all, delete-orphan")
-    team_members = relationship("User", backref=backref("manager", remote_side=[id]))
-    wellness_goals = relationship("WellnessGoal", back_populates="user", cascade="all, delete-orphan")
-    interventions = relationship("Intervention", back_populates="user", cascade="all, delete-orphan")
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "email": self.email,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "full_name": f"{self.first_name} {self.last_name}",
-            "role": self.role.value if self.role else None,
-            "department": self.department,
-            "position": self.position,
-            "company": self.company,
-            "phone": self.phone,
-            "avatar_url": self.avatar_url,
-            "manager_id": self.manager_id,
-            "is_active": self.is_active,
-            "is_verified": self.is_verified,
-            "last_login": self.last_login.isoformat() if self.last_login else None,
-            "last_activity": self.last_activity.isoformat() if self.last_activity else None,
-            "hire_date": self.hire_date.isoformat() if self.hire_date else None,
-            "preferences": self.preferences,
-            "wellness_profile": self.wellness_profile,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    __table_args__ = (
+        # Active users by department; inactive rows stay out of the index
+        Index(
+            "ix_users_active_department", "department",
+            postgresql_where=text("is_active = true"), sqlite_where=text("is_active = 1")
+        ),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+    first_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    last_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    full_name: Mapped[Optional[str]] = mapped_column(String(201), Computed("first_name || ' ' || last_name", persisted=True))
+    role: Mapped[Optional[UserRole]] = mapped_column(CodedEnum(UserRole), default=UserRole.EMPLOYEE)
+    department: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    position: Mapped[Optional[str]] = mapped_column(String(100))
+    manager_id: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    company: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    avatar_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    timezone: Mapped[Optional[str]] = mapped_column(String(50), default="UTC")
+    language: Mapped[Optional[str]] = mapped_column(String(10), default="en")
+    hire_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    is_verified: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    email_verified_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_activity: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    preferences: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)  # User preferences and settings
+    wellness_profile: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)  # Wellness preferences and history
+    # Denormalized from wellness_entries / risk_assessments so profile reads
+    # don't aggregate; kept current by the refresh_user_* functions below
+    last_wellness_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    last_wellness_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    risk_level_cached: Mapped[Optional[str]] = mapped_column(CodedEnum(RiskLevel, as_value=True), nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Relationships. Loader strategies are explicit: goals and interventions
+    # are shown wherever a user is, so they load with one SELECT ... IN per
+    # batch of users; the high-volume histories refuse to lazy load and
+    # must be requested with selectinload() at the query site. Their rows
+    # are removed by the database's ON DELETE CASCADE, so deleting a user
+    # never loads them.
+    wellness_entries: Mapped[List["WellnessEntry"]] = relationship(
+        "WellnessEntry", back_populates="user", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+    conversations: Mapped[List["Conversation"]] = relationship(
+        "Conversation", back_populates="user", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+    resource_interactions: Mapped[List["ResourceInteraction"]] = relationship(
+        "ResourceInteraction", back_populates="user", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+    notifications: Mapped[List["Notification"]] = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
+    risk_assessments: Mapped[List["RiskAssessment"]] = relationship(
+        "RiskAssessment", back_populates="user", cascade="all, delete-orphan",
+        foreign_keys="RiskAssessment.user_id"
+    )
+    manager: Mapped[Optional["User"]] = relationship("User", back_populates="team_members", remote_side=[id])
+    team_members: Mapped[List["User"]] = relationship("User", back_populates="manager")
+    wellness_goals: Mapped[List["WellnessGoal"]] = relationship("WellnessGoal", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
+    interventions: Mapped[List["Intervention"]] = relationship(
+        "Intervention", back_populates="user", cascade="all, delete-orphan",
+        foreign_keys="Intervention.user_id", lazy="selectin"
+    )
 
 
 class WellnessEntry(Base):
     """Enhanced Wellness check-in entries"""
     __tablename__ = "wellness_entries"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    entry_type = Column(Enum(WellnessEntryType), nullable=False)
-    value = Column(Float, nullable=False)  # 1-10 scale
-    description = Column(Text, nullable=True)
-    mood_score = Column(Float, nullable=True)  # 1-10 scale
-    stress_score = Column(Float, nullable=True)  # 1-10 scale
-    energy_score = Column(Float, nullable=True)  # 1-10 scale
-    sleep_hours = Column(Float, nullable=True)
-    sleep_quality = Column(Float, nullable=True)  # 1-10 scale
-    work_life_balance = Column(Float, nullable=True)  # 1-10 scale
-    social_support = Column(Float, nullable=True)  # 1-10 scale
-    physical_activity = Column(Float, nullable=True)  # 1-10 scale
-    nutrition_quality = Column(Float, nullable=True)  # 1-10 scale
-    productivity_level = Column(Float, nullable=True)  # 1-10 scale
-    tags = Column(JSON, default=list)  # List of tags
-    factors = Column(JSON, default=dict)  # Contributing factors
-    recommendations = Column(JSON, default=list)  # AI-generated recommendations
-    risk_indicators = Column(JSON, default=list)  # Risk indicators detected
-    metadata = Column(JSON, default=dict)  # Additional data
-    is_anonymous = Column(Boolean, default=False)  # For anonymous check-ins
-    created_at = Column(DateTime, default=func.now(), index=True)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    __table_args__ = (
+        # Keyset pagination of a user's timeline (newest first); on
+        # PostgreSQL the commonly read scores ride along in the index so
+        # timeline reads can be served by an index-only scan
+        Index(
+            "ix_wellness_entries_user_created_id", "user_id", desc("created_at"), desc("id"),
+            postgresql_include=["entry_type", "value", "mood_score", "stress_score"]
+        ),
+        # Entries of one type for a user within a period
+        Index("ix_wellness_entries_user_type_created", "user_id", "entry_type", desc("created_at")),
+        # Tag containment/existence queries (jsonb @> / ?)
+        Index("ix_wellness_entries_tags_gin", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # Monthly range partitions on PostgreSQL (see ensure_monthly_partitions)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # leads the composite indexes
+    entry_type: Mapped[WellnessEntryType] = mapped_column(CodedEnum(WellnessEntryType), nullable=False)
+    value: Mapped[float] = mapped_column(Float, nullable=False)  # 1-10 scale
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    mood_score: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    stress_score: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    energy_score: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    sleep_hours: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    sleep_quality: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    work_life_balance: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    social_support: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    physical_activity: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    nutrition_quality: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    productivity_level: Mapped[Optional[float]] = mapped_column(TenthsScore(), nullable=True)  # 1-10 scale
+    tags: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # List of tags
+    factors: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)  # Contributing factors
+    recommendations: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # AI-generated recommendations
+    risk_indicators: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # Risk indicators detected
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)  # Additional data
+    is_anonymous: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)  # For anonymous check-ins
+    # Partition key, so part of the table's primary key; rows are still
+    # identified by id alone. Set client-side so the value held by the
+    # session matches the stored one exactly in UPDATE/DELETE WHERE clauses
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=datetime.utcnow, server_default=func.now(), index=True
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    __mapper_args__ = {"primary_key": [id]}
     
     # Relationships
-    user = relationship("User", back_populates="wellness_entries")
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "entry_type": self.entry_type.value if self.entry_type else None,
-            "value": self.value,
-            "description": self.description,
-            "mood_score": self.mood_score,
-            "stress_score": self.stress_score,
-            "energy_score": self.energy_score,
-            "sleep_hours": self.sleep_hours,
-            "sleep_quality": self.sleep_quality,
-            "work_life_balance": self.work_life_balance,
-            "social_support": self.social_support,
-            "physical_activity": self.physical_activity,
-            "nutrition_quality": self.nutrition_quality,
-            "productivity_level": self.productivity_level,
-            "tags": self.tags,
-            "factors": self.factors,
-            "recommendations": self.recommendations,
-            "risk_indicators": self.risk_indicators,
-            "metadata": self.metadata,
-            "is_anonymous": self.is_anonymous,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    user: Mapped["User"] = relationship("User", back_populates="wellness_entries")
 
 
 class Conversation(Base):
     """Chat conversations between users and AI"""
     __tablename__ = "conversations"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    session_id = Column(String(36), nullable=False, index=True)
-    message = Column(Text, nullable=False)
-    sender = Column(String(20), nullable=False)  # user, ai
-    sentiment = Column(String(20), nullable=True)  # positive, negative, neutral
-    risk_level = Column(String(20), nullable=True)  # low, medium, high
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
+    __table_args__ = (
+        # A user's messages in a session, in order
+        Index("ix_conversations_user_session_created", "user_id", "session_id", "created_at"),
+        # A user's recent messages across sessions
+        Index("ix_conversations_user_created", "user_id", desc("created_at")),
+        # Time-window scans; rows arrive in created_at order, so a BRIN stays a few pages
+        Index(
+            "ix_conversations_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ).ddl_if(dialect="postgresql"),
+        # Monthly range partitions on PostgreSQL (see ensure_monthly_partitions)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # leads the composite index
+    session_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    sender: Mapped[str] = mapped_column(CodedEnum(MessageSender, as_value=True), nullable=False)
+    sentiment: Mapped[Optional[str]] = mapped_column(CodedEnum(Sentiment, as_value=True), nullable=True)
+    risk_level: Mapped[Optional[str]] = mapped_column(CodedEnum(RiskLevel, as_value=True), nullable=True)
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=datetime.utcnow, server_default=func.now()
+    )  # partition key
+    
+    __mapper_args__ = {"primary_key": [id]}
     
     # Relationships
-    user = relationship("User", back_populates="conversations")
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "session_id": self.session_id,
-            "message": self.message,
-            "sender": self.sender,
-            "sentiment": self.sentiment,
-            "risk_level": self.risk_level,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat()
-        }
+    user: Mapped["User"] = relationship("User", back_populates="conversations")
 
 
 class Resource(Base):
     """Wellness resources and content"""
     __tablename__ = "resources"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=False)
-    category = Column(String(100), nullable=False, index=True)
-    difficulty_level = Column(String(50), nullable=False)  # beginner, intermediate, advanced
-    duration_minutes = Column(Integer, nullable=True)
-    content_url = Column(String(500), nullable=True)
-    tags = Column(JSON, default=list)
-    author = Column(String(255), nullable=True)
-    rating = Column(Float, default=0.0)
-    review_count = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    # Relationships
-    interactions = relationship("ResourceInteraction", back_populates="resource")
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "category": self.category,
-            "difficulty_level": self.difficulty_level,
-            "duration_minutes": self.duration_minutes,
-            "content_url": self.content_url,
-            "tags": self.tags,
-            "author": self.author,
-            "rating": self.rating,
-            "review_count": self.review_count,
-            "is_active": self.is_active,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    __table_args__ = (
+        # Popular active resources, ordered by rating
+        Index(
+            "ix_resources_active_rating", desc("rating"),
+            postgresql_where=text("is_active = true"), sqlite_where=text("is_active = 1")
+        ),
+        # Catalog filtering by tag (jsonb @>)
+        Index(
+            "ix_resources_tags_gin", "tags",
+            postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+        # ON CONFLICT target for seeding
+        Index("uq_resources_title", "title", unique=True),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[str] = mapped_column(CodedEnum(ResourceCategory, as_value=True), nullable=False, index=True)
+    difficulty_level: Mapped[str] = mapped_column(CodedEnum(DifficultyLevel, as_value=True), nullable=False)
+    duration_minutes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    content_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    tags: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)
+    author: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    rating: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    review_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Relationships. Every view/like/rating of the resource: unbounded, so
+    # it never lazy loads and must be requested with selectinload()
+    interactions: Mapped[List["ResourceInteraction"]] = relationship(
+        "ResourceInteraction", back_populates="resource", lazy="raise_on_sql", passive_deletes=True
+    )
 
 
 class ResourceInteraction(Base):
     """User interactions with resources"""
     __tablename__ = "resource_interactions"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    resource_id = Column(String(36), ForeignKey("resources.id"), nullable=False, index=True)
-    interaction_type = Column(String(50), nullable=False)  # view, like, bookmark, complete, rate
-    rating = Column(Integer, nullable=True)  # 1-5 stars
-    comment = Column(Text, nullable=True)
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
+    __table_args__ = (
+        # A user's recent interactions
+        Index("ix_resource_interactions_user_created", "user_id", "created_at"),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # leads the composite index
+    resource_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("resources.id"), nullable=False, index=True)
+    interaction_type: Mapped[str] = mapped_column(String(50), nullable=False)  # view, like, bookmark, complete, rate
+    rating: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 1-5 stars
+    comment: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="resource_interactions")
-    resource = relationship("Resource", back_populates="interactions")
+    user: Mapped["User"] = relationship("User", back_populates="resource_interactions")
+    resource: Mapped["Resource"] = relationship("Resource", back_populates="interactions")
+
+
+class UserAgent(Base):
+    """Distinct user agent strings, referenced by id from event and audit rows"""
+    __tablename__ = "user_agents"
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "resource_id": self.resource_id,
-            "interaction_type": self.interaction_type,
-            "rating": self.rating,
-            "comment": self.comment,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat()
-        }
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
+    ua_hash: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False)  # first 64 bits of md5(user_agent)
+    user_agent: Mapped[str] = mapped_column(Text, nullable=False)
 
 
 class AnalyticsEvent(Base):
     """Analytics events for tracking user behavior"""
     __tablename__ = "analytics_events"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True, index=True)
-    event_type = Column(String(100), nullable=False, index=True)
-    event_data = Column(JSON, default=dict)
-    session_id = Column(String(36), nullable=True)
-    ip_address = Column(String(45), nullable=True)
-    user_agent = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "event_type": self.event_type,
-            "event_data": self.event_data,
-            "session_id": self.session_id,
-            "ip_address": self.ip_address,
-            "user_agent": self.user_agent,
-            "created_at": self.created_at.isoformat()
-        }
+    __table_args__ = (
+        # A user's events of one type within a period
+        Index("ix_analytics_events_user_type_created", "user_id", "event_type", "created_at"),
+        # Filtering events by payload fields (jsonb @>); jsonb_path_ops only
+        # serves containment but is smaller and cheaper to keep up per insert
+        Index(
+            "ix_analytics_events_event_data_gin", "event_data",
+            postgresql_using="gin", postgresql_ops={"event_data": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+        # Time-window scans; rows arrive in created_at order, so a BRIN stays a few pages
+        Index(
+            "ix_analytics_events_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ).ddl_if(dialect="postgresql"),
+        # Monthly range partitions on PostgreSQL (see ensure_monthly_partitions)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)  # leads the composite index
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    event_data: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)
+    session_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    ip_address: Mapped[Optional[str]] = mapped_column(INETVariant, nullable=True)
+    user_agent_id: Mapped[Optional[int]] = mapped_column(BigIntKey, ForeignKey("user_agents.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=datetime.utcnow, server_default=func.now()
+    )  # partition key
+    
+    __mapper_args__ = {"primary_key": [id]}
 
 
 class RiskAssessment(Base):
     """Risk assessment records"""
     __tablename__ = "risk_assessments"
+    __table_args__ = (
+        # Active high-risk listing, ordered by score (status code 1 = AssessmentStatus.ACTIVE)
+        Index(
+            "ix_risk_assessments_active_level_score", "status", "risk_level", desc("risk_score"),
+            postgresql_where=text("status = 1"), sqlite_where=text("status = 1")
+        ),
+        # A user's assessments, newest first
+        Index("ix_risk_assessments_user_created", "user_id", desc("created_at")),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False)  # leads the composite index
+    risk_level: Mapped[str] = mapped_column(CodedEnum(RiskLevel, as_value=True), nullable=False)
+    risk_score: Mapped[float] = mapped_column(Float, nullable=False)
+    risk_factors: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)
+    recommendations: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)
+    interventions: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)
+    assessed_by: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    status: Mapped[Optional[str]] = mapped_column(CodedEnum(AssessmentStatus, as_value=True), default="active")
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    risk_level = Column(String(20), nullable=False)  # low, medium, high
-    risk_score = Column(Float, nullable=False)
-    risk_factors = Column(JSON, default=list)
-    recommendations = Column(JSON, default=list)
-    interventions = Column(JSON, default=list)
-    assessed_by = Column(String(36), ForeignKey("users.id"), nullable=True)
-    status = Column(String(50), default="active")  # active, resolved, escalated
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "risk_level": self.risk_level,
-            "risk_score": self.risk_score,
-            "risk_factors": self.risk_factors,
-            "recommendations": self.recommendations,
-            "interventions": self.interventions,
-            "assessed_by": self.assessed_by,
-            "status": self.status,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    # Relationships
+    user: Mapped["User"] = relationship("User", back_populates="risk_assessments", foreign_keys=[user_id])
 
 
 class Notification(Base):
     """User notifications"""
     __tablename__ = "notifications"
+    __table_args__ = (
+        # A user's notifications, newest first
+        Index("ix_notifications_user_created", "user_id", desc("created_at")),
+        # Unread only: the small, hot side of is_read
+        Index(
+            "ix_notifications_unread", "user_id", desc("created_at"),
+            postgresql_where=text("is_read = false"), sqlite_where=text("is_read = 0")
+        ),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    notification_type: Mapped[str] = mapped_column(CodedEnum(NotificationType, as_value=True), nullable=False)
+    is_read: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    action_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    message = Column(Text, nullable=False)
-    notification_type = Column(String(50), nullable=False)  # info, warning, success, error
-    is_read = Column(Boolean, default=False)
-    action_url = Column(String(500), nullable=True)
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "title": self.title,
-            "message": self.message,
-            "notification_type": self.notification_type,
-            "is_read": self.is_read,
-            "action_url": self.action_url,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat()
-        }
+    # Relationships
+    user: Mapped["User"] = relationship("User", back_populates="notifications")
 
 
 class TeamAnalytics(Base):
     """Team-level analytics and insights"""
     __tablename__ = "team_analytics"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    team_id = Column(String(36), nullable=False, index=True)
-    manager_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    period_start = Column(DateTime, nullable=False)
-    period_end = Column(DateTime, nullable=False)
-    metrics = Column(JSON, default=dict)  # Aggregated team metrics
-    insights = Column(JSON, default=list)  # Team insights
-    recommendations = Column(JSON, default=list)  # Team recommendations
-    risk_alerts = Column(JSON, default=list)  # Team risk alerts
-    created_at = Column(DateTime, default=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "team_id": self.team_id,
-            "manager_id": self.manager_id,
-            "period_start": self.period_start.isoformat(),
-            "period_end": self.period_end.isoformat(),
-            "metrics": self.metrics,
-            "insights": self.insights,
-            "recommendations": self.recommendations,
-            "risk_alerts": self.risk_alerts,
-            "created_at": self.created_at.isoformat()
-        }
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    team_id: Mapped[uuid.UUID] = mapped_column(GUID(), nullable=False, index=True)
+    manager_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False)
+    period_start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    period_end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    metrics: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)  # Aggregated team metrics
+    insights: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # Team insights
+    recommendations: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # Team recommendations
+    risk_alerts: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # Team risk alerts
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
 
 
 class ComplianceRecord(Base):
     """Compliance and audit records"""
     __tablename__ = "compliance_records"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
-    record_type = Column(String(100), nullable=False)  # data_access, privacy_consent, audit_log
-    action = Column(String(100), nullable=False)
-    details = Column(JSON, default=dict)
-    ip_address = Column(String(45), nullable=True)
-    user_agent = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "record_type": self.record_type,
-            "action": self.action,
-            "details": self.details,
-            "ip_address": self.ip_address,
-            "user_agent": self.user_agent,
-            "created_at": self.created_at.isoformat()
-        }
+    __table_args__ = (
+        # Time-window scans; rows arrive in created_at order, so a BRIN stays a few pages
+        Index(
+            "ix_compliance_records_created_brin", "created_at",
+            postgresql_using="brin", postgresql_with={"pages_per_range": 32}
+        ).ddl_if(dialect="postgresql"),
+        # Monthly range partitions on PostgreSQL (see ensure_monthly_partitions)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    record_type: Mapped[str] = mapped_column(String(100), nullable=False)  # data_access, privacy_consent, audit_log
+    action: Mapped[str] = mapped_column(String(100), nullable=False)
+    details: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)
+    ip_address: Mapped[Optional[str]] = mapped_column(INETVariant, nullable=True)
+    user_agent_id: Mapped[Optional[int]] = mapped_column(BigIntKey, ForeignKey("user_agents.id"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=datetime.utcnow, server_default=func.now()
+    )  # partition key
+    
+    __mapper_args__ = {"primary_key": [id]}
 
 
 # New Models for Enhanced Functionality
@@ -446,279 +626,312 @@ class WellnessGoal(Base):
     """User wellness goals and objectives"""
     __tablename__ = "wellness_goals"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    goal_type = Column(String(100), nullable=False)  # physical, mental, social, career, financial
-    target_value = Column(Float, nullable=True)
-    current_value = Column(Float, nullable=True)
-    unit = Column(String(50), nullable=True)  # hours, score, count, etc.
-    start_date = Column(Date, nullable=False)
-    target_date = Column(Date, nullable=True)
-    status = Column(String(50), default="active")  # active, completed, paused, abandoned
-    progress = Column(Float, default=0.0)  # 0-100 percentage
-    milestones = Column(JSON, default=list)  # List of milestone objects
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    goal_type: Mapped[str] = mapped_column(String(100), nullable=False)  # physical, mental, social, career, financial
+    target_value: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    current_value: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    unit: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # hours, score, count, etc.
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    target_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="active")  # active, completed, paused, abandoned
+    progress: Mapped[Optional[float]] = mapped_column(Float, default=0.0)  # 0-100 percentage
+    milestones: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # List of milestone objects
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="wellness_goals")
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "title": self.title,
-            "description": self.description,
-            "goal_type": self.goal_type,
-            "target_value": self.target_value,
-            "current_value": self.current_value,
-            "unit": self.unit,
-            "start_date": self.start_date.isoformat(),
-            "target_date": self.target_date.isoformat() if self.target_date else None,
-            "status": self.status,
-            "progress": self.progress,
-            "milestones": self.milestones,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    user: Mapped["User"] = relationship("User", back_populates="wellness_goals")
 
 
 class Intervention(Base):
     """Wellness interventions and programs"""
     __tablename__ = "interventions"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    intervention_type = Column(String(100), nullable=False)  # workshop, therapy, program, resource
-    status = Column(String(50), default="scheduled")  # scheduled, active, completed, cancelled
-    priority = Column(String(20), default="medium")  # low, medium, high, urgent
-    assigned_by = Column(String(36), ForeignKey("users.id"), nullable=True)
-    assigned_to = Column(String(36), ForeignKey("users.id"), nullable=True)
-    start_date = Column(DateTime, nullable=True)
-    end_date = Column(DateTime, nullable=True)
-    effectiveness_score = Column(Float, nullable=True)  # 0-100
-    user_feedback = Column(Text, nullable=True)
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    __table_args__ = (
+        # Open (scheduled/active) interventions per user
+        Index(
+            "ix_interventions_active", "user_id",
+            postgresql_where=text("status IN ('scheduled', 'active')"),
+            sqlite_where=text("status IN ('scheduled', 'active')")
+        ),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    intervention_type: Mapped[str] = mapped_column(String(100), nullable=False)  # workshop, therapy, program, resource
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="scheduled")  # scheduled, active, completed, cancelled
+    priority: Mapped[Optional[str]] = mapped_column(String(20), default="medium")  # low, medium, high, urgent
+    assigned_by: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    assigned_to: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    start_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    end_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    effectiveness_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 0-100
+    user_feedback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="interventions")
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "title": self.title,
-            "description": self.description,
-            "intervention_type": self.intervention_type,
-            "status": self.status,
-            "priority": self.priority,
-            "assigned_by": self.assigned_by,
-            "assigned_to": self.assigned_to,
-            "start_date": self.start_date.isoformat() if self.start_date else None,
-            "end_date": self.end_date.isoformat() if self.end_date else None,
-            "effectiveness_score": self.effectiveness_score,
-            "user_feedback": self.user_feedback,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    user: Mapped["User"] = relationship("User", back_populates="interventions", foreign_keys=[user_id])
 
 
 class Team(Base):
     """Team management and structure"""
     __tablename__ = "teams"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    manager_id = Column(String(36), ForeignKey("users.id"), nullable=False)
-    department = Column(String(100), nullable=True)
-    team_size = Column(Integer, default=0)
-    is_active = Column(Boolean, default=True)
-    wellness_score = Column(Float, nullable=True)  # Average team wellness score
-    last_assessment = Column(DateTime, nullable=True)
-    metadata = Column(JSON, default=dict)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "manager_id": self.manager_id,
-            "department": self.department,
-            "team_size": self.team_size,
-            "is_active": self.is_active,
-            "wellness_score": self.wellness_score,
-            "last_assessment": self.last_assessment.isoformat() if self.last_assessment else None,
-            "metadata": self.metadata,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    __table_args__ = (
+        # ON CONFLICT target for seeding
+        Index("uq_teams_name", "name", unique=True),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    manager_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False)
+    department: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    team_size: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    wellness_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # Average team wellness score
+    last_assessment: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    extra: Mapped[Optional[dict]] = mapped_column("metadata", JSONVariant, default=dict)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
 class TeamMember(Base):
     """Team membership associations"""
     __tablename__ = "team_members"
+    __table_args__ = (
+        Index("uq_team_members_team_user", "team_id", "user_id", unique=True),
+    )
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    team_id = Column(String(36), ForeignKey("teams.id"), nullable=False, index=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    role = Column(String(50), default="member")  # member, lead, observer
-    joined_at = Column(DateTime, default=func.now())
-    is_active = Column(Boolean, default=True)
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "team_id": self.team_id,
-            "user_id": self.user_id,
-            "role": self.role,
-            "joined_at": self.joined_at.isoformat(),
-            "is_active": self.is_active
-        }
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    team_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("teams.id"), nullable=False, index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
+    role: Mapped[Optional[str]] = mapped_column(String(50), default="member")  # member, lead, observer
+    joined_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
 
 
 class WellnessProgram(Base):
     """Wellness programs and initiatives"""
     __tablename__ = "wellness_programs"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    program_type = Column(String(100), nullable=False)  # mental_health, physical, social, financial
-    target_audience = Column(String(100), nullable=True)  # all, managers, specific_department
-    start_date = Column(Date, nullable=False)
-    end_date = Column(Date, nullable=True)
-    is_active = Column(Boolean, default=True)
-    max_participants = Column(Integer, nullable=True)
-    current_participants = Column(Integer, default=0)
-    success_metrics = Column(JSON, default=dict)
-    budget = Column(Float, nullable=True)
-    created_by = Column(String(36), ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "program_type": self.program_type,
-            "target_audience": self.target_audience,
-            "start_date": self.start_date.isoformat(),
-            "end_date": self.end_date.isoformat() if self.end_date else None,
-            "is_active": self.is_active,
-            "max_participants": self.max_participants,
-            "current_participants": self.current_participants,
-            "success_metrics": self.success_metrics,
-            "budget": self.budget,
-            "created_by": self.created_by,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    __table_args__ = (
+        # ON CONFLICT target for seeding
+        Index("uq_wellness_programs_name", "name", unique=True),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    program_type: Mapped[str] = mapped_column(String(100), nullable=False)  # mental_health, physical, social, financial
+    target_audience: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # all, managers, specific_department
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    max_participants: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    current_participants: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    success_metrics: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)
+    budget: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    created_by: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
 class ProgramParticipant(Base):
     """Program participation tracking"""
     __tablename__ = "program_participants"
-    
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    program_id = Column(String(36), ForeignKey("wellness_programs.id"), nullable=False, index=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    status = Column(String(50), default="enrolled")  # enrolled, active, completed, dropped
-    enrollment_date = Column(DateTime, default=func.now())
-    completion_date = Column(DateTime, nullable=True)
-    progress = Column(Float, default=0.0)  # 0-100 percentage
-    feedback = Column(Text, nullable=True)
-    satisfaction_score = Column(Float, nullable=True)  # 1-5 scale
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "program_id": self.program_id,
-            "user_id": self.user_id,
-            "status": self.status,
-            "enrollment_date": self.enrollment_date.isoformat(),
-            "completion_date": self.completion_date.isoformat() if self.completion_date else None,
-            "progress": self.progress,
-            "feedback": self.feedback,
-            "satisfaction_score": self.satisfaction_score,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    __table_args__ = (
+        # One live enrollment per (program, user); dropped rows are kept as
+        # history and a user may enroll again. Also the ON CONFLICT target
+        # for enrollment upserts
+        Index(
+            "uq_program_participants_active", "program_id", "user_id", unique=True,
+            postgresql_where=text("status <> 'dropped'"), sqlite_where=text("status <> 'dropped'")
+        ),
+    )
+    
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    program_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("wellness_programs.id"), nullable=False, index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="enrolled")  # enrolled, active, completed, dropped
+    enrollment_date: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    completion_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    progress: Mapped[Optional[float]] = mapped_column(Float, default=0.0)  # 0-100 percentage
+    feedback: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    satisfaction_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 1-5 scale
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
 class AnalyticsReport(Base):
     """Analytics and reporting data"""
     __tablename__ = "analytics_reports"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    report_type = Column(String(100), nullable=False)  # wellness_trends, risk_assessment, team_analytics
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    data_period = Column(String(50), nullable=False)  # daily, weekly, monthly, quarterly
-    start_date = Column(DateTime, nullable=False)
-    end_date = Column(DateTime, nullable=False)
-    metrics = Column(JSON, default=dict)  # Calculated metrics
-    insights = Column(JSON, default=list)  # AI-generated insights
-    recommendations = Column(JSON, default=list)  # Recommendations
-    generated_by = Column(String(36), ForeignKey("users.id"), nullable=True)
-    is_public = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "report_type": self.report_type,
-            "title": self.title,
-            "description": self.description,
-            "data_period": self.data_period,
-            "start_date": self.start_date.isoformat(),
-            "end_date": self.end_date.isoformat(),
-            "metrics": self.metrics,
-            "insights": self.insights,
-            "recommendations": self.recommendations,
-            "generated_by": self.generated_by,
-            "is_public": self.is_public,
-            "created_at": self.created_at.isoformat()
-        }
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    report_type: Mapped[str] = mapped_column(String(100), nullable=False)  # wellness_trends, risk_assessment, team_analytics
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    data_period: Mapped[str] = mapped_column(String(50), nullable=False)  # daily, weekly, monthly, quarterly
+    start_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    end_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    metrics: Mapped[Optional[dict]] = mapped_column(JSONVariant, default=dict)  # Calculated metrics
+    insights: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # AI-generated insights
+    recommendations: Mapped[Optional[list]] = mapped_column(JSONVariant, default=list)  # Recommendations
+    generated_by: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
 
 
 class SystemSettings(Base):
     """System configuration and settings"""
     __tablename__ = "system_settings"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    setting_key = Column(String(255), unique=True, nullable=False, index=True)
-    setting_value = Column(Text, nullable=False)
-    setting_type = Column(String(50), nullable=False)  # string, integer, float, boolean, json
-    description = Column(Text, nullable=True)
-    category = Column(String(100), nullable=True)  # wellness, notifications, privacy, etc.
-    is_public = Column(Boolean, default=False)
-    updated_by = Column(String(36), ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "setting_key": self.setting_key,
-            "setting_value": self.setting_value,
-            "setting_type": self.setting_type,
-            "description": self.description,
-            "category": self.category,
-            "is_public": self.is_public,
-            "updated_by": self.updated_by,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    id: Mapped[uuid.UUID] = mapped_column(GUID(), primary_key=True, server_default=gen_random_uuid())
+    setting_key: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    setting_value: Mapped[str] = mapped_column(Text, nullable=False)
+    setting_type: Mapped[str] = mapped_column(String(50), nullable=False)  # string, integer, float, boolean, json
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    category: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # wellness, notifications, privacy, etc.
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    updated_by: Mapped[Optional[uuid.UUID]] = mapped_column(GUID(), ForeignKey("users.id"), nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+# Denormalized user snapshots. Each refresh recomputes the values from the
+# source table with correlated subqueries (served by the per-user indexes),
+# so running it for every user on a schedule also repairs any drift.
+
+def refresh_user_wellness_snapshot(connection, user_ids=None):
+    """Set users' last_wellness_score/last_wellness_at from their newest entry"""
+    users = User.__table__
+    entries = WellnessEntry.__table__
+    latest_score = select(entries.c.value).where(
+        entries.c.user_id == users.c.id
+    ).order_by(entries.c.created_at.desc(), entries.c.id.desc()).limit(1).scalar_subquery()
+    latest_at = select(func.max(entries.c.created_at)).where(
+        entries.c.user_id == users.c.id
+    ).scalar_subquery()
+    # updated_at is restated so its onupdate doesn't fire for a derived value
+    stmt = update(users).values(
+        last_wellness_score=latest_score, last_wellness_at=latest_at, updated_at=users.c.updated_at
+    )
+    if user_ids is not None:
+        stmt = stmt.where(users.c.id.in_(list(user_ids)))
+    connection.execute(stmt)
+
+
+def refresh_user_risk_level(connection, user_ids=None):
+    """Set users' risk_level_cached from their newest active risk assessment"""
+    users = User.__table__
+    assessments = RiskAssessment.__table__
+    latest_level = select(assessments.c.risk_level).where(
+        assessments.c.user_id == users.c.id,
+        assessments.c.status == "active"
+    ).order_by(assessments.c.created_at.desc()).limit(1).scalar_subquery()
+    stmt = update(users).values(risk_level_cached=latest_level, updated_at=users.c.updated_at)
+    if user_ids is not None:
+        stmt = stmt.where(users.c.id.in_(list(user_ids)))
+    connection.execute(stmt)
+
+
+# Refreshed once per flush for every user whose rows it touched. Bulk
+# INSERT/UPDATE statements skip flush events; the repositories' bulk paths
+# call the refresh functions themselves.
+_SNAPSHOT_REFRESHERS = {
+    WellnessEntry: refresh_user_wellness_snapshot,
+    RiskAssessment: refresh_user_risk_level,
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_user_snapshots(session, flush_context):
+    user_ids = {}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if type(obj) in _SNAPSHOT_REFRESHERS and obj.user_id is not None:
+            user_ids.setdefault(type(obj), set()).add(obj.user_id)
+    for model, ids in user_ids.items():
+        _SNAPSHOT_REFRESHERS[model](session.connection(), ids)
+
+
+# Time-partitioned tables (PostgreSQL). create_all gives each parent a
+# DEFAULT partition so inserts never fail; ensure_monthly_partitions adds the
+# monthly ones ahead of time (it runs from init_db on every startup). Old
+# months can be detached with ALTER TABLE ... DETACH PARTITION and archived.
+
+PARTITIONED_TABLES = (
+    WellnessEntry.__table__, Conversation.__table__, AnalyticsEvent.__table__, ComplianceRecord.__table__
+)
+
+for _table in PARTITIONED_TABLES:
+    event.listen(
+        _table, "after_create",
+        DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT").execute_if(dialect="postgresql")
+    )
+
+
+def _add_months(month_start, months):
+    """First day of the month the given number of months after month_start"""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_monthly_partitions(connection, months_ahead=3):
+    """Create the monthly partitions of each partitioned table from this month through months_ahead
+    
+    Each partition is created in its own savepoint; one that fails is logged
+    and skipped so it can't stop the application from starting.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    # Tables still waiting for their partitioning migration (013, 028) are
+    # skipped; run_database_setup calls this again once migrations are done
+    partitioned = set(connection.scalars(text(
+        "SELECT c.relname FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE pg_table_is_visible(c.oid)"
+    )))
+    this_month = datetime.utcnow().date().replace(day=1)
+    for table in PARTITIONED_TABLES:
+        if table.name not in partitioned:
+            continue
+        for offset in range(months_ahead + 1):
+            start = _add_months(this_month, offset)
+            partition = f"{table.name}_{start:%Y_%m}"
+            try:
+                with connection.begin_nested():
+                    _create_month_partition(connection, table.name, partition, start, _add_months(start, 1))
+            except Exception as e:
+                logger.error(f"Failed to create partition {partition}: {e}")
+
+
+def _create_month_partition(connection, table_name, partition, start, end):
+    """Create one monthly partition, moving any of its rows out of the DEFAULT partition
+    
+    PostgreSQL refuses to create a partition while DEFAULT holds rows in its
+    range (the app outran months_ahead, or a client sent a future
+    created_at), so DEFAULT is detached while those rows are moved.
+    """
+    if connection.scalar(text("SELECT to_regclass(:name)"), {"name": partition}) is not None:
+        return
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    default = f"{table_name}_default"
+    in_range = f"created_at >= '{start.isoformat()}' AND created_at < '{end.isoformat()}'"
+    has_default_rows = connection.scalar(text(
+        f"SELECT to_regclass(:default) IS NOT NULL AND EXISTS (SELECT 1 FROM {default} WHERE {in_range})"
+    ), {"default": default})
+    if not has_default_rows:
+        connection.execute(text(f"CREATE TABLE {partition} PARTITION OF {table_name} {bounds}"))
+        return
+    
+    logger.info(f"Moving {partition} rows out of {default}")
+    connection.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {default}"))
+    connection.execute(text(f"CREATE TABLE {partition} PARTITION OF {table_name} {bounds}"))
+    connection.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {partition} SELECT * FROM moved"
+    ))
+    connection.execute(text(f"ALTER TABLE {table_name} ATTACH PARTITION {default} DEFAULT"))
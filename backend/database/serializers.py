@@ -0,0 +1,351 @@
+"""
+Serializers - Pydantic response schemas for the database models
+
+Each model is read straight from its ORM attributes (from_attributes) and
+dumped in JSON mode, so UUIDs, enums, dates and datetimes are rendered by
+pydantic-core instead of per-field Python in every to_dict. Lists go
+through a cached TypeAdapter: one validate and one dump call per list.
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Type
+from uuid import UUID
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter
+
+from database.schema import UserRole, WellnessEntryType
+
+
+# inet columns load as ipaddress objects with some drivers, str with others
+IPAddress = Annotated[Optional[str], BeforeValidator(lambda value: None if value is None else str(value))]
+
+
+class ORMSchema(BaseModel):
+    """Base for schemas read from ORM instances"""
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserOut(ORMSchema):
+    id: Optional[UUID] = None
+    email: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    full_name: Optional[str] = None
+    role: Optional[UserRole] = None
+    department: Optional[str] = None
+    position: Optional[str] = None
+    company: Optional[str] = None
+    phone: Optional[str] = None
+    avatar_url: Optional[str] = None
+    manager_id: Optional[UUID] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    last_login: Optional[datetime] = None
+    last_activity: Optional[datetime] = None
+    hire_date: Optional[date] = None
+    preferences: Any = None
+    wellness_profile: Any = None
+    last_wellness_score: Optional[float] = None
+    last_wellness_at: Optional[datetime] = None
+    risk_level_cached: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class WellnessEntryOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    entry_type: Optional[WellnessEntryType] = None
+    value: Optional[float] = None
+    description: Optional[str] = None
+    mood_score: Optional[float] = None
+    stress_score: Optional[float] = None
+    energy_score: Optional[float] = None
+    sleep_hours: Optional[float] = None
+    sleep_quality: Optional[float] = None
+    work_life_balance: Optional[float] = None
+    social_support: Optional[float] = None
+    physical_activity: Optional[float] = None
+    nutrition_quality: Optional[float] = None
+    productivity_level: Optional[float] = None
+    tags: Any = None
+    factors: Any = None
+    recommendations: Any = None
+    risk_indicators: Any = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    is_anonymous: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class WellnessTrendPointOut(ORMSchema):
+    """One plotted point of get_trend_data, read from a result row"""
+    id: Optional[UUID] = None
+    entry_type: Optional[WellnessEntryType] = None
+    value: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+
+class ConversationOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    session_id: Optional[str] = None
+    message: Optional[str] = None
+    sender: Optional[str] = None
+    sentiment: Optional[str] = None
+    risk_level: Optional[str] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+
+
+class ResourceOut(ORMSchema):
+    id: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    difficulty_level: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    content_url: Optional[str] = None
+    tags: Any = None
+    author: Optional[str] = None
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
+    is_active: Optional[bool] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ResourceInteractionOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    resource_id: Optional[UUID] = None
+    interaction_type: Optional[str] = None
+    rating: Optional[int] = None
+    comment: Optional[str] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+
+
+class UserAgentOut(ORMSchema):
+    id: Optional[int] = None
+    ua_hash: Optional[int] = None
+    user_agent: Optional[str] = None
+
+
+class AnalyticsEventOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    event_type: Optional[str] = None
+    event_data: Any = None
+    session_id: Optional[str] = None
+    ip_address: IPAddress = None
+    user_agent_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class RiskAssessmentOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    risk_level: Optional[str] = None
+    risk_score: Optional[float] = None
+    risk_factors: Any = None
+    recommendations: Any = None
+    interventions: Any = None
+    assessed_by: Optional[UUID] = None
+    status: Optional[str] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class NotificationOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    title: Optional[str] = None
+    message: Optional[str] = None
+    notification_type: Optional[str] = None
+    is_read: Optional[bool] = None
+    action_url: Optional[str] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+
+
+class TeamAnalyticsOut(ORMSchema):
+    id: Optional[UUID] = None
+    team_id: Optional[UUID] = None
+    manager_id: Optional[UUID] = None
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+    metrics: Any = None
+    insights: Any = None
+    recommendations: Any = None
+    risk_alerts: Any = None
+    created_at: Optional[datetime] = None
+
+
+class ComplianceRecordOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    record_type: Optional[str] = None
+    action: Optional[str] = None
+    details: Any = None
+    ip_address: IPAddress = None
+    user_agent_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+
+class WellnessGoalOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    goal_type: Optional[str] = None
+    target_value: Optional[float] = None
+    current_value: Optional[float] = None
+    unit: Optional[str] = None
+    start_date: Optional[date] = None
+    target_date: Optional[date] = None
+    status: Optional[str] = None
+    progress: Optional[float] = None
+    milestones: Any = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class InterventionOut(ORMSchema):
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    intervention_type: Optional[str] = None
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    assigned_by: Optional[UUID] = None
+    assigned_to: Optional[UUID] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    effectiveness_score: Optional[float] = None
+    user_feedback: Optional[str] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class TeamOut(ORMSchema):
+    id: Optional[UUID] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    manager_id: Optional[UUID] = None
+    department: Optional[str] = None
+    team_size: Optional[int] = None
+    is_active: Optional[bool] = None
+    wellness_score: Optional[float] = None
+    last_assessment: Optional[datetime] = None
+    metadata: Any = Field(default=None, validation_alias="extra")
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class TeamMemberOut(ORMSchema):
+    id: Optional[UUID] = None
+    team_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    role: Optional[str] = None
+    joined_at: Optional[datetime] = None
+    is_active: Optional[bool] = None
+
+
+class WellnessProgramOut(ORMSchema):
+    id: Optional[UUID] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    program_type: Optional[str] = None
+    target_audience: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_active: Optional[bool] = None
+    max_participants: Optional[int] = None
+    current_participants: Optional[int] = None
+    success_metrics: Any = None
+    budget: Optional[float] = None
+    created_by: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ProgramParticipantOut(ORMSchema):
+    id: Optional[UUID] = None
+    program_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    status: Optional[str] = None
+    enrollment_date: Optional[datetime] = None
+    completion_date: Optional[datetime] = None
+    progress: Optional[float] = None
+    feedback: Optional[str] = None
+    satisfaction_score: Optional[float] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class AnalyticsReportOut(ORMSchema):
+    id: Optional[UUID] = None
+    report_type: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    data_period: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    metrics: Any = None
+    insights: Any = None
+    recommendations: Any = None
+    generated_by: Optional[UUID] = None
+    is_public: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class SystemSettingsOut(ORMSchema):
+    id: Optional[UUID] = None
+    setting_key: Optional[str] = None
+    setting_value: Optional[str] = None
+    setting_type: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    is_public: Optional[bool] = None
+    updated_by: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+
+# Response schema per model class name
+SCHEMAS: Dict[str, Type[ORMSchema]] = {
+    schema.__name__[:-len("Out")]: schema for schema in ORMSchema.__subclasses__()
+}
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[ORMSchema]) -> TypeAdapter:
+    """TypeAdapter for a list of schema, built once per schema"""
+    return TypeAdapter(List[schema])
+
+
+def serialize(instance: Any) -> Dict[str, Any]:
+    """JSON-ready dict for one ORM instance"""
+    return SCHEMAS[type(instance).__name__].model_validate(instance).model_dump(mode="json")
+
+
+def serialize_rows(schema: Type[ORMSchema], rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """JSON-ready dicts for column-only result rows (or any objects) read through schema"""
+    adapter = _list_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(list(rows)), mode="json")
+
+
+def serialize_many(instances: Iterable[Any]) -> List[Dict[str, Any]]:
+    """JSON-ready dicts for ORM instances of one model"""
+    instances = list(instances)
+    if not instances:
+        return []
+    adapter = _list_adapter(SCHEMAS[type(instances[0]).__name__])
+    return adapter.dump_python(adapter.validate_python(instances), mode="json")
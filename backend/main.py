@@ -7,12 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 
 from config.settings import settings
-from database.connection import init_db, check_db_connection
+from database.connection import init_db, check_db_connection, run_partition_maintenance
 from api.routes import wellness, auth, resources, analytics, users, notifications, compliance, teams, admin
 from utils.monitoring import setup_monitoring
 from utils.logging import setup_logging
@@ -41,6 +42,9 @@ async def lifespan(app: FastAPI):
         logger.error("Database connection check failed")
         raise Exception("Database connection failed")
     
+    # Keep monthly partitions ahead of the clock while the app runs
+    partition_maintenance = asyncio.create_task(run_partition_maintenance())
+    
     # Setup monitoring if enabled
     if settings.ENABLE_MONITORING:
         setup_monitoring(app)
@@ -52,6 +56,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    partition_maintenance.cancel()
 
 
 # Create FastAPI application
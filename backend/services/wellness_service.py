@@ -9,10 +9,12 @@ from dataclasses import dataclass
 import uuid
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 
 from database.connection import get_db
 from database.schema import WellnessEntry, User, Conversation, Resource
+from database.repository import conversation_repo
+from database.serializers import serialize_many
 from agents.orchestrator import AgentOrchestrator
 from utils.analytics import WellnessAnalytics
 from utils.privacy import PrivacyManager
@@ -67,13 +69,12 @@ class WellnessService:
             
             # Create wellness entry
             entry = WellnessEntry(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 entry_type="comprehensive",
                 value=metrics.mood,  # Primary metric
                 description=metrics.description,
                 tags=metrics.tags or [],
-                metadata={
+                extra={
                     "metrics": {
                         "mood": metrics.mood,
                         "stress": metrics.stress,
@@ -127,7 +128,6 @@ class WellnessService:
             db = next(get_db())
             
             entry = WellnessEntry(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 entry_type="mood",
                 value=mood_value,
@@ -179,7 +179,7 @@ class WellnessService:
                 start_date = end_date - timedelta(days=30)
             
             # Build query
-            query = db.query(WellnessEntry).filter(
+            stmt = select(WellnessEntry).where(
                 and_(
                     WellnessEntry.user_id == user_id,
                     WellnessEntry.created_at >= start_date,
@@ -188,16 +188,16 @@ class WellnessService:
             )
             
             if entry_types:
-                query = query.filter(WellnessEntry.entry_type.in_(entry_types))
+                stmt = stmt.where(WellnessEntry.entry_type.in_(entry_types))
             
-            entries = query.order_by(WellnessEntry.created_at.desc()).all()
+            entries = list(db.scalars(stmt.order_by(WellnessEntry.created_at.desc())))
             
             # Apply privacy controls
             entries = self.privacy_manager.filter_entries(entries, user_id)
             
             return {
                 "success": True,
-                "entries": [entry.to_dict() for entry in entries],
+                "entries": serialize_many(entries),
                 "count": len(entries),
                 "timeframe": timeframe
             }
@@ -313,7 +313,6 @@ class WellnessService:
             
             # Save user message
             user_message = Conversation(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 session_id=session_id,
                 message=message,
@@ -348,12 +347,11 @@ class WellnessService:
             
             # Save AI response
             ai_message = Conversation(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 session_id=session_id,
                 message=ai_response,
                 sender="ai",
-                metadata={
+                extra={
                     "sentiment": sentiment,
                     "risk_level": risk_level,
                     "agent_response": True
@@ -393,19 +391,14 @@ class WellnessService:
         try:
             db = next(get_db())
             
-            query = db.query(Conversation).filter(Conversation.user_id == user_id)
-            
-            if session_id:
-                query = query.filter(Conversation.session_id == session_id)
-            
-            conversations = query.order_by(Conversation.created_at.desc()).limit(limit).all()
+            conversations = conversation_repo.get_user_history(user_id, session_id=session_id, limit=limit, db=db)
             
             # Apply privacy controls
             conversations = self.privacy_manager.filter_conversations(conversations, user_id)
             
             return {
                 "success": True,
-                "conversations": [conv.to_dict() for conv in conversations],
+                "conversations": serialize_many(conversations),
                 "count": len(conversations)
             }
             
@@ -560,11 +553,9 @@ class WellnessService:
         """
         try:
             db = next(get_db())
-            conversations = db.query(Conversation).filter(
-                Conversation.session_id == session_id
-            ).order_by(Conversation.created_at.desc()).limit(limit).all()
+            conversations = conversation_repo.get_session_history(session_id, limit=limit, db=db)
             
-            return [conv.to_dict() for conv in conversations]
+            return serialize_many(conversations)
         except Exception as e:
             self.logger.error(f"Failed to get conversation history: {e}")
             return []
@@ -3,15 +3,19 @@ Unit tests for database models
 """
 import pytest
 from datetime import datetime, date
-from sqlalchemy.exc import IntegrityError
+from unittest.mock import MagicMock
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import selectinload
 from database.schema import (
     User, WellnessEntry, Conversation, Resource, ResourceInteraction,
     AnalyticsEvent, RiskAssessment, Notification, TeamAnalytics,
     ComplianceRecord, WellnessGoal, Intervention, Team, TeamMember,
     WellnessProgram, ProgramParticipant, AnalyticsReport, SystemSettings,
     UserRole, WellnessEntryType, RiskLevel, NotificationType,
-    ResourceCategory, DifficultyLevel
+    ResourceCategory, DifficultyLevel, refresh_user_wellness_snapshot, ensure_monthly_partitions
 )
+from database.serializers import serialize_many
 
 
 class TestUserModel:
@@ -98,10 +102,48 @@ class TestUserModel:
         db_session.add(entry)
         db_session.commit()
         
+        # Entry history never lazy loads; it has to be asked for
+        with pytest.raises(InvalidRequestError):
+            user.wellness_entries
+        
+        user = db_session.scalars(
+            select(User).where(User.id == user.id).options(selectinload(User.wellness_entries))
+        ).one()
         assert len(user.wellness_entries) == 1
         assert user.wellness_entries[0].id == entry.id
 
 
+    def test_user_wellness_snapshot(self, db_session):
+        """Test denormalized wellness/risk columns track their source rows."""
+        user = User(
+            email="snapshot@example.com",
+            password_hash="hashed_password",
+            first_name="Snap",
+            last_name="Shot"
+        )
+        db_session.add(user)
+        db_session.commit()
+        
+        db_session.add_all([
+            WellnessEntry(user_id=user.id, entry_type=WellnessEntryType.MOOD, value=4.0,
+                          created_at=datetime(2024, 1, 1)),
+            WellnessEntry(user_id=user.id, entry_type=WellnessEntryType.MOOD, value=8.0,
+                          created_at=datetime(2024, 1, 2)),
+            RiskAssessment(user_id=user.id, risk_level="high", risk_score=80.0)
+        ])
+        db_session.commit()
+        
+        assert user.full_name == "Snap Shot"
+        assert user.last_wellness_score == 8.0
+        assert user.last_wellness_at == datetime(2024, 1, 2)
+        assert user.risk_level_cached == "high"
+        
+        # A full recomputation agrees with the incrementally kept values
+        refresh_user_wellness_snapshot(db_session.connection())
+        db_session.refresh(user)
+        assert user.last_wellness_score == 8.0
+
+
 class TestWellnessEntryModel:
     """Test WellnessEntry model functionality."""
     
@@ -143,6 +185,21 @@ class TestWellnessEntryModel:
         assert entry_dict["tags"] == ["stressful", "work"]
         assert entry_dict["factors"] == {"workload": "high"}
     
+    def test_wellness_entry_serialize_many(self, db_session, sample_user):
+        """Test bulk serialization matches to_dict."""
+        entries = [
+            WellnessEntry(user_id=sample_user.id, entry_type=WellnessEntryType.MOOD, value=float(value))
+            for value in (4, 7)
+        ]
+        db_session.add_all(entries)
+        db_session.commit()
+        
+        serialized = serialize_many(entries)
+        assert serialized == [entry.to_dict() for entry in entries]
+        assert serialized[0]["id"] == str(entries[0].id)
+        assert serialized[0]["entry_type"] == "mood"
+        assert serialize_many([]) == []
+    
     def test_wellness_entry_validation(self, db_session, sample_user):
         """Test wellness entry validation."""
         # Test required fields
@@ -155,7 +212,30 @@ class TestWellnessEntryModel:
         db_session.commit()
         
         assert entry.id is not None
-    
+
+    def test_wellness_entry_scores_stored_as_tenths(self, db_session, sample_user):
+        """Test sub-scores store SMALLINT tenths and load as floats."""
+        entry = WellnessEntry(
+            user_id=sample_user.id,
+            entry_type=WellnessEntryType.COMPREHENSIVE,
+            value=7.0,
+            mood_score=7.5,
+            stress_score=3.0
+        )
+        db_session.add(entry)
+        db_session.commit()
+
+        assert db_session.execute(text("SELECT mood_score FROM wellness_entries")).scalar() == 75
+
+        db_session.expire_all()
+        loaded = db_session.get(WellnessEntry, entry.id)
+        assert loaded.mood_score == 7.5
+        assert loaded.stress_score == 3.0
+        assert loaded.energy_score is None
+        assert db_session.scalars(
+            select(WellnessEntry).where(WellnessEntry.mood_score > 7)
+        ).all() == [loaded]
+
     def test_wellness_entry_relationships(self, db_session, sample_user):
         """Test wellness entry relationships."""
         entry = WellnessEntry(
@@ -271,7 +351,7 @@ class TestTeamModel:
             department="Test Department",
             team_size=3,
             wellness_score=8.0,
-            metadata={"location": "Remote", "timezone": "UTC"}
+            extra={"location": "Remote", "timezone": "UTC"}
         )
         db_session.add(team)
         db_session.commit()
@@ -314,7 +394,7 @@ class TestNotificationModel:
             notification_type=NotificationType.WARNING,
             priority="high",
             is_read=True,
-            metadata={"action_required": True}
+            extra={"action_required": True}
         )
         db_session.add(notification)
         db_session.commit()
@@ -587,7 +667,7 @@ class TestSystemSettingsModel:
         assert setting_dict["setting_type"] == "integer"
         assert setting_dict["category"] == "risk_assessment"
         assert setting_dict["is_public"] is False
-        assert setting_dict["updated_by"] == sample_user.id
+        assert setting_dict["updated_by"] == str(sample_user.id)
 
 
 class TestEnumValues:
@@ -646,3 +726,80 @@ class TestEnumValues:
         assert DifficultyLevel.BEGINNER.value == "beginner"
         assert DifficultyLevel.INTERMEDIATE.value == "intermediate"
         assert DifficultyLevel.ADVANCED.value == "advanced"
+    
+    def test_enum_columns_store_codes(self, db_session, sample_user):
+        """Test enum columns store SMALLINT codes and load members or values."""
+        assessment = RiskAssessment(user_id=sample_user.id, risk_level="critical", risk_score=90.0)
+        db_session.add(assessment)
+        db_session.commit()
+        
+        stored = db_session.execute(
+            text("SELECT role FROM users WHERE email = :email"), {"email": sample_user.email}
+        ).scalar()
+        assert int(stored) == 1  # UserRole.EMPLOYEE
+        assert db_session.execute(text("SELECT risk_level FROM risk_assessments")).scalar() == 4
+        assert db_session.execute(text("SELECT status FROM risk_assessments")).scalar() == 1  # active
+        
+        db_session.expire_all()
+        assert isinstance(db_session.get(User, sample_user.id).role, UserRole)
+        assert db_session.get(RiskAssessment, assessment.id).risk_level == "critical"
+        assert db_session.scalars(
+            select(RiskAssessment).where(RiskAssessment.risk_level.in_(["high", "critical"]))
+        ).all() == [assessment]
+
+
+class TestMonthlyPartitions:
+    """Test monthly partition creation (PostgreSQL statements, recorded on a mock connection)."""
+    
+    @staticmethod
+    def _connection(default_rows_partition=None, failing_partition=None):
+        """A PostgreSQL-like connection where only wellness_entries is partitioned and no months exist yet."""
+        connection = MagicMock()
+        connection.dialect.name = "postgresql"
+        connection.scalars.return_value = ["wellness_entries"]
+        
+        def scalar(statement, params=None):
+            if "EXISTS" in str(statement):
+                return default_rows_partition is not None and default_rows_partition in connection.checked
+            connection.checked = params["name"]
+            return None
+        connection.scalar.side_effect = scalar
+        
+        def execute(statement, params=None):
+            if failing_partition and f"CREATE TABLE {failing_partition} " in str(statement):
+                raise RuntimeError("partition would overlap")
+        connection.execute.side_effect = execute
+        return connection
+    
+    @staticmethod
+    def _statements(connection):
+        return [str(call.args[0]) for call in connection.execute.call_args_list]
+    
+    def test_rows_in_default_are_moved(self):
+        """Test a month with rows in DEFAULT is created with DEFAULT detached."""
+        partition = f"wellness_entries_{datetime.utcnow():%Y_%m}"
+        connection = self._connection(default_rows_partition=partition)
+        
+        ensure_monthly_partitions(connection, months_ahead=1)
+        
+        statements = self._statements(connection)
+        assert statements[0] == "ALTER TABLE wellness_entries DETACH PARTITION wellness_entries_default"
+        assert statements[1].startswith(f"CREATE TABLE {partition} PARTITION OF wellness_entries")
+        assert statements[2].startswith("WITH moved AS (DELETE FROM wellness_entries_default")
+        assert statements[2].endswith(f"INSERT INTO {partition} SELECT * FROM moved")
+        assert statements[3] == "ALTER TABLE wellness_entries ATTACH PARTITION wellness_entries_default DEFAULT"
+        # Next month had no DEFAULT rows and is created directly
+        assert len(statements) == 5
+        assert statements[4].startswith("CREATE TABLE wellness_entries_")
+    
+    def test_failed_partition_is_skipped(self):
+        """Test a partition that can't be created is logged and the rest still are."""
+        partition = f"wellness_entries_{datetime.utcnow():%Y_%m}"
+        connection = self._connection(failing_partition=partition)
+        
+        ensure_monthly_partitions(connection, months_ahead=2)
+        
+        created = [s for s in self._statements(connection) if s.startswith("CREATE TABLE")]
+        assert len(created) == 3
+        assert connection.begin_nested.call_count == 3
+
@@ -0,0 +1,146 @@
+"""
+Unit tests for the migration runner
+"""
+import os
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+import database.migrations as migrations
+from database.schema import Base, User, Resource, RiskAssessment, Team, TeamMember, UserRole
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """A file-backed SQLite database built by create_all, wired into the migration runner."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_db_context():
+        db = SessionFactory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    monkeypatch.setattr(migrations, "engine", engine)
+    monkeypatch.setattr(migrations, "get_db_context", get_db_context)
+    migrations.invalidate_schema_snapshot()
+    yield engine
+    migrations.invalidate_schema_snapshot()
+    engine.dispose()
+
+
+class TestMigrationChain:
+    """Run every migration against a schema create_all already built."""
+
+    def test_full_chain_applies(self, fresh_db):
+        """Every migration applies cleanly on a fresh create_all database."""
+        manager = migrations.MigrationManager()
+        sql_files = [f for f in os.listdir(manager.migrations_dir) if f.endswith('.sql')]
+
+        assert manager.run_migrations()
+        assert manager.last_run_applied_count == len(sql_files)
+        assert manager.get_pending_migrations() == []
+        assert migrations.schema_validator.validate_schema(migrations.get_schema_snapshot())['is_valid']
+
+    def test_chain_keeps_existing_rows(self, fresh_db):
+        """Enum conversions leave values that are already codes untouched."""
+        with Session(fresh_db) as session:
+            user = User(
+                email="chain@example.com", password_hash="x",
+                first_name="Chain", last_name="Test", role=UserRole.HR
+            )
+            session.add(user)
+            session.flush()
+            session.add(Resource(
+                title="Sleep basics", description="d",
+                category="sleep", difficulty_level="advanced"
+            ))
+            session.add(RiskAssessment(user_id=user.id, risk_level="high", risk_score=0.8, status="escalated"))
+            session.commit()
+
+        assert migrations.MigrationManager().run_migrations()
+
+        with Session(fresh_db) as session:
+            assert session.scalar(select(User.role)) == UserRole.HR
+            assert session.execute(select(Resource.category, Resource.difficulty_level)).one() == ("sleep", "advanced")
+            assert session.execute(select(RiskAssessment.risk_level, RiskAssessment.status)).one() == ("high", "escalated")
+
+    def test_failed_migration_keeps_earlier_ones(self, fresh_db, tmp_path):
+        """A failing file is rolled back alone; the ones before it stay applied."""
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        (migrations_dir / "001_first.sql").write_text("CREATE TABLE chain_first (id INTEGER);")
+        (migrations_dir / "002_broken.sql").write_text(
+            "CREATE TABLE chain_broken (id INTEGER);\nSELECT * FROM missing_table;"
+        )
+        (migrations_dir / "003_third.sql").write_text("CREATE TABLE chain_third (id INTEGER);")
+
+        manager = migrations.MigrationManager()
+        manager.migrations_dir = str(migrations_dir)
+        manager.migrations_bundle = str(tmp_path / "migrations.sqlite")
+
+        assert not manager.run_migrations()
+        assert manager.get_applied_migrations() == ["001"]
+        table_names = migrations.get_schema_snapshot()['table_names']
+        assert "chain_first" in table_names
+        assert "chain_broken" not in table_names
+
+    def test_duplicate_seed_rows_merged(self, fresh_db, tmp_path):
+        """029 merges duplicated teams onto one row before adding the unique index."""
+        with fresh_db.begin() as conn:
+            conn.execute(text("DROP INDEX uq_teams_name"))
+        with Session(fresh_db) as session:
+            user = User(email="seed@example.com", password_hash="x", first_name="Seed", last_name="User")
+            session.add(user)
+            session.flush()
+            teams = [Team(name="Engineering Team", manager_id=user.id) for _ in range(3)]
+            session.add_all(teams)
+            session.flush()
+            session.add_all(TeamMember(team_id=team.id, user_id=user.id) for team in teams)
+            session.commit()
+            kept_id = min(team.id.hex for team in teams)
+
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        migration = "029_unique_seed_names.sql"
+        source_dir = migrations.MigrationManager().migrations_dir
+        (migrations_dir / migration).write_text(open(os.path.join(source_dir, migration)).read())
+        manager = migrations.MigrationManager()
+        manager.migrations_dir = str(migrations_dir)
+        manager.migrations_bundle = str(tmp_path / "migrations.sqlite")
+
+        assert manager.run_migrations()
+        with Session(fresh_db) as session:
+            assert [team.id.hex for team in session.scalars(select(Team))] == [kept_id]
+            assert session.scalar(select(func.count()).select_from(TeamMember)) == 1
+            assert session.scalar(select(TeamMember.team_id)).hex == kept_id
+
+
+class TestStatementSplitting:
+    """Statements are split outside comments, strings and $$ bodies."""
+
+    def test_comments_do_not_count(self):
+        """A comment mentioning CONCURRENTLY doesn't make a migration non-transactional."""
+        statements = migrations._split_statements(
+            "-- build CONCURRENTLY by hand on large tables\n"
+            "CREATE INDEX ix_a ON t (a); SELECT ';';"
+        )
+
+        assert statements == ["CREATE INDEX ix_a ON t (a)", "SELECT ';'"]
+        assert not any(migrations._NON_TRANSACTIONAL.match(s) for s in statements)
+        assert migrations._NON_TRANSACTIONAL.match("CREATE INDEX CONCURRENTLY ix_a ON t (a)")
+
+    def test_do_block_is_one_statement(self):
+        """A $$-quoted body with its own semicolons stays whole."""
+        statements = migrations._split_statements("DO $$ BEGIN PERFORM 1; PERFORM 2; END $$;\nSELECT 1;")
+
+        assert statements == ["DO $$ BEGIN PERFORM 1; PERFORM 2; END $$", "SELECT 1"]
@@ -0,0 +1,77 @@
+"""
+Unit tests for repository caching
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import database.repository as repository
+from database.schema import Base, SystemSettings
+
+
+@pytest.fixture
+def settings_repo(monkeypatch):
+    """A SystemSettingsRepository with an empty cache, reading from an in-memory database."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(
+        repository, "RepositorySession",
+        sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    )
+    with Session(engine) as session:
+        session.add_all([
+            SystemSettings(setting_key="session_timeout", setting_value="30", setting_type="integer", category="security"),
+            SystemSettings(setting_key="max_login_attempts", setting_value="5", setting_type="integer", category="security"),
+        ])
+        session.commit()
+    yield repository.SystemSettingsRepository(), engine
+    engine.dispose()
+
+
+class TestSystemSettingsCache:
+    """Settings reads outside a transaction are cached as plain dicts."""
+
+    def test_cache_hit(self, settings_repo):
+        """A second read is served from the cache, as a separate copy."""
+        repo, engine = settings_repo
+        first = repo.get_setting("session_timeout")
+        first["setting_value"] = "changed by caller"
+
+        with Session(engine) as session:
+            session.query(SystemSettings).delete()
+            session.commit()
+
+        second = repo.get_setting("session_timeout")
+        assert second["setting_value"] == "30"
+        assert second is not first
+
+    def test_update_invalidates_after_commit(self, settings_repo):
+        """With a caller's session the cache is dropped on commit, not before."""
+        repo, engine = settings_repo
+        assert repo.get_setting("session_timeout")["setting_value"] == "30"
+
+        with Session(engine) as session:
+            assert repo.update_setting("session_timeout", "45", db=session)
+            assert repo.get_setting("session_timeout")["setting_value"] == "30"
+            session.commit()
+
+        assert repo.get_setting("session_timeout")["setting_value"] == "45"
+
+        assert repo.update_setting("session_timeout", "60")
+        assert repo.get_setting("session_timeout")["setting_value"] == "60"
+
+    def test_category_bucket(self, settings_repo):
+        """The category bucket is cached and dropped when one of its settings changes."""
+        repo, engine = settings_repo
+        values = {s["setting_key"]: s["setting_value"] for s in repo.get_settings_by_category("security")}
+        assert values == {"session_timeout": "30", "max_login_attempts": "5"}
+
+        with Session(engine) as session:
+            session.add(SystemSettings(setting_key="password_min_length", setting_value="12", setting_type="integer", category="security"))
+            session.commit()
+        assert len(repo.get_settings_by_category("security")) == 2
+
+        assert repo.update_setting("max_login_attempts", "3")
+        values = {s["setting_key"]: s["setting_value"] for s in repo.get_settings_by_category("security")}
+        assert values == {"session_timeout": "30", "max_login_attempts": "3", "password_min_length": "12"}